@@ -12,6 +12,163 @@ from itertools import permutations, product
 import networkx as nx
 
 
+def permutation_array(perms):
+    """
+    Pack 1-based permutation tuples into a 0-based (N, n) NumPy array.
+    
+    Entries use int8 up to degree 127 and int16 beyond, so a batch of all
+    8! permutations of degree 8 takes 320 KB.
+    
+    Args:
+        perms: A permutation tuple or an iterable of them
+        
+    Returns:
+        numpy.ndarray: (N, n) array with row k holding perms[k] - 1
+    """
+    array = np.atleast_2d(np.asarray(perms))
+    dtype = np.int8 if array.shape[-1] <= 127 else np.int16
+    return (array - 1).astype(dtype)
+
+
+def permutation_tuples(array):
+    """
+    Unpack a 0-based (N, n) permutation array into 1-based tuples.
+    
+    Args:
+        array: Permutation array
+        
+    Returns:
+        list: Permutations as tuples
+    """
+    return [tuple(row) for row in (np.atleast_2d(array).astype(np.int64) + 1).tolist()]
+
+
+def symmetric_group_array(degree):
+    """
+    All permutations of degree n as a 0-based array, in lexicographic order
+    (the order of itertools.permutations, so row k has rank k).
+    
+    Args:
+        degree: Degree n
+        
+    Returns:
+        numpy.ndarray: (n!, n) permutation array
+    """
+    dtype = np.int8 if degree <= 127 else np.int16
+    return np.array(list(permutations(range(degree))), dtype=dtype).reshape(-1, degree)
+
+
+def compose_many(sigma, tau):
+    """
+    Batched composition σ ∘ τ, i.e. (σ ∘ τ)(i) = σ(τ(i)), by fancy indexing.
+    
+    Args:
+        sigma, tau: Permutation arrays of shape (N, n) or (n,); they broadcast
+            against each other
+            
+    Returns:
+        numpy.ndarray: (N, n) array of compositions
+    """
+    sigma, tau = np.broadcast_arrays(np.atleast_2d(sigma), np.atleast_2d(tau))
+    return np.take_along_axis(sigma, tau.astype(np.intp), axis=-1)
+
+
+def invert_many(sigma):
+    """
+    Batched inversion by scattering positions: σ⁻¹[σ(i)] = i.
+    
+    Args:
+        sigma: Permutation array of shape (N, n) or (n,)
+        
+    Returns:
+        numpy.ndarray: (N, n) array of inverses
+    """
+    sigma = np.atleast_2d(sigma)
+    inverse = np.empty_like(sigma)
+    rows = np.arange(len(sigma))[:, None]
+    inverse[rows, sigma] = np.arange(sigma.shape[-1], dtype=sigma.dtype)
+    return inverse
+
+
+def conjugate_many(sigma, tau):
+    """
+    Batched conjugation τ σ τ⁻¹, scattering τ(σ(i)) to position τ(i).
+    
+    Args:
+        sigma, tau: Permutation arrays of shape (N, n) or (n,); they broadcast
+            
+    Returns:
+        numpy.ndarray: (N, n) array of conjugates
+    """
+    sigma, tau = np.broadcast_arrays(np.atleast_2d(sigma), np.atleast_2d(tau))
+    result = np.empty_like(tau)
+    rows = np.arange(len(tau))[:, None]
+    result[rows, tau] = np.take_along_axis(tau, sigma.astype(np.intp), axis=-1)
+    return result
+
+
+def cycle_counts_many(sigma):
+    """
+    Batched cycle types as counts of cycles of each length.
+    
+    Every point follows σ until it returns (n vectorized steps), which gives
+    the length of its cycle; a cycle of length l contributes l such points.
+    
+    Args:
+        sigma: Permutation array of shape (N, n) or (n,)
+        
+    Returns:
+        numpy.ndarray: (N, n + 1) int array, column l holding the number of
+        cycles of length l (column 0 is 0); row sums are cycle counts
+    """
+    sigma = np.atleast_2d(sigma)
+    size, degree = sigma.shape
+    points = np.arange(degree)
+    current = sigma.astype(np.intp)
+    lengths = np.zeros((size, degree), dtype=np.intp)
+    for step in range(1, degree + 1):
+        lengths[(current == points) & (lengths == 0)] = step
+        current = np.take_along_axis(sigma, current, axis=-1).astype(np.intp)
+    counts = np.zeros((size, degree + 1), dtype=np.int64)
+    np.add.at(counts, (np.arange(size)[:, None], lengths), 1)
+    counts[:, 1:] //= np.arange(1, degree + 1)
+    return counts
+
+
+def cycle_type_from_counts(counts):
+    """
+    Cycle type as a decreasing tuple of lengths from one row of cycle_counts_many().
+    
+    Args:
+        counts: Counts of cycles by length
+        
+    Returns:
+        tuple: Cycle lengths in decreasing order
+    """
+    return tuple(length for length in range(len(counts) - 1, 0, -1)
+                 for _ in range(int(counts[length])))
+
+
+def permutation_ranks(sigma):
+    """
+    Batched lexicographic ranks (row indices into symmetric_group_array()).
+    
+    Args:
+        sigma: Permutation array of shape (N, n) or (n,)
+        
+    Returns:
+        numpy.ndarray: Ranks as int64
+    """
+    sigma = np.atleast_2d(sigma)
+    degree = sigma.shape[-1]
+    ranks = np.zeros(len(sigma), dtype=np.int64)
+    for i in range(degree):
+        # Lehmer digit: later entries smaller than sigma[i]
+        digit = (sigma[:, i + 1:] < sigma[:, i:i + 1]).sum(axis=1)
+        ranks = ranks * (degree - i) + digit
+    return ranks
+
+
 class BelyiMap:
     """
     Belyi map implementation for Anabelian Geometry.
@@ -94,32 +251,338 @@ class BelyiMap:
         """
         Generate monodromy group data for degree 3-4 permutation triples.
         
+        Collects iter_monodromy_triples(degree) into a list; use the iterator
+        directly for large degrees.
+        
         Args:
             degree: Degree of the cover
             
         Returns:
             list: List of valid permutation triples (σ₀, σ₁, σ∞)
         """
-        # Generate all permutation triples of given degree
-        S_n = list(permutations(range(1, degree + 1)))
-        valid_triples = []
+        return [triple for _, triple in self.iter_monodromy_triples(degree)]
+    
+    def iter_monodromy_triples(self, degree=3, transitive=False, passport=None,
+                               genus=None, cursor=0, stats=None):
+        """
+        Lazily enumerate permutation triples with σ₀σ₁σ∞ = 1.
+        
+        σ∞ is determined by σ₀ and σ₁, so it is computed as (σ₀σ₁)⁻¹ instead
+        of searched for: O((n!)^2) compositions rather than O((n!)^3). Triples
+        come in the order of monodromy_group(). Filters are applied as early
+        as possible: a passport or genus rules out σ₀ (and σ₁) by cycle data
+        before any composition, and disconnected pairs are dropped by a
+        union-find pass seeded with the cycles of σ₀ before σ∞ is formed.
+        
+        The enumeration position is the integer cursor = i₀ * n! + i₁ over
+        the pairs (σ₀, σ₁) in lexicographic order. Each triple is yielded with
+        the cursor just after it, so a consumer can stop, store that cursor
+        and later resume with iter_monodromy_triples(..., cursor=stored).
+        
+        Args:
+            degree: Degree of the cover
+            transitive: Only yield triples generating a transitive group
+            passport: Only yield triples with these cycle types, given as a
+                triple of cycle types (see cycle_type()) for (σ₀, σ₁, σ∞)
+            genus: Only yield triples of this genus by Riemann-Hurwitz,
+                2 - 2g = c(σ₀) + c(σ₁) + c(σ∞) - n with c the number of cycles
+                (the genus of the cover when it is transitive)
+            cursor: Position to start from (0: the beginning)
+            stats: Optional dict, updated with the number of (σ₀, σ₁)
+                candidates ('candidates') and how many each stage removed
+                ('passport', 'genus', 'transitivity'), plus 'yielded'
+            
+        Yields:
+            tuple: (cursor after this triple, (σ₀, σ₁, σ∞))
+        """
+        if stats is None:
+            stats = {}
+        for key in ('candidates', 'passport', 'genus', 'transitivity', 'yielded'):
+            stats.setdefault(key, 0)
+        
+        group = symmetric_group_array(degree)
+        S_n = permutation_tuples(group)
+        size = len(S_n)
+        counts = cycle_counts_many(group)
+        cycle_numbers = counts.sum(axis=1)
+        if passport is not None:
+            passport = tuple(tuple(cycle_type) for cycle_type in passport)
+            passport_counts = [np.bincount(cycle_type, minlength=degree + 1)
+                               for cycle_type in passport]
+        # Riemann-Hurwitz: the three cycle counts must sum to this
+        cycle_total = None if genus is None else degree + 2 - 2 * genus
+        
+        start_0, start_1 = divmod(cursor, size)
+        for index_0 in range(start_0, size):
+            sigma_0 = S_n[index_0]
+            first_1 = start_1 if index_0 == start_0 else 0
+            # Pruning σ₀ removes its whole row of candidates at once
+            row = size - first_1
+            stats['candidates'] += row
+            if passport is not None and not np.array_equal(counts[index_0], passport_counts[0]):
+                stats['passport'] += row
+                continue
+            if cycle_total is not None and cycle_numbers[index_0] + 2 > cycle_total:
+                stats['genus'] += row
+                continue
+            
+            # The stages run as masks over the row, in the order above
+            candidates = np.arange(first_1, size)
+            if passport is not None:
+                keep = (counts[candidates] == passport_counts[1]).all(axis=1)
+                stats['passport'] += int((~keep).sum())
+                candidates = candidates[keep]
+            if cycle_total is not None:
+                keep = cycle_numbers[index_0] + cycle_numbers[candidates] + 1 <= cycle_total
+                stats['genus'] += int((~keep).sum())
+                candidates = candidates[keep]
+            if transitive:
+                sheets_0 = self.sheet_components(sigma_0)
+                keep = np.array([self.is_transitive(sigma_0, S_n[index_1], sheets_0)
+                                 for index_1 in candidates.tolist()], dtype=bool)
+                stats['transitivity'] += int((~keep).sum())
+                candidates = candidates[keep]
+            
+            sigma_inf = invert_many(compose_many(group[index_0], group[candidates]))
+            if passport is not None or cycle_total is not None:
+                counts_inf = cycle_counts_many(sigma_inf)
+                keep = np.ones(len(candidates), dtype=bool)
+                if passport is not None:
+                    keep = (counts_inf == passport_counts[2]).all(axis=1)
+                    stats['passport'] += int((~keep).sum())
+                if cycle_total is not None:
+                    fits = (cycle_numbers[index_0] + cycle_numbers[candidates]
+                            + counts_inf.sum(axis=1) == cycle_total)
+                    stats['genus'] += int((keep & ~fits).sum())
+                    keep &= fits
+                candidates, sigma_inf = candidates[keep], sigma_inf[keep]
+            
+            stats['yielded'] += len(candidates)
+            for index_1, inverse in zip(candidates.tolist(), permutation_tuples(sigma_inf)
+                                        if len(candidates) else []):
+                yield index_0 * size + index_1 + 1, (sigma_0, S_n[index_1], inverse)
+    
+    def sheet_components(self, sigma):
+        """
+        Union-find forest of the sheets joined by the cycles of a permutation.
+        
+        Args:
+            sigma: Permutation as tuple
+            
+        Returns:
+            list: Parent array over sheets 1..n (index 0 unused); each cycle
+            points at its smallest sheet
+        """
+        parent = [0] * (len(sigma) + 1)
+        for i in range(1, len(sigma) + 1):
+            if not parent[i]:
+                # i is the smallest sheet of its cycle
+                j = i
+                while not parent[j]:
+                    parent[j] = i
+                    j = sigma[j - 1]
+        return parent
+    
+    def is_transitive(self, sigma_0, sigma_1, sheets_0=None):
+        """
+        Whether ⟨σ₀, σ₁⟩ acts transitively, i.e. the cover is connected.
+        
+        Union-find over the sheets: starting from the components of σ₀, each
+        i is joined to σ₁(i), and the group is transitive when a single
+        component is left.
+        
+        Args:
+            sigma_0, sigma_1: Permutations as tuples
+            sheets_0: sheet_components(sigma_0), to reuse across many σ₁
+            
+        Returns:
+            bool: True if all sheets are connected
+        """
+        parent = list(sheets_0 if sheets_0 is not None else self.sheet_components(sigma_0))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        components = len(set(find(i) for i in range(1, len(sigma_0) + 1)))
+        for i in range(1, len(sigma_1) + 1):
+            root_i, root_j = find(i), find(sigma_1[i - 1])
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+                components -= 1
+                if components == 1:
+                    return True
+        return components == 1
+    
+    def filter_transitive(self, triples, stats=None):
+        """
+        Post-filter an iterable of triples down to the connected covers.
+        
+        Args:
+            triples: Iterable of (σ₀, σ₁, σ∞)
+            stats: Optional dict, updated with 'candidates' and 'transitivity'
+                (the number removed)
+            
+        Yields:
+            tuple: The transitive triples, in order
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault('candidates', 0)
+        stats.setdefault('transitivity', 0)
+        for triple in triples:
+            stats['candidates'] += 1
+            if self.is_transitive(triple[0], triple[1]):
+                yield triple
+            else:
+                stats['transitivity'] += 1
+    
+    def canonical_form(self, sigma_0, sigma_1):
+        """
+        Canonical form of a transitive pair (σ₀, σ₁) under simultaneous conjugation.
+        
+        For each starting sheet s, sheets are relabelled in breadth-first order
+        from s (following σ₀ before σ₁), which is O(n) per start since the
+        group is transitive; the canonical form is the lexicographically
+        smallest relabelled pair, O(n^2) in total. Two pairs are conjugate
+        exactly when their canonical forms agree, and the starts that reach
+        the minimum correspond to the automorphisms of the dessin.
+        
+        Args:
+            sigma_0, sigma_1: Permutations as tuples generating a transitive group
+            
+        Returns:
+            tuple: ((σ₀', σ₁'), number of automorphisms)
+            
+        Raises:
+            ValueError: If ⟨σ₀, σ₁⟩ is not transitive
+        """
+        n = len(sigma_0)
+        best, automorphisms = None, 0
+        for start in range(1, n + 1):
+            label = {start: 1}
+            queue = [start]
+            for i in queue:
+                for j in (sigma_0[i - 1], sigma_1[i - 1]):
+                    if j not in label:
+                        label[j] = len(label) + 1
+                        queue.append(j)
+            if len(label) != n:
+                raise ValueError("Canonical forms need a transitive pair")
+            
+            relabelled_0 = [0] * n
+            relabelled_1 = [0] * n
+            for i, k in label.items():
+                relabelled_0[k - 1] = label[sigma_0[i - 1]]
+                relabelled_1[k - 1] = label[sigma_1[i - 1]]
+            form = (tuple(relabelled_0), tuple(relabelled_1))
+            if best is None or form < best:
+                best, automorphisms = form, 1
+            elif form == best:
+                automorphisms += 1
+        return best, automorphisms
+    
+    def iter_dessins(self, degree=3, passport=None, genus=None, cursor=0):
+        """
+        One triple per isomorphism class of dessins d'enfants of a given degree.
+        
+        Streams the transitive triples of iter_monodromy_triples() and keeps
+        those already in canonical form, so each class is yielded exactly once
+        and nothing has to be remembered between triples (the cursor resumes
+        as before).
+        
+        Args:
+            degree: Degree of the cover
+            passport: Optional passport filter (see iter_monodromy_triples())
+            genus: Optional genus filter
+            cursor: Position to resume from
+            
+        Yields:
+            tuple: (cursor, (σ₀, σ₁, σ∞), number of automorphisms)
+        """
+        for position, triple in self.iter_monodromy_triples(degree, transitive=True,
+                                                            passport=passport, genus=genus,
+                                                            cursor=cursor):
+            form, automorphisms = self.canonical_form(triple[0], triple[1])
+            if form == triple[:2]:
+                yield position, triple, automorphisms
+    
+    def verify_dessin_counts(self, degree=3):
+        """
+        Check the dessin classes against the orbit-counting formula.
         
-        for sigma_0 in S_n:
-            for sigma_1 in S_n:
-                for sigma_inf in S_n:
-                    # Check if σ₀ σ₁ σ∞ = 1 (identity)
-                    composition = self.compose_permutations(
-                        self.compose_permutations(sigma_0, sigma_1), sigma_inf
-                    )
-                    if composition == tuple(range(1, degree + 1)):
-                        valid_triples.append((sigma_0, sigma_1, sigma_inf))
+        S_n acts on the transitive labelled triples with stabilizers the
+        automorphism groups, so the orbit sizes n!/|Aut| of the classes must
+        add up to the number of labelled triples.
         
-        return valid_triples
+        Args:
+            degree: Degree of the cover
+            
+        Returns:
+            dict: 'classes', 'labelled' (transitive triples), 'orbit_sum'
+            (sum of n!/|Aut|) and 'consistent'
+        """
+        order = 1
+        for k in range(2, degree + 1):
+            order *= k
+        classes = 0
+        orbit_sum = 0
+        for _, _, automorphisms in self.iter_dessins(degree):
+            classes += 1
+            orbit_sum += order // automorphisms
+        labelled = sum(1 for _ in self.iter_monodromy_triples(degree, transitive=True))
+        return {'classes': classes, 'labelled': labelled, 'orbit_sum': orbit_sum,
+                'consistent': orbit_sum == labelled}
+    
+    def monodromy_representatives(self, degree=3):
+        """
+        One permutation triple per class under simultaneous conjugation.
+        
+        Conjugating by S_n first brings σ₀ to a fixed representative of its
+        cycle type (the first in lexicographic order); the remaining freedom
+        is the centralizer C(σ₀), whose orbits on σ₁ are swept in
+        lexicographic order, marking each orbit as it is found. The cost is
+        about n! times the number of cycle types, which makes degrees 6 to 8
+        practical.
+        
+        Args:
+            degree: Degree of the cover
+            
+        Returns:
+            list: Representative triples (σ₀, σ₁, σ∞), a subset of
+            monodromy_group(degree) in the same order within each σ₀
+        """
+        group = symmetric_group_array(degree)
+        # First permutation of each cycle type
+        _, first = np.unique(cycle_counts_many(group), axis=0, return_index=True)
+        
+        representatives = []
+        for index_0 in np.sort(first).tolist():
+            sigma_0 = group[index_0]
+            centralizer = group[(conjugate_many(sigma_0, group) == sigma_0).all(axis=1)]
+            seen = np.zeros(len(group), dtype=bool)
+            ranks = []
+            for index_1 in range(len(group)):
+                if seen[index_1]:
+                    continue
+                seen[permutation_ranks(conjugate_many(group[index_1], centralizer))] = True
+                ranks.append(index_1)
+            sigma_1 = group[ranks]
+            sigma_inf = invert_many(compose_many(sigma_0, sigma_1))
+            representatives.extend(zip(permutation_tuples(np.broadcast_to(sigma_0, sigma_1.shape)),
+                                       permutation_tuples(sigma_1),
+                                       permutation_tuples(sigma_inf)))
+        
+        return representatives
     
     def compose_permutations(self, sigma1, sigma2):
         """
         Compose two permutations: σ₁ ∘ σ₂
         
+        Tuple wrapper around compose_many(); use the array kernel for bulk work.
+        
         Args:
             sigma1, sigma2: Permutations as tuples
             
@@ -129,12 +592,49 @@ class BelyiMap:
         if len(sigma1) != len(sigma2):
             raise ValueError("Permutations must have same degree")
         
-        result = []
-        for i in range(len(sigma1)):
-            # σ₁(σ₂(i+1)) = σ₁(sigma2[i])
-            result.append(sigma1[sigma2[i] - 1])
+        # σ₁(σ₂(i+1)) = σ₁(sigma2[i])
+        return permutation_tuples(compose_many(permutation_array(sigma1),
+                                               permutation_array(sigma2)))[0]
+    
+    def inverse_permutation(self, sigma):
+        """
+        Invert a permutation (tuple wrapper around invert_many()).
+        
+        Args:
+            sigma: Permutation as tuple
+            
+        Returns:
+            tuple: σ⁻¹
+        """
+        return permutation_tuples(invert_many(permutation_array(sigma)))[0]
+    
+    def conjugate_permutation(self, sigma, tau):
+        """
+        Conjugate a permutation: τ σ τ⁻¹ (tuple wrapper around conjugate_many()).
+        
+        Args:
+            sigma: Permutation to conjugate
+            tau: Conjugating permutation
+            
+        Returns:
+            tuple: τ σ τ⁻¹, which maps τ(i) to τ(σ(i))
+        """
+        return permutation_tuples(conjugate_many(permutation_array(sigma),
+                                                 permutation_array(tau)))[0]
+    
+    def cycle_type(self, sigma):
+        """
+        Cycle type of a permutation, fixed points included.
         
-        return tuple(result)
+        Tuple wrapper around cycle_counts_many().
+        
+        Args:
+            sigma: Permutation as tuple
+            
+        Returns:
+            tuple: Cycle lengths in decreasing order
+        """
+        return cycle_type_from_counts(cycle_counts_many(permutation_array(sigma))[0])
     
     def permutation_cycles(self, sigma):
         """
@@ -235,15 +735,20 @@ class MonodromyExplorer:
         """
         print("=== Degree 3 Monodromy Groups ===\n")
         
-        triples = self.belyi.monodromy_group(degree=3)
+        # Stream the enumeration: count the triples, keep one per dessin class
+        count = sum(1 for _ in self.belyi.iter_monodromy_triples(degree=3))
+        classes = [(triple, automorphisms)
+                   for _, triple, automorphisms in self.belyi.iter_dessins(degree=3)]
         
-        print(f"Found {len(triples)} valid permutation triples:")
+        print(f"Found {count} valid permutation triples, "
+              f"{len(classes)} dessin isomorphism classes:")
         
-        for i, (sigma_0, sigma_1, sigma_inf) in enumerate(triples[:5]):  # Show first 5
-            print(f"\nTriple {i+1}:")
+        for i, ((sigma_0, sigma_1, sigma_inf), automorphisms) in enumerate(classes[:5]):  # Show first 5
+            print(f"\nDessin {i+1}:")
             print(f"  σ₀ = {sigma_0}")
             print(f"  σ₁ = {sigma_1}")
             print(f"  σ∞ = {sigma_inf}")
+            print(f"  |Aut| = {automorphisms}")
             
             # Find cycles
             cycles_0 = self.belyi.permutation_cycles(sigma_0)
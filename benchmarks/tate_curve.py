@@ -0,0 +1,321 @@
+"""
+Benchmarks for the Tate curve implementation in p_adic_teichmuller.
+
+Each benchmark prints a short report and returns its measurements. Run them
+from the repository root:
+    python -m benchmarks.tate_curve                         # all benchmarks
+    python -m benchmarks.tate_curve scalar_multiplication   # selected ones
+"""
+
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from p_adic_teichmuller import (TateCurve, TateCurveFamily, _projective_multiply_mod,
+                                q_from_weierstrass, teichmuller_representatives)
+
+
+def benchmark_scalar_multiplication(num_points=1000, bits=64, seed=0):
+    """
+    Compare scalar multiplication strategies on a batch of random scalars.
+    
+    Correctness is checked against repeated addition on small scalars. Large
+    multiples of real points are numerically chaotic (each doubling roughly
+    doubles the rounding error), so only timings are reported for the
+    full-size scalars.
+    
+    Args:
+        num_points: Batch size
+        bits: Bit length of the random scalars
+        seed: Random seed
+        
+    Returns:
+        dict: Timing in seconds for each (method, coordinates) pair
+    """
+    print("=== Scalar Multiplication Benchmark ===\n")
+    
+    rng = np.random.default_rng(seed)
+    tate = TateCurve(p=5, q=1/125, precision=10)
+    points = np.array(tate.compute_points(x_range=(-1, 1), num_points=50))
+    P = points[rng.integers(len(points), size=num_points)]
+    methods = ['double_and_add', 'naf', 'ladder']
+    coordinate_systems = ['affine', 'projective', 'jacobian']
+    
+    # Correctness against O(k) repeated addition
+    small = rng.integers(1, 17, size=num_points)
+    expected = P.copy()
+    for step in range(2, small.max() + 1):
+        active = small >= step
+        expected[active] = tate.add_many(expected[active], P[active])
+    for method in methods:
+        for coordinates in coordinate_systems:
+            result = tate.multiply_many(P, small, method=method, coordinates=coordinates)
+            matches = np.isclose(result, expected, rtol=1e-3).all(axis=1).sum()
+            print(f"{method:>15} ({coordinates:>10}): "
+                  f"{matches}/{num_points} lanes match repeated addition")
+    
+    # Timings on full-size scalars
+    scalars = [int(v) for v in rng.integers(0, 1 << 62, size=num_points)]
+    scalars = [(v << (bits - 62)) | 1 if bits > 62 else v >> (62 - bits) for v in scalars]
+    timings = {}
+    print(f"\n{num_points} random {bits}-bit scalars:")
+    for method in methods:
+        for coordinates in coordinate_systems:
+            start = time.perf_counter()
+            with np.errstate(all='ignore'):
+                tate.multiply_many(P, scalars, method=method, coordinates=coordinates)
+            timings[(method, coordinates)] = time.perf_counter() - start
+            print(f"{method:>15} ({coordinates:>10}): "
+                  f"{timings[(method, coordinates)]:.4f} s")
+    
+    return timings
+
+
+def benchmark_adaptive_precision(num_curves=10000, q_max=0.9, seed=0):
+    """
+    Compare fixed and adaptive series precision over one family of real q.
+    
+    The same family is re-evaluated after reassigning tolerance and
+    max_precision, which must invalidate its cached coefficients: each result
+    must differ from the previous setting's, match a freshly built family, and
+    lie within the certified truncation bound of a high-precision reference.
+    
+    Args:
+        num_curves: Number of curves
+        q_max: Largest |q|
+        seed: Random seed
+        
+    Returns:
+        dict: Timings, term counts and the consistency flags per setting
+    """
+    print("=== Adaptive Precision ===\n")
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(-q_max, q_max, num_curves)
+    reference = TateCurveFamily(q_values=q, precision=2000).weierstrass_coefficients()
+    
+    family = TateCurveFamily(q_values=q, precision=200)
+    results = {}
+    previous = None
+    for tolerance, max_precision in ((None, 10000), (1e-6, 10000), (1e-13, 10000),
+                                     (1e-13, 50)):
+        family.tolerance = tolerance
+        family.max_precision = max_precision
+        start = time.perf_counter()
+        a_4, a_6 = family.weierstrass_coefficients()
+        elapsed = time.perf_counter() - start
+        
+        fresh = TateCurveFamily(q_values=q, precision=200, tolerance=tolerance,
+                                max_precision=max_precision).weierstrass_coefficients()
+        consistent = all(np.array_equal(mine, theirs, equal_nan=True)
+                         for mine, theirs in zip((a_4, a_6), fresh))
+        bound_4, bound_6 = family.truncation_error()
+        met = family.series_terms() >= 0
+        # Leave room for rounding in the Horner sums themselves
+        within = all(np.all((np.abs(value - exact) <= bound + 1e-12 * np.abs(exact))[met])
+                     for value, exact, bound in zip((a_4, a_6), reference, (bound_4, bound_6)))
+        
+        # Each setting truncates differently, so a stale cache would show here
+        changed = previous is None or not np.array_equal(a_4, previous, equal_nan=True)
+        previous = a_4
+        
+        label = 'fixed' if tolerance is None else f"{tolerance:g}/{max_precision}"
+        terms = family.series_terms()
+        results[label] = {'time': elapsed, 'mean_terms': float(terms[met].mean()),
+                          'unmet': int((~met).sum()), 'changed': changed,
+                          'consistent': consistent, 'within_bound': within}
+        print(f"{label:>12}: {elapsed * 1e3:7.2f} ms, mean terms "
+              f"{results[label]['mean_terms']:7.1f}, unmet {results[label]['unmet']:5d}, "
+              f"changed: {changed}, matches fresh family: {consistent}, "
+              f"within bound: {within}")
+    return results
+
+
+def benchmark_teichmuller(p=100003, precision=50, sample=200, seed=0):
+    """
+    Compare batched Teichmüller lifting with naive powering.
+    
+    The naive method omega(a) = a^(p^(N-1)) mod p^N is run on a random sample of
+    residues (it is far too slow for all of them at large p) and checked
+    against the batch result.
+    
+    Args:
+        p: Prime number
+        precision: Number N of p-adic digits
+        sample: Number of residues checked with the naive method
+        seed: Random seed
+        
+    Returns:
+        dict: Timings and the agreement flag
+    """
+    print("=== Teichmüller Representative Benchmark ===\n")
+    print(f"p = {p}, N = {precision}")
+    
+    start = time.perf_counter()
+    omega = teichmuller_representatives(p, precision)
+    batch_time = time.perf_counter() - start
+    print(f"Full table (Newton lift of a primitive root): {batch_time:.3f} s")
+    
+    rng = np.random.default_rng(seed)
+    residues = rng.integers(0, p, size=min(sample, p))
+    
+    start = time.perf_counter()
+    newton = teichmuller_representatives(p, precision, residues)
+    newton_time = time.perf_counter() - start
+    print(f"Vectorized Newton lift of {len(residues)} residues: {newton_time:.3f} s")
+    modulus = p**precision
+    exponent = p**(precision - 1)
+    
+    start = time.perf_counter()
+    naive = [pow(int(a), exponent, modulus) for a in residues]
+    naive_time = time.perf_counter() - start
+    per_residue = naive_time / len(residues)
+    print(f"Naive powering: {per_residue * 1e3:.3f} ms per residue "
+          f"(~{per_residue * p:.1f} s for all residues)")
+    
+    matches = all(int(omega[a]) == value == int(lift)
+                  for a, value, lift in zip(residues, naive, newton))
+    print(f"Table and Newton results match naive method on {len(residues)} residues: "
+          f"{matches}")
+    
+    return {'table': batch_time, 'newton': newton_time,
+            'naive_per_residue': per_residue, 'matches': matches}
+
+
+def benchmark_pairings(q=Fraction(1, 3), ell=7, num_points=1000, bound=20000, seed=0):
+    """
+    Time Tate and Weil pairings and count their field operations.
+    
+    The reduction of E_q modulo the first prime p <= bound with p = 1 mod ell
+    and full rational ell-torsion is used, so both pairings live in F_p.
+    Single pairings are compared with the batched variants, which share the
+    Miller loop of the first argument across all second arguments.
+    
+    Args:
+        q: Rational Tate parameter
+        ell: Odd prime order of the torsion points
+        num_points: Number of second arguments Q
+        bound: Largest prime searched
+        seed: Random seed
+        
+    Returns:
+        dict: Per-pairing time and operation counts for each method
+    """
+    print("=== Pairing Benchmark ===\n")
+    curve = TateCurve(q=q, precision=8)
+    counts = curve.point_counts(bound)
+    
+    engine = None
+    for prime, order in zip(counts['primes'].tolist(), counts['counts'].tolist()):
+        if prime < 5 or (prime - 1) % ell or order % ell**2:
+            continue
+        candidate = curve.pairing_engine(prime)
+        x, y = candidate.torsion_points(ell, num_points + 1, seed=seed)
+        P = (x[0], y[0])
+        # Drop Q in <P>, where the Miller function has its zeros and poles
+        multiples = set()
+        R = (np.array([P[0]]), np.array([P[1]]), np.array([1]))
+        for k in range(1, ell):
+            X, _, Z = _projective_multiply_mod(R, k, np.array([candidate.a]),
+                                               np.array([prime]))
+            multiples.add(int(X[0]) * pow(int(Z[0]), -1, prime) % prime)
+        keep = np.array([int(v) not in multiples for v in x[1:]])
+        if keep.any():
+            engine, x, y = candidate, x[1:][keep], y[1:][keep]
+            break
+    if engine is None:
+        raise ValueError(f"No prime <= {bound} with full rational {ell}-torsion")
+    
+    print(f"E_q mod {engine.prime}: y^2 = x^3 + {engine.a}x + {engine.b}, "
+          f"#E = {engine.order()}, ell = {ell}, {len(x)} points Q")
+    
+    results = {}
+    single = min(len(x), 50)
+    for name, method in (('tate', engine.tate_pairing), ('weil', engine.weil_pairing)):
+        engine.reset_counts()
+        start = time.perf_counter()
+        values = [method(P, (x[i], y[i]), ell) for i in range(single)]
+        elapsed = (time.perf_counter() - start) / single
+        results[name] = {'time': elapsed,
+                         **{k: v / single for k, v in engine.operation_counts.items()}}
+        
+        batched = getattr(engine, f"{name}_pairing_many")
+        engine.reset_counts()
+        start = time.perf_counter()
+        batch_values = batched(P, x, y, ell)
+        elapsed = (time.perf_counter() - start) / len(x)
+        results[f"{name}_many"] = {'time': elapsed,
+                                   **{k: v / len(x) for k, v in engine.operation_counts.items()}}
+        results[f"{name}_matches"] = values == batch_values[:single].tolist()
+    
+    for name in ('tate', 'tate_many', 'weil', 'weil_many'):
+        r = results[name]
+        print(f"{name:>10}: {r['time'] * 1e6:9.1f} us  mul {r['mul']:7.1f}  sqr {r['sqr']:6.1f}  "
+              f"add {r['add']:7.1f}  inv {r['inv']:5.3f}  per pairing")
+    print(f"Batched results match single pairings: "
+          f"{results['tate_matches'] and results['weil_matches']}")
+    
+    return results
+
+
+def benchmark_q_recovery(num_curves=10000, q_max=0.75, precision=400, seed=0):
+    """
+    Round-trip q -> (a_4, a_6) -> q_from_weierstrass() for random real q.
+    
+    Positive and negative q (split and non-split real curves) are checked
+    separately, down to |q| = 1e-6. Beyond |q| ~ 0.77 the sign of q is not
+    determined by double-precision coefficients (see q_from_weierstrass()).
+    
+    Args:
+        num_curves: Number of curves of each sign
+        q_max: Largest |q|
+        precision: Series truncation precision
+        seed: Random seed
+        
+    Returns:
+        dict: Timing and the largest relative errors for q > 0 and q < 0
+    """
+    print("=== q Recovery Round Trip ===\n")
+    rng = np.random.default_rng(seed)
+    magnitudes = np.exp(rng.uniform(np.log(1e-6), np.log(q_max), num_curves))
+    q = np.concatenate((magnitudes, -magnitudes))
+    
+    a_4, a_6 = TateCurveFamily(q_values=q, precision=precision).weierstrass_coefficients()
+    start = time.perf_counter()
+    recovered = q_from_weierstrass(a_4, a_6)
+    elapsed = time.perf_counter() - start
+    
+    error = np.abs(recovered - q) / np.abs(q)
+    results = {'time': elapsed,
+               'positive_error': float(error[q > 0].max()),
+               'negative_error': float(error[q < 0].max())}
+    print(f"{len(q)} curves, 1e-6 <= |q| <= {q_max}: {elapsed:.3f} s")
+    print(f"Max relative error: q > 0 {results['positive_error']:.2e}, "
+          f"q < 0 {results['negative_error']:.2e}")
+    return results
+
+
+BENCHMARKS = {
+    'scalar_multiplication': benchmark_scalar_multiplication,
+    'adaptive_precision': benchmark_adaptive_precision,
+    'teichmuller': benchmark_teichmuller,
+    'pairings': benchmark_pairings,
+    'q_recovery': benchmark_q_recovery,
+}
+
+
+def main(argv=None):
+    """Run the named benchmarks (all of them by default)."""
+    names = (sys.argv[1:] if argv is None else argv) or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s) {', '.join(unknown)}; "
+                         f"choose from {', '.join(BENCHMARKS)}")
+    for name in names:
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,14 @@ This module implements the simplest computable example of p-adic Teichmüller th
 using Tate curves (Tate uniformization) for elliptic curves over p-adic fields.
 """
 
+import math
+from collections import OrderedDict
+from fractions import Fraction
+
 import numpy as np
-from sympy import symbols, series, latex
-import matplotlib.pyplot as plt
+from sympy import symbols, series, latex, isprime
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 
 class TateCurve:
@@ -17,106 +22,484 @@ class TateCurve:
     The Tate curve E_q is defined by q-expansion formulas when |q|_p < 1.
     It provides p-adic Teichmüller uniformization and can be computed numerically
     using series truncation.
+    
+    E_q has two models here, related by X = x + 1/12, Y = y + x/2:
+    
+    - the Tate model y^2 + xy = x^3 + a_4*x + a_6, with a_4, a_6 the q-series
+      of weierstrass_coefficients(). The invariants (c_invariants(),
+      discriminant(), j_invariant()), reductions and point counts, periods
+      and the Tate parametrization are defined on it.
+    - the short model Y^2 = X^3 + A*X + B with A = -c_4/48, B = -c_6/864
+      (short_coefficients()). All points (group law, scalar multiplication,
+      sampling and plots, torsion, pairings, isogenies) live on this model;
+      to_short_model() and to_tate_model() convert between the two.
     """
     
-    def __init__(self, p=5, q=None, precision=10):
+    def __init__(self, p=5, q=None, precision=10, tolerance=None, max_precision=10000):
         """
         Initialize Tate curve with prime p and parameter q.
         
         Args:
             p: Prime number (default: 5)
-            q: Parameter q with |q|_p < 1 (default: p^(-3))
+            q: Parameter q with |q|_p < 1 (default: p^(-3)); a PAdic q makes the
+                series and group law run natively in Q_p, an int or Fraction q
+                gives exact rational series data
             precision: Series truncation precision
+            tolerance: If given, choose the number of series terms adaptively so
+                that the certified truncation error is at most tolerance
+                (precision is then ignored)
+            max_precision: Largest number of terms adaptive mode may use
         """
+        # Memoized q-series data, keyed by name; see _cached()
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
         self.p = p
         self.precision = precision
+        self.tolerance = tolerance
+        self.max_precision = max_precision
         
         if q is None:
             # Default: q = p^(-3) = 1/125 for p=5
             self.q = p**(-3)
         else:
             self.q = q
+    
+    @classmethod
+    def from_j(cls, j, p=5, precision=10, **kwargs):
+        """
+        Build the Tate curve with a given j-invariant.
+        
+        An int, Fraction or PAdic j is read p-adically: a Tate curve over Q_p
+        needs v_p(j) < 0, and then q = t + 744 t^2 + 750420 t^3 + ... with
+        t = 1/j converges p-adically (the reverted series has integer
+        coefficients), giving q to the full precision of j. A float or complex
+        j gives the real or complex q of q_from_j.
+        
+        Args:
+            j: j-invariant
+            p: Prime number (taken from j if it is a PAdic)
+            precision: Series truncation precision of the curve
+            **kwargs: Further TateCurve arguments (tolerance, max_precision)
+            
+        Returns:
+            TateCurve: Curve with j_invariant() equal to j
+        """
+        if isinstance(j, PAdic):
+            p = j.p
+        if isinstance(j, (int, Fraction, PAdic)):
+            j = PAdic(p, j, precision=j.precision if isinstance(j, PAdic) else None)
+            if j.is_zero() or j.valuation() >= 0:
+                raise ValueError(f"A Tate curve over Q_{p} needs v_p(j) < 0")
+            t = 1 / j
+            # t^n has valuation n v(t); stop once the terms are below q's precision
+            terms = -(-j.precision // t.valuation()) + 1
+            q = _horner(np.array(q_from_j_coefficients(terms), dtype=object), t)
+        else:
+            q = q_from_j(j)[()]
+            q = complex(q) if np.iscomplexobj(q) else float(q)
+        return cls(p=p, q=q, precision=precision, **kwargs)
+    
+    @property
+    def q(self):
+        """Tate parameter q."""
+        return self._q
+    
+    @q.setter
+    def q(self, value):
+        if isinstance(value, PAdic) and value.p != self.p:
+            raise ValueError(f"q is {value.p}-adic but the curve has p = {self.p}")
+        # Verify 0 < |q|_p < 1 (for PAdic q, abs() is the p-adic absolute value)
+        if value.is_zero() if isinstance(value, PAdic) else value == 0:
+            raise ValueError(f"q must be nonzero (0 < |q| < 1), got {value}")
+        if abs(value) >= 1:
+            raise ValueError(f"|q|_p must be < 1, got |{value}| = {abs(value)}")
+        self._q = value
+        self.clear_cache()
+    
+    @property
+    def p(self):
+        """Prime p (fixed by a PAdic q, which must have the same prime)."""
+        return self._p
+    
+    @p.setter
+    def p(self, value):
+        q = getattr(self, '_q', None)
+        if isinstance(q, PAdic) and q.p != value:
+            raise ValueError(f"q is {q.p}-adic, so p cannot change to {value}; build a new "
+                             f"TateCurve with a {value}-adic q instead")
+        self._p = value
+        self.clear_cache()
+    
+    @property
+    def precision(self):
+        """Series truncation precision."""
+        return self._precision
+    
+    @precision.setter
+    def precision(self, value):
+        self._precision = value
+        self.clear_cache()
+    
+    @property
+    def tolerance(self):
+        """Target truncation error for adaptive precision (None for fixed precision)."""
+        return self._tolerance
+    
+    @tolerance.setter
+    def tolerance(self, value):
+        self._tolerance = value
+        self.clear_cache()
+    
+    @property
+    def max_precision(self):
+        """Largest number of series terms adaptive mode may use."""
+        return self._max_precision
+    
+    @max_precision.setter
+    def max_precision(self, value):
+        self._max_precision = value
+        self.clear_cache()
+    
+    def _cached(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
             
-        # Verify |q|_p < 1
-        if abs(self.q) >= 1:
-            raise ValueError(f"|q|_p must be < 1, got |{self.q}| = {abs(self.q)}")
+        Returns:
+            The cached (or freshly computed) value
+        """
+        if key in self._cache:
+            self._cache_hits += 1
+            return self._cache[key]
+        
+        self._cache_misses += 1
+        value = compute()
+        self._cache[key] = value
+        return value
+    
+    def clear_cache(self):
+        """
+        Drop all memoized series data. Called whenever q, p, precision or
+        the adaptive-precision settings change.
+        """
+        self._cache.clear()
+    
+    def cache_info(self):
+        """
+        Report cache statistics.
+        
+        Returns:
+            dict: Hit and miss counters and the number of cached entries
+        """
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'size': len(self._cache),
+        }
     
     def weierstrass_coefficients(self):
         """
         Compute Weierstrass coefficients a_4(q) and a_6(q) using Tate curve formulas.
         
+        The result is memoized until q, p or precision is reassigned.
+        
         Returns:
             tuple: (a_4, a_6) coefficients
         """
-        q = self.q
+        return self._cached('weierstrass', self._compute_weierstrass_coefficients)
+    
+    def is_p_adic(self):
+        """Whether the curve works natively in Q_p (q is a PAdic number)."""
+        return isinstance(self.q, PAdic)
+    
+    def is_exact(self):
+        """Whether q is rational (int or Fraction), so the series data is exact."""
+        return isinstance(self.q, (int, Fraction))
+    
+    def series_terms(self):
+        """
+        Number of q-series terms used for the Weierstrass coefficients.
+        
+        In fixed mode this is precision. In adaptive mode it is the smallest
+        number of terms whose certified tail bound is within tolerance.
         
-        # Tate curve formulas for Weierstrass coefficients
-        # a_4(q) = -5 * sum of n^3 * q^n / (1 - q^n) for n >= 1
-        # a_6(q) = -1/12 * sum of (7n^5 + 5n^3) * q^n / (1 - q^n) for n >= 1
+        The series are power series cut after q^terms, not sums of that many
+        full Lambert terms n^k q^n / (1 - q^n): the two differ at order
+        q^(terms + 1), which is not small unless |q| is. At q = -0.5 with
+        precision 10, for example, a_4 is -10.20 here against -10.73 from ten
+        Lambert terms (the limit is -8.77).
         
-        a_4 = 0
-        a_6 = 0
+        Returns:
+            int: Number of terms
+        """
+        if self.tolerance is None:
+            return self.precision
         
-        for n in range(1, self.precision + 1):
-            q_n = q**n
-            denom = 1 - q_n
+        def compute():
+            if self.is_p_adic():
+                # |tail|_p <= |q|_p^(terms + 1) since the coefficients are integers
+                v = self.q.valuation()
+                needed = math.ceil(math.log(1 / self.tolerance, self.p) / v) - 1
+                return min(max(needed, 1), self.max_precision)
             
-            if abs(denom) < 1e-10:  # Avoid division by zero
-                continue
+            terms = int(terms_for_tolerance(abs(self.q), self.tolerance,
+                                            self.max_precision)[0])
+            if terms < 0:
+                raise ValueError(
+                    f"Tolerance {self.tolerance} not reachable for |q| = {abs(self.q)} "
+                    f"within {self.max_precision} terms"
+                )
+            return terms
+        
+        return self._cached('series_terms', compute)
+    
+    def truncation_error(self):
+        """
+        Certified bounds on the series truncation error of a_4 and a_6.
+        
+        For PAdic q the bounds are p-adic absolute values.
+        
+        Returns:
+            tuple: (bound for a_4, bound for a_6); inf if no bound applies
+        """
+        def compute():
+            if self.is_p_adic():
+                bound = abs(self.q)**(self.series_terms() + 1)
+                return bound, bound
+            bound_4, bound_6 = truncation_error_bound(abs(self.q), self.series_terms())
+            return float(bound_4), float(bound_6)
+        
+        return self._cached('truncation_error', compute)
+    
+    def _compute_weierstrass_coefficients(self):
+        """
+        Evaluate the truncated q-series for (a_4, a_6).
+        
+        The Lambert series are expanded once into integer power series (see
+        weierstrass_series_coefficients()), so a new q only costs a Horner pass.
+        For rational q that pass runs on integers over a common denominator
+        (see _horner_rational()), so the result is exact; it costs from a few
+        times to about a hundred times the float pass, growing with the number
+        of terms and with the size of the numerator and denominator of q.
+        
+        Returns:
+            tuple: (a_4, a_6) coefficients
+        """
+        a_4_coeffs, a_6_coeffs = _series_prefix(self.series_terms())
+        return _horner(a_4_coeffs, self.q), _horner(a_6_coeffs, self.q)
+    
+    def c_invariants(self):
+        """
+        Compute the invariants c_4, c_6 of the Tate model y^2 + xy = x^3 + a_4*x + a_6.
+        
+        These are the Eisenstein series c_4 = 1 + 240*sum sigma_3(n) q^n and
+        c_6 = -(1 - 504*sum sigma_5(n) q^n).
+        
+        Returns:
+            tuple: (c_4, c_6)
+        """
+        def compute():
+            a_4, a_6 = self.weierstrass_coefficients()
+            c_4 = 1 - 48 * a_4
+            c_6 = -1 + 72 * a_4 - 864 * a_6
+            return c_4, c_6
+        
+        return self._cached('c_invariants', compute)
+    
+    def discriminant(self):
+        """
+        Compute the discriminant Delta = (c_4^3 - c_6^2) / 1728 of the Tate model.
+        
+        For the Tate curve this is q * prod (1 - q^n)^24.
+        
+        Returns:
+            Discriminant Delta(q)
+        """
+        def compute():
+            c_4, c_6 = self.c_invariants()
+            return (c_4**3 - c_6**2) / 1728
+        
+        return self._cached('discriminant', compute)
+    
+    def j_invariant(self):
+        """
+        Compute the j-invariant j = c_4^3 / Delta = 1/q + 744 + 196884 q + ...
+        
+        Returns:
+            j-invariant j(q)
+        """
+        def compute():
+            c_4, _ = self.c_invariants()
+            return c_4**3 / self.discriminant()
+        
+        return self._cached('j_invariant', compute)
+    
+    def short_coefficients(self):
+        """
+        Coefficients (A, B) of the short model Y^2 = X^3 + A*X + B of E_q.
+        
+        A = -c_4/48 = a_4 - 1/48 and B = -c_6/864 = a_6 - a_4/12 + 1/864; this
+        is the model the group law and every point-valued method use.
+        
+        Returns:
+            tuple: (A, B)
+        """
+        def compute():
+            a_4, a_6 = self.weierstrass_coefficients()
+            return a_4 - Fraction(1, 48), a_6 - a_4 / 12 + Fraction(1, 864)
+        
+        return self._cached('short_coefficients', compute)
+    
+    def to_short_model(self, x, y):
+        """
+        Map points of the Tate model to the short model: X = x + 1/12, Y = y + x/2.
+        
+        Args:
+            x, y: Coordinates on the Tate model (scalars or arrays; inf for
+                the point at infinity)
                 
-            # a_4 coefficient
-            a_4 += -5 * (n**3) * q_n / denom
-            
-            # a_6 coefficient  
-            a_6 += -(1/12) * (7 * n**5 + 5 * n**3) * q_n / denom
+        Returns:
+            tuple: (X, Y) on the short model
+        """
+        return x + Fraction(1, 12) if _is_exact_number(x) else x + 1 / 12, y + x / 2
+    
+    def to_tate_model(self, X, Y):
+        """
+        Map points of the short model to the Tate model: x = X - 1/12, y = Y - x/2.
         
-        return a_4, a_6
+        Args:
+            X, Y: Coordinates on the short model (scalars or arrays)
+            
+        Returns:
+            tuple: (x, y) on the Tate model
+        """
+        x = X - Fraction(1, 12) if _is_exact_number(X) else X - 1 / 12
+        return x, Y - x / 2
     
     def elliptic_curve_equation(self):
         """
-        Return the elliptic curve equation y^2 = x^3 + a_4*x + a_6.
+        Return the short Weierstrass equation Y^2 = X^3 + A*X + B of E_q.
+        
+        This is the model the points live on (see short_coefficients()).
         
         Returns:
             str: Equation as string
         """
-        a_4, a_6 = self.weierstrass_coefficients()
-        return f"y^2 = x^3 + {a_4:.6f}*x + {a_6:.6f}"
+        A, B = self.short_coefficients()
+        return f"y^2 = x^3 + {_format_number(A)}*x + {_format_number(B)}"
     
-    def point_addition(self, P1, P2):
+    def _as_point_array(self, P):
         """
-        Compute point addition on the elliptic curve.
+        Coerce points to a float array of shape (N, 2).
         
         Args:
-            P1, P2: Points as tuples (x, y) or (x, y, z) for projective coordinates
+            P: A single point (x, y) or an array-like of shape (N, 2)
             
         Returns:
-            tuple: Sum point P1 + P2
+            numpy.ndarray: Points as an (N, 2) float array
         """
-        if len(P1) == 2 and len(P2) == 2:
-            x1, y1 = P1
-            x2, y2 = P2
-            
-            # Handle point at infinity
-            if x1 == float('inf'):
-                return P2
-            if x2 == float('inf'):
-                return P1
-            
-            # Handle same point (point doubling)
-            if abs(x1 - x2) < 1e-10:
-                if abs(y1 - y2) < 1e-10:
-                    return self.point_doubling(P1)
-                else:
-                    return (float('inf'), float('inf'))  # Point at infinity
-            
-            # Standard point addition formula
-            a_4, a_6 = self.weierstrass_coefficients()
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        if P.ndim != 2 or P.shape[1] != 2:
+            raise ValueError(f"Points must have shape (N, 2), got {P.shape}")
+        return P
+    
+    def add_many(self, P, Q):
+        """
+        Vectorized point addition P[i] + Q[i] for arrays of affine points.
+        
+        The point at infinity is (inf, inf). Identity, inverse-pair and doubling
+        cases are resolved with masks, so the whole batch is a fixed number of
+        array operations.
+        
+        Args:
+            P, Q: Arrays of shape (N, 2) (a single point broadcasts against N)
             
+        Returns:
+            numpy.ndarray: Sums as an (N, 2) array
+        """
+        P, Q = np.broadcast_arrays(self._as_point_array(P), self._as_point_array(Q))
+        x1, y1 = P[:, 0], P[:, 1]
+        x2, y2 = Q[:, 0], Q[:, 1]
+        
+        p_inf = np.isinf(x1)
+        q_inf = np.isinf(x2) & ~p_inf
+        finite = ~p_inf & ~q_inf
+        
+        # Standard point addition formula; masked lanes may divide by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            same_x = finite & (np.abs(x1 - x2) < 1e-10)
+            doubling = same_x & (np.abs(y1 - y2) < 1e-10)
+            generic = finite & ~same_x
             slope = (y2 - y1) / (x2 - x1)
             x3 = slope**2 - x1 - x2
             y3 = slope * (x1 - x3) - y1
+        
+        # Inverse pairs (same x, different y) stay at infinity
+        result = np.full(P.shape, np.inf)
+        result[generic, 0] = x3[generic]
+        result[generic, 1] = y3[generic]
+        if doubling.any():
+            result[doubling] = self.double_many(P[doubling])
+        result[p_inf] = Q[p_inf]
+        result[q_inf] = P[q_inf]
+        
+        return result
+    
+    def double_many(self, P):
+        """
+        Vectorized point doubling 2*P[i] for an array of affine points.
+        
+        Args:
+            P: Array of shape (N, 2)
+            
+        Returns:
+            numpy.ndarray: Doubled points as an (N, 2) array
+        """
+        P = self._as_point_array(P)
+        x, y = P[:, 0], P[:, 1]
+        A, B = self.short_coefficients()
+        
+        # Points of order 2 and the point at infinity double to infinity
+        to_infinity = (y == 0) | np.isinf(x)
+        
+        # Doubling formula
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (3 * x**2 + A) / (2 * y)
+            x2 = slope**2 - 2 * x
+            y2 = slope * (x - x2) - y
+        
+        result = np.column_stack((x2, y2))
+        result[to_infinity] = np.inf
+        
+        return result
+    
+    def point_addition(self, P1, P2):
+        """
+        Compute point addition on the elliptic curve.
+        
+        Thin wrapper around add_many() for a single pair of points (or the
+        exact Q_p group law when the curve is p-adic).
+        
+        Args:
+            P1, P2: Points as tuples (x, y) or (x, y, z) for projective coordinates
             
-            return (x3, y3)
+        Returns:
+            tuple: Sum point P1 + P2
+        """
+        if self.is_p_adic():
+            return self._p_adic_point_addition(P1, P2)
+        
+        if len(P1) == 2 and len(P2) == 2:
+            x3, y3 = self.add_many(P1, P2)[0]
+            return (float(x3), float(y3))
+        
+        if len(P1) == 3 and len(P2) == 3:
+            return tuple(float(c) for c in self.projective_add_many(P1, P2)[0])
         
         return (float('inf'), float('inf'))
     
@@ -124,89 +507,3941 @@ class TateCurve:
         """
         Compute point doubling 2*P on the elliptic curve.
         
+        Thin wrapper around double_many() for a single point (or the exact Q_p
+        group law when the curve is p-adic).
+        
         Args:
-            P: Point as tuple (x, y)
+            P: Point as tuple (x, y) or (x, y, z) for projective coordinates
             
         Returns:
             tuple: Doubled point 2*P
         """
+        if self.is_p_adic():
+            return self._p_adic_point_doubling(P)
+        
         if len(P) == 2:
-            x, y = P
+            x2, y2 = self.double_many(P)[0]
+            return (float(x2), float(y2))
+        
+        if len(P) == 3:
+            return tuple(float(c) for c in self.projective_double_many(P)[0])
+        
+        return (float('inf'), float('inf'))
+    
+    def _as_homogeneous_array(self, P):
+        """
+        Coerce points to a float array of shape (N, 3).
+        
+        Args:
+            P: A single point (X, Y, Z) or an array-like of shape (N, 3)
             
-            if y == 0:  # Point of order 2
-                return (float('inf'), float('inf'))
+        Returns:
+            numpy.ndarray: Points as an (N, 3) float array
+        """
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        if P.ndim != 2 or P.shape[1] != 3:
+            raise ValueError(f"Points must have shape (N, 3), got {P.shape}")
+        return P
+    
+    def to_projective(self, P):
+        """
+        Convert affine points to projective coordinates (x, y, 1).
+        
+        The point at infinity maps to (0, 1, 0).
+        
+        Args:
+            P: Array of shape (N, 2)
             
-            a_4, a_6 = self.weierstrass_coefficients()
+        Returns:
+            numpy.ndarray: Projective points as an (N, 3) array
+        """
+        P = self._as_point_array(P)
+        result = np.column_stack((P, np.ones(len(P))))
+        result[np.isinf(P[:, 0])] = (0.0, 1.0, 0.0)
+        return result
+    
+    def from_projective(self, P):
+        """
+        Convert projective points (X, Y, Z) to affine (X/Z, Y/Z).
+        
+        All Z coordinates are inverted together with batch_inverse(), so the
+        whole batch costs a single division.
+        
+        Args:
+            P: Array of shape (N, 3)
             
-            # Doubling formula
-            slope = (3 * x**2 + a_4) / (2 * y)
-            x2 = slope**2 - 2 * x
-            y2 = slope * (x - x2) - y
+        Returns:
+            numpy.ndarray: Affine points as an (N, 2) array
+        """
+        P = self._as_homogeneous_array(P)
+        z_inv = batch_inverse(P[:, 2])
+        with np.errstate(invalid='ignore'):
+            result = P[:, :2] * z_inv[:, None]
+        result[P[:, 2] == 0] = np.inf
+        return result
+    
+    def to_jacobian(self, P):
+        """
+        Convert affine points to Jacobian coordinates (x, y, 1).
+        
+        The point at infinity maps to (1, 1, 0).
+        
+        Args:
+            P: Array of shape (N, 2)
             
-            return (x2, y2)
+        Returns:
+            numpy.ndarray: Jacobian points as an (N, 3) array
+        """
+        P = self._as_point_array(P)
+        result = np.column_stack((P, np.ones(len(P))))
+        result[np.isinf(P[:, 0])] = (1.0, 1.0, 0.0)
+        return result
+    
+    def from_jacobian(self, P):
+        """
+        Convert Jacobian points (X, Y, Z) to affine (X/Z^2, Y/Z^3).
         
-        return (float('inf'), float('inf'))
+        Args:
+            P: Array of shape (N, 3)
+            
+        Returns:
+            numpy.ndarray: Affine points as an (N, 2) array
+        """
+        P = self._as_homogeneous_array(P)
+        z_inv = batch_inverse(P[:, 2])
+        z_inv2 = z_inv * z_inv
+        with np.errstate(invalid='ignore'):
+            result = np.column_stack((P[:, 0] * z_inv2, P[:, 1] * z_inv2 * z_inv))
+        result[P[:, 2] == 0] = np.inf
+        return result
     
-    def compute_points(self, x_range=(-2, 2), num_points=100):
+    def projective_add_many(self, P, Q):
         """
-        Compute points on the elliptic curve for visualization.
+        Vectorized addition in projective coordinates (no divisions).
+        
+        Uses the add-1998-cmo-2 formulas for y^2 z = x^3 + a_4 x z^2 + a_6 z^3.
         
         Args:
-            x_range: Range of x values to sample
-            num_points: Number of points to compute
+            P, Q: Arrays of shape (N, 3)
             
         Returns:
-            list: List of (x, y) points on the curve
+            numpy.ndarray: Sums as an (N, 3) array
         """
-        a_4, a_6 = self.weierstrass_coefficients()
-        points = []
+        P, Q = np.broadcast_arrays(self._as_homogeneous_array(P),
+                                   self._as_homogeneous_array(Q))
+        X1, Y1, Z1 = P.T
+        X2, Y2, Z2 = Q.T
+        
+        Y1Z2 = Y1 * Z2
+        X1Z2 = X1 * Z2
+        Z1Z2 = Z1 * Z2
+        u = Y2 * Z1 - Y1Z2
+        v = X2 * Z1 - X1Z2
+        uu = u * u
+        vv = v * v
+        vvv = v * vv
+        R = vv * X1Z2
+        A = uu * Z1Z2 - vvv - 2 * R
+        result = np.column_stack((v * A, u * (R - A) - vvv * Y1Z2, vvv * Z1Z2))
         
-        x_values = np.linspace(x_range[0], x_range[1], num_points)
+        # Cross-multiplied coordinates carry a factor Z1*Z2
+        p_inf = Z1 == 0
+        q_inf = (Z2 == 0) & ~p_inf
+        finite = ~p_inf & ~q_inf
+        tolerance = 1e-10 * np.abs(Z1Z2)
+        same_x = finite & (np.abs(v) < tolerance)
+        doubling = same_x & (np.abs(u) < tolerance)
+        
+        result[same_x] = (0.0, 1.0, 0.0)
+        if doubling.any():
+            result[doubling] = self.projective_double_many(P[doubling])
+        result[p_inf] = Q[p_inf]
+        result[q_inf] = P[q_inf]
+        
+        return _rescale_homogeneous(result, weights=(1, 1, 1))
+    
+    def projective_double_many(self, P):
+        """
+        Vectorized doubling in projective coordinates (dbl-2007-bl).
         
-        for x in x_values:
-            # Solve y^2 = x^3 + a_4*x + a_6
-            discriminant = x**3 + a_4*x + a_6
+        Args:
+            P: Array of shape (N, 3)
             
-            if discriminant >= 0:
-                y = np.sqrt(discriminant)
-                points.append((x, y))
-                if y != 0:  # Add negative y if y != 0
-                    points.append((x, -y))
+        Returns:
+            numpy.ndarray: Doubled points as an (N, 3) array
+        """
+        P = self._as_homogeneous_array(P)
+        X1, Y1, Z1 = P.T
+        A, B = self.short_coefficients()
         
-        return points
+        XX = X1 * X1
+        w = A * Z1 * Z1 + 3 * XX
+        s = 2 * Y1 * Z1
+        ss = s * s
+        R = Y1 * s
+        RR = R * R
+        B = (X1 + R)**2 - XX - RR
+        h = w * w - 2 * B
+        result = np.column_stack((h * s, w * (B - h) - 2 * RR, s * ss))
+        
+        # Points of order 2 and infinity have s = 0 and land on Z = 0
+        result[s == 0] = (0.0, 1.0, 0.0)
+        
+        return _rescale_homogeneous(result, weights=(1, 1, 1))
     
-    def plot_curve(self, x_range=(-2, 2), num_points=100, save_path=None):
+    def jacobian_add_many(self, P, Q):
         """
-        Plot the Tate curve.
+        Vectorized addition in Jacobian coordinates (add-2007-bl).
         
         Args:
-            x_range: Range of x values to plot
-            num_points: Number of points for plotting
-            save_path: Path to save the plot (optional)
+            P, Q: Arrays of shape (N, 3)
+            
+        Returns:
+            numpy.ndarray: Sums as an (N, 3) array
+        """
+        P, Q = np.broadcast_arrays(self._as_homogeneous_array(P),
+                                   self._as_homogeneous_array(Q))
+        X1, Y1, Z1 = P.T
+        X2, Y2, Z2 = Q.T
+        
+        Z1Z1 = Z1 * Z1
+        Z2Z2 = Z2 * Z2
+        U1 = X1 * Z2Z2
+        U2 = X2 * Z1Z1
+        S1 = Y1 * Z2 * Z2Z2
+        S2 = Y2 * Z1 * Z1Z1
+        H = U2 - U1
+        I = (2 * H)**2
+        J = H * I
+        r = 2 * (S2 - S1)
+        V = U1 * I
+        X3 = r * r - J - 2 * V
+        Y3 = r * (V - X3) - 2 * S1 * J
+        Z3 = ((Z1 + Z2)**2 - Z1Z1 - Z2Z2) * H
+        result = np.column_stack((X3, Y3, Z3))
+        
+        # U and S carry factors (Z1 Z2)^2 and (Z1 Z2)^3 respectively
+        p_inf = Z1 == 0
+        q_inf = (Z2 == 0) & ~p_inf
+        finite = ~p_inf & ~q_inf
+        Z1Z2 = np.abs(Z1 * Z2)
+        same_x = finite & (np.abs(H) < 1e-10 * Z1Z2**2)
+        doubling = same_x & (np.abs(S2 - S1) < 1e-10 * Z1Z2**3)
+        
+        result[same_x] = (1.0, 1.0, 0.0)
+        if doubling.any():
+            result[doubling] = self.jacobian_double_many(P[doubling])
+        result[p_inf] = Q[p_inf]
+        result[q_inf] = P[q_inf]
+        
+        return _rescale_homogeneous(result, weights=(2, 3, 1))
+    
+    def jacobian_double_many(self, P):
         """
-        points = self.compute_points(x_range, num_points)
+        Vectorized doubling in Jacobian coordinates (dbl-2007-bl).
         
-        if points:
-            x_coords, y_coords = zip(*points)
+        Args:
+            P: Array of shape (N, 3)
             
-            plt.figure(figsize=(10, 8))
-            plt.scatter(x_coords, y_coords, s=1, alpha=0.6)
-            plt.xlabel('x')
-            plt.ylabel('y')
-            plt.title(f'Tate Curve E_q with q = {self.q:.6f}, p = {self.p}')
-            plt.grid(True, alpha=0.3)
-            plt.axis('equal')
+        Returns:
+            numpy.ndarray: Doubled points as an (N, 3) array
+        """
+        P = self._as_homogeneous_array(P)
+        X1, Y1, Z1 = P.T
+        A, B = self.short_coefficients()
+        
+        XX = X1 * X1
+        YY = Y1 * Y1
+        YYYY = YY * YY
+        ZZ = Z1 * Z1
+        S = 2 * ((X1 + YY)**2 - XX - YYYY)
+        M = 3 * XX + A * ZZ * ZZ
+        T = M * M - 2 * S
+        result = np.column_stack((T, M * (S - T) - 8 * YYYY, 2 * Y1 * Z1))
+        
+        # Points of order 2 and infinity land on Z = 0
+        result[result[:, 2] == 0] = (1.0, 1.0, 0.0)
+        
+        return _rescale_homogeneous(result, weights=(2, 3, 1))
+    
+    def _coordinate_ops(self, coordinates):
+        """
+        Group-law primitives for a coordinate system.
+        
+        Args:
+            coordinates: 'affine', 'projective' or 'jacobian'
             
-            if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
-                print(f"Plot saved to: {save_path}")
-            else:
-                plt.show()
+        Returns:
+            tuple: (add, double, negate, identity, to_coords, from_coords)
+        """
+        if coordinates == 'affine':
+            return (self.add_many, self.double_many, self.negate_many,
+                    (np.inf, np.inf), self._as_point_array, self._as_point_array)
+        if coordinates == 'projective':
+            return (self.projective_add_many, self.projective_double_many,
+                    _negate_homogeneous, (0.0, 1.0, 0.0),
+                    self.to_projective, self.from_projective)
+        if coordinates == 'jacobian':
+            return (self.jacobian_add_many, self.jacobian_double_many,
+                    _negate_homogeneous, (1.0, 1.0, 0.0),
+                    self.to_jacobian, self.from_jacobian)
+        raise ValueError(f"Unknown coordinate system: {coordinates}")
     
-    def __str__(self):
-        """String representation of the Tate curve."""
-        a_4, a_6 = self.weierstrass_coefficients()
-        return f"Tate Curve E_q: y^2 = x^3 + {a_4:.6f}*x + {a_6:.6f} (q = {self.q:.6f}, p = {self.p})"
+    def _p_adic_point_addition(self, P1, P2):
+        """
+        Affine addition with PAdic coordinates; equality is p-adic equality.
+        
+        Args:
+            P1, P2: Points (x, y) with PAdic coordinates, or (inf, inf)
+            
+        Returns:
+            tuple: Sum point P1 + P2
+        """
+        if _is_infinity(P1):
+            return P2
+        if _is_infinity(P2):
+            return P1
+        
+        x1, y1 = P1
+        x2, y2 = P2
+        if x1 == x2:
+            if y1 == y2:
+                return self._p_adic_point_doubling(P1)
+            return (float('inf'), float('inf'))
+        
+        slope = (y2 - y1) / (x2 - x1)
+        x3 = slope * slope - x1 - x2
+        y3 = slope * (x1 - x3) - y1
+        return (x3, y3)
+    
+    def _p_adic_point_doubling(self, P):
+        """
+        Affine doubling with PAdic coordinates.
+        
+        Args:
+            P: Point (x, y) with PAdic coordinates, or (inf, inf)
+            
+        Returns:
+            tuple: Doubled point 2*P
+        """
+        if _is_infinity(P):
+            return P
+        
+        x, y = P
+        if y == 0:  # Point of order 2
+            return (float('inf'), float('inf'))
+        
+        A, B = self.short_coefficients()
+        slope = (3 * x * x + A) / (2 * y)
+        x2 = slope * slope - 2 * x
+        y2 = slope * (x - x2) - y
+        return (x2, y2)
+    
+    def point_from_x(self, x):
+        """
+        Find a point with the given x-coordinate.
+        
+        Solves the short model y^2 = x^3 + A*x + B, by Hensel lifting when the
+        curve is p-adic.
+        
+        Args:
+            x: x-coordinate (float, or int/Fraction/PAdic for p-adic curves)
+            
+        Returns:
+            tuple: Point (x, y)
+            
+        Raises:
+            ValueError: If x^3 + A*x + B is not a square
+        """
+        A, B = self.short_coefficients()
+        if self.is_p_adic():
+            x = PAdic(self.p, x, precision=self.q.precision)
+            return (x, (x * x * x + A * x + B).sqrt())
+        
+        rhs = x**3 + A * x + B
+        if rhs < 0:
+            raise ValueError(f"No real point with x = {x}")
+        return (x, float(np.sqrt(rhs)))
+    
+    def negate_many(self, P):
+        """
+        Vectorized point negation -P[i] = (x, -y); infinity stays at infinity.
+        
+        Args:
+            P: Array of shape (N, 2)
+            
+        Returns:
+            numpy.ndarray: Negated points as an (N, 2) array
+        """
+        result = self._as_point_array(P).copy()
+        finite = ~np.isinf(result[:, 0])
+        result[finite, 1] = -result[finite, 1]
+        return result
+    
+    def multiply(self, P, k, method='naf', width=4, coordinates='affine'):
+        """
+        Compute the scalar multiple k*P.
+        
+        Thin wrapper around multiply_many() for a single point and scalar.
+        
+        Args:
+            P: Point as tuple (x, y)
+            k: Integer scalar (may be negative)
+            method: 'double_and_add', 'naf' or 'ladder'
+            width: NAF window width (only used by 'naf')
+            coordinates: 'affine', 'projective' or 'jacobian'
+            
+        Returns:
+            tuple: k*P
+        """
+        if self.is_p_adic():
+            # Binary double-and-add on the exact Q_p group law
+            if k < 0:
+                P, k = (P[0], -P[1]), -k
+            R = (float('inf'), float('inf'))
+            for bit in bin(k)[2:] if k else '':
+                R = self._p_adic_point_doubling(R)
+                if bit == '1':
+                    R = self._p_adic_point_addition(R, P)
+            return R
+        
+        x, y = self.multiply_many(P, [k], method=method, width=width,
+                                  coordinates=coordinates)[0]
+        return (float(x), float(y))
+    
+    def multiply_many(self, P, k, method='naf', width=4, coordinates='affine'):
+        """
+        Vectorized scalar multiplication k[i]*P[i].
+        
+        Every lane runs the same O(log k) schedule of batched group operations,
+        so many scalars and/or many points cost a handful of array passes per bit.
+        With projective or Jacobian coordinates the chain is division-free and
+        the results are brought back to affine with one batch inversion.
+        
+        Args:
+            P: Array of shape (N, 2) (a single point broadcasts against k)
+            k: Integer scalar or array-like of N integers (Python ints of any size)
+            method: 'double_and_add' (binary baseline), 'naf' (width-w NAF with
+                precomputed odd multiples) or 'ladder' (Montgomery ladder)
+            width: NAF window width w >= 2
+            coordinates: 'affine', 'projective' or 'jacobian'
+            
+        Returns:
+            numpy.ndarray: Products as an (N, 2) array
+        """
+        k = _as_scalar_array(k)
+        P = self._as_point_array(P)
+        P = np.broadcast_to(P, (max(len(P), len(k)), 2))
+        k = np.broadcast_to(k, (len(P),))
+        
+        # Fold signs into the points so the schedules only see k >= 0
+        negative = k < 0
+        P = np.where(negative[:, None], self.negate_many(P), P)
+        k = np.where(negative, -k, k)
+        
+        ops = self._coordinate_ops(coordinates)
+        P = ops[4](P)
+        
+        if method == 'double_and_add':
+            R = self._multiply_double_and_add(P, k, ops)
+        elif method == 'naf':
+            if width < 2:
+                raise ValueError(f"NAF width must be >= 2, got {width}")
+            R = self._multiply_naf(P, k, width, ops)
+        elif method == 'ladder':
+            R = self._multiply_ladder(P, k, ops)
+        else:
+            raise ValueError(f"Unknown scalar multiplication method: {method}")
+        
+        return ops[5](R)
+    
+    def _multiply_double_and_add(self, P, k, ops):
+        """Left-to-right binary double-and-add over all lanes."""
+        add, double, negate, identity = ops[:4]
+        bits = _binary_digits(k)
+        R = np.tile(identity, (len(P), 1))
+        
+        for column in bits.T:
+            R = double(R)
+            mask = column == 1
+            if mask.any():
+                R[mask] = add(R[mask], P[mask])
+        
+        return R
+    
+    def _multiply_naf(self, P, k, width, ops):
+        """Left-to-right width-w NAF with a table of odd multiples P, 3P, ..."""
+        add, double, negate, identity = ops[:4]
+        digits = _naf_digits(k, width)
+        
+        # table[i] = (2i + 1) * P
+        table = [P]
+        if width > 2:
+            P2 = double(P)
+            for _ in range((1 << (width - 2)) - 1):
+                table.append(add(table[-1], P2))
+        table = np.stack(table)
+        lanes = np.arange(len(P))
+        
+        R = np.tile(identity, (len(P), 1))
+        for column in digits.T:
+            R = double(R)
+            mask = column != 0
+            if mask.any():
+                d = column[mask]
+                Q = table[np.abs(d) // 2, lanes[mask]]
+                Q = np.where((d < 0)[:, None], negate(Q), Q)
+                R[mask] = add(R[mask], Q)
+        
+        return R
+    
+    def _multiply_ladder(self, P, k, ops):
+        """Montgomery ladder: one addition and one doubling per bit."""
+        add, double, negate, identity = ops[:4]
+        bits = _binary_digits(k)
+        R0 = np.tile(identity, (len(P), 1))
+        R1 = P.copy()
+        
+        for column in bits.T:
+            bit = (column == 1)[:, None]
+            S = add(R0, R1)
+            D = double(np.where(bit, R1, R0))
+            R0 = np.where(bit, S, D)
+            R1 = np.where(bit, D, S)
+        
+        return R0
+    
+    def reduction_coefficients(self):
+        """
+        Exact rational Weierstrass data of E_q for rational q.
+        
+        Returns:
+            tuple: (a_4, a_6, discriminant) as Fractions for the Tate model
+            y^2 + xy = x^3 + a_4*x + a_6
+            
+        Raises:
+            ValueError: If q is not an int or Fraction
+        """
+        if not self.is_exact():
+            raise ValueError(f"Reduction mod primes needs a rational q (int or Fraction), "
+                             f"got {type(self.q).__name__}")
+        
+        def compute():
+            a_4, a_6 = (Fraction(c) for c in self.weierstrass_coefficients())
+            delta = _tate_discriminant(a_4, a_6)
+            return a_4, a_6, delta
+        
+        return self._cached('reduction_coefficients', compute)
+    
+    def point_counts(self, bound, legendre_bound=1000, batch_size=4096, seed=0):
+        """
+        Count points on the reductions of E_q modulo all good primes l <= bound.
+        
+        For rational q the (truncated) Tate model has rational coefficients,
+        which are reduced modulo each prime l not dividing their denominators or
+        the discriminant. Primes below legendre_bound are counted with a
+        vectorized Legendre-symbol sum over F_l; larger primes are handled in
+        batches by baby-step giant-step on the group order, which needs only
+        O(l^(1/4)) group operations per prime and runs on all primes of a
+        batch at once.
+        
+        Args:
+            bound: Largest prime l
+            legendre_bound: Primes below this use the O(l) character sum
+            batch_size: Number of primes per baby-step giant-step batch
+            seed: Random seed for the choice of points
+            
+        Returns:
+            dict: 'primes', 'counts' (#E(F_l)) and 'traces' (a_l = l + 1 - #E(F_l))
+            as NumPy arrays over the good primes
+        """
+        a_4, a_6, delta = self.reduction_coefficients()
+        return tate_model_point_counts(a_4, a_6, delta, bound, legendre_bound, batch_size, seed)
+    
+    def pairing_engine(self, prime):
+        """
+        Pairing engine for the reduction of E_q modulo a good prime.
+        
+        Reduces the short model Y^2 = X^3 + A*X + B (see short_coefficients()),
+        so points of the curve map to the engine coordinate-wise; 48 and 864
+        are units modulo every prime >= 5.
+        
+        Args:
+            prime: Good prime >= 5
+            
+        Returns:
+            PairingEngine: Engine over F_prime
+        """
+        a_4, a_6, delta = self.reduction_coefficients()
+        A = a_4 - Fraction(1, 48)
+        B = a_6 - a_4 / 12 + Fraction(1, 864)
+        return PairingEngine(_reduce_mod(A, prime), _reduce_mod(B, prime), prime)
+    
+    def periods(self):
+        """
+        Period lattice of the curve over C (see periods()).
+        
+        For the Tate model this lattice is 2 pi i (Z + tau Z) with q = exp(2 pi i tau),
+        so q_from_weierstrass(*self.weierstrass_coefficients()) recovers q.
+        
+        Returns:
+            tuple: (omega_1, omega_2)
+        """
+        if self.is_p_adic():
+            raise ValueError("Periods are only defined for real or complex q")
+        a_4, a_6 = self.weierstrass_coefficients()
+        omega_1, omega_2 = periods(a_4, a_6)
+        return complex(omega_1), complex(omega_2)
+    
+    def parametrization_terms(self):
+        """
+        Number of terms d used in the Tate parametrization series.
+        
+        After reducing u into the annulus |q|^(1/2) <= |u| <= |q|^(-1/2) every
+        term is bounded by d^2 |q|^(d/2), so the tail after D terms is at most
+        4 (D+1)^2 r^(D+1) (1+r) / ((1-r)^3 (1-|q|)) with r = |q|^(1/2). In fixed
+        mode 2*precision terms are used (the same order in q as the coefficients).
+        
+        Returns:
+            int: Number of terms
+        """
+        if self.tolerance is None:
+            return 2 * self.precision
+        
+        def compute():
+            q_abs = abs(float(self.q))
+            r = math.sqrt(q_abs)
+            scale = 4 * (1 + r) / ((1 - r)**3 * (1 - q_abs))
+            for terms in range(1, self.max_precision + 1):
+                if scale * (terms + 1)**2 * r**(terms + 1) <= self.tolerance:
+                    return terms
+            raise ValueError(
+                f"Tolerance {self.tolerance} not reachable for |q| = {q_abs} "
+                f"within {self.max_precision} terms"
+            )
+        
+        return self._cached('parametrization_terms', compute)
+    
+    def _parametrization_weights(self):
+        """Weights q^d / (1 - q^d) and s_1 = sum d q^d / (1 - q^d) for the parametrization."""
+        def compute():
+            d = np.arange(1, self.parametrization_terms() + 1)
+            q_d = complex(self.q)**d if isinstance(self.q, complex) else float(self.q)**d
+            weights = q_d / (1 - q_d)
+            return weights, (d * weights).sum()
+        
+        return self._cached('parametrization_weights', compute)
+    
+    def parametrize(self, u):
+        """
+        Evaluate the Tate parametrization G_m/q^Z -> E_q for an array of u.
+        
+        Uses the expansions
+            x(u,q) = u/(1-u)^2 + sum_d d w_d (u^d + u^-d - 2)
+            y(u,q) = u^2/(1-u)^3 + sum_d w_d (d(d-1)/2 u^d - d(d+1)/2 u^-d + d)
+        with w_d = q^d/(1-q^d), so the tables of u^d and u^-d are computed once
+        and shared by x and y. These land on the Tate model
+        y^2 + xy = x^3 + a_4*x + a_6 and are returned on the short model via
+        to_short_model(), so the map is a homomorphism for add_many():
+        parametrize(u1 * u2) is the sum of the images, and scalar multiples can
+        be formed as u^k in G_m.
+        
+        Args:
+            u: Nonzero real or complex scalar or array
+            
+        Returns:
+            tuple: (X, Y) arrays on the short model; u in q^Z maps to the point
+            at infinity (inf, inf)
+            
+        Raises:
+            ValueError: If q is p-adic or u contains 0
+        """
+        return self.to_short_model(*self._tate_parametrize(u))
+    
+    def _tate_parametrize(self, u):
+        """Tate parametrization of u with the image on the Tate model."""
+        if self.is_p_adic():
+            raise ValueError("The parametrization is only implemented for real or complex q")
+        
+        u = np.asarray(u)
+        u = u.astype(complex if np.iscomplexobj(u) or isinstance(self.q, complex) else float)
+        if (u == 0).any():
+            raise ValueError("u must be nonzero")
+        
+        # x and y are q-periodic: move u into |q|^(1/2) <= |u| <= |q|^(-1/2)
+        q = complex(self.q) if np.iscomplexobj(u) else float(self.q)
+        shift = np.rint(np.log(np.abs(u)) / math.log(abs(q)))
+        u = u * np.power(q, -shift)
+        if not np.iscomplexobj(u):
+            u = u.real
+        
+        weights, s_1 = self._parametrization_weights()
+        d = np.arange(1, len(weights) + 1)
+        flat = u.reshape(-1, 1)
+        powers = np.cumprod(np.broadcast_to(flat, (len(flat), len(d))), axis=1)
+        inverse_powers = np.cumprod(np.broadcast_to(1 / flat, (len(flat), len(d))), axis=1)
+        
+        # u = q^k up to the rounding of the shift
+        at_infinity = np.abs(flat[:, 0] - 1) <= 8 * np.finfo(float).eps
+        with np.errstate(divide='ignore', invalid='ignore'):
+            base = flat[:, 0] / (1 - flat[:, 0])**2
+            x = base + (powers + inverse_powers) @ (d * weights) - 2 * s_1
+            y = (base * flat[:, 0] / (1 - flat[:, 0]) + powers @ (d * (d - 1) / 2 * weights)
+                 - inverse_powers @ (d * (d + 1) / 2 * weights) + s_1)
+        x = np.where(at_infinity, np.inf, x)
+        y = np.where(at_infinity, np.inf, y)
+        return x.reshape(u.shape), y.reshape(u.shape)
+    
+    def uniformize(self, x, y, iterations=60):
+        """
+        Inverse of parametrize: u in G_m/q^Z with parametrize(u) = (x, y).
+        
+        For real 0 < q < 1 the real points are R*/q^Z. On the fundamental domain
+        u = +-exp(-s), 0 <= s <= -log(q)/2, the x-coordinate is monotone in s on
+        each sign, so s is found by a vectorized bisection; u -> 1/u negates the
+        point, and the sign of y(u) picks between u and 1/u.
+        
+        Args:
+            x, y: Arrays of points on the short model, as returned by
+                parametrize() (inf for the point at infinity)
+            iterations: Bisection steps
+            
+        Returns:
+            numpy.ndarray: u with q^(1/2) <= |u| <= q^(-1/2)
+            
+        Raises:
+            ValueError: If q is not real with 0 < q < 1
+        """
+        if self.is_p_adic() or isinstance(self.q, complex) or not 0 < float(self.q) < 1:
+            raise ValueError("uniformize needs a real q with 0 < q < 1")
+        
+        with np.errstate(invalid='ignore'):
+            x, y = self.to_tate_model(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        half_period = -math.log(float(self.q)) / 2
+        
+        # Identity component: u > 0, x(exp(-s)) decreases from inf to x(q^(1/2))
+        x_half, _ = self._tate_parametrize(np.array([math.sqrt(float(self.q))]))
+        sign = np.where(~np.isfinite(x) | (x >= x_half[0]), 1.0, -1.0)
+        
+        # Direction of monotonicity per lane (s = 0 is the pole at u = 1 when sign > 0)
+        x_inner, _ = self._tate_parametrize(
+            sign * np.where(sign > 0, np.exp(-half_period / 2**20), 1.0))
+        x_outer, _ = self._tate_parametrize(sign * np.exp(-half_period))
+        decreasing = x_inner > x_outer
+        
+        low = np.zeros(x.shape)
+        high = np.full(x.shape, half_period)
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            x_middle, _ = self._tate_parametrize(sign * np.exp(-middle))
+            go_high = (x_middle > x) == decreasing
+            low = np.where(go_high, middle, low)
+            high = np.where(go_high, high, middle)
+        
+        u = sign * np.exp(-(low + high) / 2)
+        x_u, y_u = self._tate_parametrize(u)
+        # The other preimage 1/u is the negative point (x, -x - y)
+        with np.errstate(invalid='ignore'):
+            flip = np.abs(y_u - y) > np.abs(-x_u - y_u - y)
+        u = np.where(flip, 1 / u, u)
+        return np.where(np.isfinite(x), u, 1.0)
+    
+    def division_polynomial(self, n):
+        """
+        n-th division polynomial of y^2 = x^3 + A*x + B (see division_polynomial).
+        
+        Args:
+            n: Non-negative integer
+            
+        Returns:
+            numpy.ndarray: Read-only coefficients of f_n, highest degree first
+        """
+        A, B = self.short_coefficients()
+        return division_polynomial(A, B, n)
+    
+    def torsion_points(self, n, newton_steps=3):
+        """
+        Points P != O with n*P = O.
+        
+        The x-coordinates are the roots of f_n (together with the roots of
+        x^3 + A*x + B for even n). Over R they come from np.roots polished by
+        Newton steps; over Q_p the roots in Z_p are found digit by digit. Points
+        with x outside Z_p lie in the formal group, which is torsion-free for
+        odd p, so nothing is lost there.
+        
+        Args:
+            n: Positive integer
+            newton_steps: Newton iterations used to polish real roots
+            
+        Returns:
+            list: Points (x, y), sorted by x for real curves
+        """
+        if n < 1:
+            raise ValueError(f"n must be positive, got {n}")
+        A, B = self.short_coefficients()
+        
+        if self.is_p_adic():
+            return self._p_adic_torsion_points(n)
+        
+        candidates = []
+        f = self.division_polynomial(n)
+        if len(f) > 1:
+            roots = np.roots(f)
+            scale = max(1.0, np.abs(roots).max())
+            x = roots[np.abs(roots.imag) <= 1e-6 * scale].real
+            derivative = np.polyder(f)
+            for _ in range(newton_steps):
+                step = np.polyval(f, x) / np.polyval(derivative, x)
+                x = np.where(np.isfinite(step), x - step, x)
+            candidates.extend(x.tolist())
+        if n % 2 == 0:
+            candidates.extend(self.real_roots().tolist())
+        
+        points = []
+        for x in sorted(set(candidates)):
+            rhs = x**3 + A * x + B
+            tolerance = 1e-9 * max(1.0, abs(x))**3
+            if rhs < -tolerance:
+                continue
+            if rhs <= tolerance:
+                points.append((x, 0.0))
+            else:
+                y = float(np.sqrt(rhs))
+                points.extend([(x, -y), (x, y)])
+        return points
+    
+    def _p_adic_torsion_points(self, n):
+        """
+        Torsion points over Q_p from the Z_p-roots of f_n (and of y for even n).
+        
+        The roots are searched in the Tate coordinate x = X - 1/12, where the
+        torsion x-coordinates are integral except for the point u = -1 when
+        p = 2 (x = -1/4 + O(q)); for p = 2 the search therefore runs on 4x.
+        The roots are mapped back to X.
+        """
+        A, B = self.short_coefficients()
+        p = self.p
+        precision = self.q.precision
+        shift = PAdic(p, Fraction(1, 12), precision)
+        scale = 4 if p == 2 else 1
+        polynomials = [self.division_polynomial(n)] if n > 2 else []
+        if n % 2 == 0:
+            polynomials.append([PAdic(p, 1, precision), 0, A, B])
+        
+        points = []
+        seen = set()
+        for f in polynomials:
+            f = [c if isinstance(c, PAdic) else PAdic(p, c, precision) for c in f]
+            f = _taylor_shift(f, shift)
+            f = [c / scale**(len(f) - 1 - i) for i, c in enumerate(f)]
+            nonzero = [c for c in f if not c.is_zero()]
+            if len(nonzero) < 2:
+                continue
+            valuation = min(c.valuation() for c in nonzero)
+            known = min(c.absolute_precision() for c in f) - valuation
+            integers = [0 if c.is_zero() else c.unit * p**(c.valuation() - valuation) for c in f]
+            
+            for root, digits in _p_adic_integral_roots(integers, p, known):
+                if root % p**digits == 0:
+                    x = PAdic.from_parts(p, digits, 0, 0)
+                else:
+                    v, unit = _split_p_power(root, p)
+                    x = PAdic.from_parts(p, v, unit, digits - v)
+                if (x.valuation_, x.unit) in seen:
+                    continue
+                seen.add((x.valuation_, x.unit))
+                X = x / scale + shift
+                try:
+                    Y = (X * X * X + A * X + B).sqrt()
+                except ValueError:
+                    continue
+                points.extend([(X, Y)] if Y.is_zero() else [(X, Y), (X, -Y)])
+        return points
+    
+    def isogeny(self, kernel, order=None):
+        """
+        Vélu isogeny with the given kernel (cached per kernel).
+        
+        Args:
+            kernel: List of kernel points, or a single generator point (x, y)
+            order: Order of the generator (found by repeated addition if omitted)
+            
+        Returns:
+            VeluIsogeny: Isogeny with .codomain = (A', B') and batch evaluation
+        """
+        if len(kernel) == 2 and not isinstance(kernel[0], (tuple, list)):
+            kernel = self._multiples(kernel, order)
+        
+        key = ('isogeny',) + tuple(_coefficient_key(c) for Q in kernel for c in Q)
+        A, B = self.short_coefficients()
+        return self._cached(key, lambda: VeluIsogeny(A, B, kernel))
+    
+    def _multiples(self, P, order=None, max_order=10000):
+        """Multiples P, 2P, ... up to (order - 1) P, or until -P is reached."""
+        multiples = [P]
+        R = P
+        while len(multiples) < (order - 1 if order else max_order):
+            if order is None and _coordinates_equal(R[0], P[0]) and len(multiples) > 1:
+                break
+            R = self.point_addition(R, P)
+            if _is_infinity(R):
+                break
+            multiples.append(R)
+        else:
+            if order is None:
+                raise ValueError(f"No multiple of {P} up to {max_order} P is O")
+        return multiples
+    
+    def compute_points(self, x_range=(-2, 2), num_points=100):
+        """
+        Compute points on the elliptic curve for visualization.
+        
+        Compatibility wrapper around the vectorized sampler: x is sampled
+        uniformly and each x with y != 0 contributes (x, y) and (x, -y).
+        
+        Args:
+            x_range: Range of x values to sample
+            num_points: Number of points to compute
+            
+        Returns:
+            list: List of (x, y) points on the curve
+        """
+        x, y = self.sample_points(x_range, num_points, adaptive=False)
+        return list(zip(x, y))
+    
+    def real_roots(self):
+        """
+        Real roots of x^3 + A*x + B (the x-coordinates of the real 2-torsion).
+        
+        Returns:
+            numpy.ndarray: Sorted real roots
+        """
+        def compute():
+            A, B = self.short_coefficients()
+            roots = np.roots([1.0, 0.0, A, B])
+            scale = max(1.0, np.abs(roots).max())
+            return np.sort(roots[np.abs(roots.imag) <= 1e-9 * scale].real)
+        
+        return self._cached('real_roots', compute)
+    
+    def sample_points(self, x_range=(-2, 2), num_points=100, adaptive=True):
+        """
+        Vectorized sampling of the real points of the curve.
+        
+        In adaptive mode the x-range is split at the real roots of
+        x^3 + A*x + B and each piece where the right-hand side is
+        non-negative gets samples with cosine spacing towards its root
+        endpoints. Near a root y ~ sqrt(x - r), so this spacing makes the
+        y-steps roughly uniform and resolves the vertical tangents at the
+        branch endpoints. The roots themselves are included (budget allowing)
+        with y exactly 0.
+        
+        Args:
+            x_range: Range of x values to sample
+            num_points: Number of x samples (0 gives empty arrays)
+            adaptive: Cluster samples near the real roots (default: True)
+            
+        Returns:
+            tuple: (x, y) arrays. Uniform mode lists (x, y), (x, -y) per x as
+            compute_points() does; adaptive mode lists each real component as a
+            path (upper branch left to right, lower branch back).
+            
+        Raises:
+            ValueError: If num_points is negative
+        """
+        if num_points < 0:
+            raise ValueError(f"num_points must be non-negative, got {num_points}")
+        A, B = self.short_coefficients()
+        lo, hi = x_range
+        
+        if not adaptive:
+            x = np.linspace(lo, hi, num_points)
+            rhs = x**3 + A * x + B
+            keep = rhs >= 0
+            x = x[keep]
+            y = np.sqrt(rhs[keep])
+            
+            # Interleave (x, y), (x, -y), dropping the mirror image of y = 0
+            xs = np.repeat(x, 2)
+            ys = np.column_stack((y, -y)).ravel()
+            mirror = np.zeros(len(xs), dtype=bool)
+            mirror[1::2] = y == 0
+            return xs[~mirror], ys[~mirror]
+        
+        roots = self.real_roots()
+        breaks = np.unique(np.concatenate(([lo, hi], roots[(roots > lo) & (roots < hi)])))
+        left, right = breaks[:-1], breaks[1:]
+        middle = (left + right) / 2
+        positive = middle**3 + A * middle + B >= 0
+        left, right = left[positive], right[positive]
+        if len(left) == 0 or num_points == 0:
+            return np.empty(0), np.empty(0)
+        
+        # Share the sample budget between the pieces in proportion to length,
+        # rounding so the counts add up to exactly num_points
+        share = num_points * (right - left) / (right - left).sum()
+        counts = np.floor(share).astype(int)
+        counts[np.argsort(counts - share)[:num_points - counts.sum()]] += 1
+        
+        xs, ys = [], []
+        for a, b, n in zip(left, right, counts):
+            if n == 0:
+                continue
+            # Cluster only at ends that are roots (vertical tangents)
+            at_root = np.isin([a, b], roots)
+            if n == 1:
+                t = np.array([0.0 if at_root[0] else 1.0 if at_root[1] else 0.5])
+            else:
+                t = np.linspace(0, 1, n)
+                if at_root.all():
+                    t = (1 - np.cos(np.pi * t)) / 2
+                elif at_root[0]:
+                    t = 1 - np.cos(np.pi * t / 2)
+                elif at_root[1]:
+                    t = np.sin(np.pi * t / 2)
+            x = np.where(t == 1, b, a + (b - a) * t)
+            y = np.sqrt(np.maximum(x**3 + A * x + B, 0))
+            # The cubic evaluated at a root is rounding noise, not 0
+            y[np.isin(x, roots)] = 0
+            xs.append(np.concatenate((x, x[::-1])))
+            ys.append(np.concatenate((y, -y[::-1])))
+        
+        return np.concatenate(xs), np.concatenate(ys)
+    
+    def _draw_curve(self, ax, x_range, y_range, resolution, num_points=0):
+        """
+        Draw the real points as the zero contour of y^2 - x^3 - A*x - B.
+        
+        Args:
+            ax: Matplotlib axes
+            x_range: Range of x values
+            y_range: Range of y values (None: fit the curve over x_range)
+            resolution: Grid points per axis
+            num_points: Sampled points (see sample_points()) to mark on the
+                contour; 0 draws the contour only
+            
+        Raises:
+            ValueError: If q is p-adic (the curve has no real points to draw)
+        """
+        if self.is_p_adic():
+            raise ValueError("Cannot draw the real points of a curve over Q_p")
+        A, B = self.short_coefficients()
+        if self.is_exact():
+            A, B = float(A), float(B)
+        x = np.linspace(*x_range, resolution)
+        if y_range is None:
+            y_range = _fitted_y_range(x**3 + A * x + B)
+        y = np.linspace(*y_range, resolution)
+        field = y[:, None]**2 - (x**3 + A * x + B)[None, :]
+        ax.contour(x, y, field, levels=[0], colors='C0', linewidths=1)
+        if num_points:
+            ax.scatter(*self.sample_points(x_range, num_points), s=4, color='C1', zorder=3)
+        ax.set_xlim(x_range)
+        ax.set_ylim(y_range)
+        ax.grid(True, alpha=0.3)
+    
+    def render_curve(self, save_path, x_range=(-2, 2), y_range=None, resolution=400,
+                     dpi=100, num_points=0):
+        """
+        Render the curve to a file without a display.
+        
+        Draws on a module-level Agg figure (no pyplot state) that is cleared
+        and reused by every call, so repeated renders in batch jobs do not
+        build a new figure each time.
+        
+        Args:
+            save_path: Output image path
+            x_range: Range of x values
+            y_range: Range of y values (None: fit the curve over x_range)
+            resolution: Grid points per axis
+            dpi: Output resolution
+            num_points: Sampled points to mark on the curve (0: none)
+        """
+        figure, axes = _agg_figure((1, 1), (10, 8))
+        ax = axes[0, 0]
+        self._draw_curve(ax, x_range, y_range, resolution, num_points)
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        ax.set_title(f'Tate Curve E_q with q = {_format_number(self.q)}, p = {self.p}')
+        figure.savefig(save_path, dpi=dpi)
+    
+    def plot_curve(self, x_range=(-2, 2), num_points=100, save_path=None, dpi=300,
+                   resolution=400):
+        """
+        Plot the Tate curve.
+        
+        Never opens a window or blocks. With save_path the image is rendered
+        headlessly (see render_curve()); otherwise a new Agg figure is drawn
+        and returned for the caller to save or display (e.g. inline in a
+        notebook).
+        
+        Args:
+            x_range: Range of x values to plot
+            num_points: Number of sampled points marked on the curve, as before
+                (see sample_points())
+            save_path: Path to save the plot (optional)
+            dpi: Resolution of the saved image
+            resolution: Grid points per axis of the contour
+            
+        Returns:
+            matplotlib.figure.Figure or None: The figure when save_path is not
+            given
+        """
+        if save_path:
+            self.render_curve(save_path, x_range, resolution=resolution, dpi=dpi,
+                              num_points=num_points)
+            print(f"Plot saved to: {save_path}")
+            return None
+        
+        figure = Figure(figsize=(10, 8), layout='constrained')
+        FigureCanvasAgg(figure)
+        ax = figure.subplots()
+        self._draw_curve(ax, x_range, None, resolution, num_points)
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        ax.set_title(f'Tate Curve E_q with q = {_format_number(self.q)}, p = {self.p}')
+        return figure
+    
+    def __str__(self):
+        """String representation of the Tate curve."""
+        a_4, a_6 = self.weierstrass_coefficients()
+        return (f"Tate Curve E_q: y^2 + xy = x^3 + {_format_number(a_4)}*x + {_format_number(a_6)} "
+                f"(q = {_format_number(self.q)}, p = {self.p})")
+
+
+class TateCurveFamily:
+    """
+    A family of Tate curves E_q over one prime p, evaluated in bulk.
+    
+    All q values share the same coefficient tables, so a_4, a_6, the
+    discriminant and the j-invariant for the whole family come from one
+    vectorized Horner pass. Entries with |q| >= 1 are masked out (their
+    outputs are NaN) instead of raising.
+    """
+    
+    def __init__(self, p=5, q_values=None, precision=10, tolerance=None,
+                 max_precision=10000):
+        """
+        Initialize a family of Tate curves.
+        
+        Args:
+            p: Prime number (default: 5)
+            q_values: Array-like of parameters q (default: [p^(-3)])
+            precision: Series truncation precision
+            tolerance: If given, pick the number of terms per curve adaptively
+                (see TateCurve)
+            max_precision: Largest number of terms adaptive mode may use
+        """
+        # Memoized family data; cleared by every parameter setter below
+        self._cache = {}
+        
+        self.p = p
+        self.precision = precision
+        self.tolerance = tolerance
+        self.max_precision = max_precision
+        
+        if q_values is None:
+            q_values = [p**(-3)]
+        self.q_values = q_values
+    
+    @property
+    def q_values(self):
+        """Array of Tate parameters q."""
+        return self._q_values
+    
+    @q_values.setter
+    def q_values(self, values):
+        values = np.asarray(values)
+        if not np.iscomplexobj(values):
+            values = values.astype(float)
+        self._q_values = values
+        # Same check as TateCurve: |q|_p < 1
+        self.valid = np.abs(values) < 1
+        self.clear_cache()
+    
+    @property
+    def p(self):
+        """Prime p."""
+        return self._p
+    
+    @p.setter
+    def p(self, value):
+        self._p = value
+        self.clear_cache()
+    
+    @property
+    def precision(self):
+        """Series truncation precision."""
+        return self._precision
+    
+    @precision.setter
+    def precision(self, value):
+        self._precision = value
+        self.clear_cache()
+    
+    @property
+    def tolerance(self):
+        """Target truncation error for adaptive precision (None for fixed precision)."""
+        return self._tolerance
+    
+    @tolerance.setter
+    def tolerance(self, value):
+        self._tolerance = value
+        self.clear_cache()
+    
+    @property
+    def max_precision(self):
+        """Largest number of series terms adaptive mode may use."""
+        return self._max_precision
+    
+    @max_precision.setter
+    def max_precision(self, value):
+        self._max_precision = value
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """
+        Drop all memoized family data. Called whenever q_values, p, precision
+        or the adaptive-precision settings change.
+        """
+        self._cache.clear()
+    
+    @classmethod
+    def from_j(cls, j_values, p=5, precision=10, **kwargs):
+        """
+        Build the family of Tate curves with the given real or complex j-invariants.
+        
+        Args:
+            j_values: Array-like of j-invariants (see q_from_j)
+            p: Prime number
+            precision: Series truncation precision
+            **kwargs: Further TateCurveFamily arguments
+            
+        Returns:
+            TateCurveFamily: Family whose j_invariant() reproduces j_values
+        """
+        return cls(p=p, q_values=q_from_j(np.asarray(j_values).ravel()),
+                   precision=precision, **kwargs)
+    
+    def __len__(self):
+        return len(self.q_values)
+    
+    def curve(self, index):
+        """
+        Build the TateCurve for one member of the family.
+        
+        Args:
+            index: Position in q_values
+            
+        Returns:
+            TateCurve: The corresponding curve
+        """
+        return TateCurve(p=self.p, q=self.q_values[index], precision=self.precision,
+                         tolerance=self.tolerance, max_precision=self.max_precision)
+    
+    def series_terms(self):
+        """
+        Number of q-series terms used for each curve.
+        
+        Returns:
+            numpy.ndarray: Terms per curve (-1 where the tolerance is unreachable
+            or |q| >= 1)
+        """
+        if 'series_terms' not in self._cache:
+            if self.tolerance is None:
+                terms = np.full(len(self), self.precision)
+            else:
+                terms = terms_for_tolerance(np.abs(self.q_values), self.tolerance,
+                                            self.max_precision)
+            self._cache['series_terms'] = np.where(self.valid, terms, -1)
+        return self._cache['series_terms']
+    
+    def truncation_error(self):
+        """
+        Certified truncation error bounds for every curve.
+        
+        Returns:
+            tuple: (bounds for a_4, bounds for a_6) arrays
+        """
+        terms = self.series_terms()
+        bound_4, bound_6 = truncation_error_bound(np.abs(self.q_values),
+                                                  np.maximum(terms, 1))
+        missing = terms < 0
+        return np.where(missing, np.inf, bound_4), np.where(missing, np.inf, bound_6)
+    
+    def weierstrass_coefficients(self):
+        """
+        Compute a_4(q) and a_6(q) for every q in the family.
+        
+        In adaptive mode each curve only pays for the terms it needs (see
+        _horner_ragged()).
+        
+        Returns:
+            tuple: (a_4, a_6) arrays, NaN where |q| >= 1 (or the tolerance
+            cannot be met)
+        """
+        if 'weierstrass' not in self._cache:
+            terms = self.series_terms()
+            dtype = np.result_type(self.q_values, float)
+            a_4 = np.full(len(self), np.nan, dtype=dtype)
+            a_6 = np.full(len(self), np.nan, dtype=dtype)
+            members = terms >= 0
+            if members.any():
+                a_4_coeffs, a_6_coeffs = _series_prefix(int(terms[members].max()))
+                q = self.q_values[members]
+                a_4[members] = _horner_ragged(a_4_coeffs, q, terms[members])
+                a_6[members] = _horner_ragged(a_6_coeffs, q, terms[members])
+            self._cache['weierstrass'] = (a_4, a_6)
+        return self._cache['weierstrass']
+    
+    def c_invariants(self):
+        """
+        Compute c_4 and c_6 of the Tate models for every q in the family.
+        
+        Returns:
+            tuple: (c_4, c_6) arrays
+        """
+        a_4, a_6 = self.weierstrass_coefficients()
+        return 1 - 48 * a_4, -1 + 72 * a_4 - 864 * a_6
+    
+    def short_coefficients(self):
+        """
+        Compute (A, B) of the short models Y^2 = X^3 + A*X + B for every q.
+        
+        Returns:
+            tuple: (A, B) arrays, A = -c_4/48 and B = -c_6/864
+        """
+        c_4, c_6 = self.c_invariants()
+        return -c_4 / 48, -c_6 / 864
+    
+    def discriminant(self):
+        """
+        Compute the discriminants Delta(q) for every q in the family.
+        
+        Returns:
+            numpy.ndarray: Discriminants, NaN where |q| >= 1
+        """
+        c_4, c_6 = self.c_invariants()
+        return (c_4**3 - c_6**2) / 1728
+    
+    def j_invariant(self):
+        """
+        Compute the j-invariants j(q) for every q in the family.
+        
+        Returns:
+            numpy.ndarray: j-invariants (inf at q = 0, NaN where |q| >= 1)
+        """
+        c_4, _ = self.c_invariants()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return c_4**3 / self.discriminant()
+    
+    def render_grid(self, save_path, columns=None, x_range=(-2, 2), resolution=200,
+                    dpi=100, panel_size=2.5):
+        """
+        Render every curve of the family into one image grid, headlessly.
+        
+        The x-grid and x^3 are computed once and shared by all panels; each
+        curve adds A*x + B of its short model, fits its own y-range and draws
+        the zero contour of y^2 minus that. The Agg figure for a given grid
+        shape is reused across calls.
+        
+        Args:
+            save_path: Output image path
+            columns: Panels per row (default: about sqrt(len(self)))
+            x_range: Range of x values (shared by all panels)
+            resolution: Grid points per axis
+            dpi: Output resolution
+            panel_size: Panel width and height in inches
+        """
+        if np.iscomplexobj(self.q_values):
+            raise ValueError("Only real q values can be plotted")
+        if columns is None:
+            columns = max(1, math.ceil(math.sqrt(len(self))))
+        rows = max(1, math.ceil(len(self) / columns))
+        figure, axes = _agg_figure((rows, columns), (panel_size * columns, panel_size * rows))
+        
+        A, B = self.short_coefficients()
+        x = np.linspace(*x_range, resolution)
+        cubic = x**3
+        for index, ax in enumerate(axes.flat):
+            if index >= len(self) or not self.valid[index]:
+                ax.set_axis_off()
+                continue
+            rhs = cubic + A[index] * x + B[index]
+            y_range = _fitted_y_range(rhs)
+            y = np.linspace(*y_range, resolution)
+            ax.contour(x, y, y[:, None]**2 - rhs[None, :], levels=[0], colors='C0',
+                       linewidths=1)
+            ax.set_xlim(x_range)
+            ax.set_ylim(y_range)
+            ax.set_title(f'q = {self.q_values[index]:.4g}', fontsize=8)
+            ax.tick_params(labelsize=6)
+        figure.savefig(save_path, dpi=dpi)
+
+
+class PairingEngine:
+    """
+    Tate and Weil pairings on y^2 = x^3 + a*x + b over F_prime.
+    
+    Miller's algorithm runs on projective points with projective line
+    functions: each step contributes the numerator and denominator of
+    l(Q)/v(Q) separately, so the whole loop is inversion-free and only the
+    final quotient is inverted. All point-side quantities are computed once
+    and broadcast, so evaluating one Miller function at many second arguments
+    costs one loop plus a few multiplications per argument. Every field
+    operation is tallied in operation_counts.
+    """
+    
+    def __init__(self, a, b, prime):
+        """
+        Initialize the engine.
+        
+        Args:
+            a, b: Curve coefficients (reduced modulo prime)
+            prime: Prime p >= 5 of the base field
+        """
+        if prime < 5 or not isprime(prime):
+            raise ValueError(f"prime must be a prime >= 5, got {prime}")
+        self.prime = prime
+        self.a = a % prime
+        self.b = b % prime
+        if (4 * self.a**3 + 27 * self.b**2) % prime == 0:
+            raise ValueError(f"y^2 = x^3 + {self.a}x + {self.b} is singular mod {prime}")
+        self.dtype = np.int64 if prime**2 < (1 << 63) else object
+        self._order = None
+        self.reset_counts()
+    
+    def reset_counts(self):
+        """Reset the field operation counters."""
+        self.operation_counts = {'mul': 0, 'sqr': 0, 'add': 0, 'inv': 0}
+    
+    def _array(self, values):
+        """Field elements as an array of self.dtype."""
+        if self.dtype is object:
+            return np.array([int(v) % self.prime for v in np.ravel(values)],
+                            dtype=object).reshape(np.shape(values))
+        return np.asarray(values, dtype=np.int64) % self.prime
+    
+    def _mul(self, x, y):
+        result = x * y % self.prime
+        self.operation_counts['mul'] += np.size(result)
+        return result
+    
+    def _sqr(self, x):
+        result = x * x % self.prime
+        self.operation_counts['sqr'] += np.size(result)
+        return result
+    
+    def _add(self, x, y):
+        result = (x + y) % self.prime
+        self.operation_counts['add'] += np.size(result)
+        return result
+    
+    def _sub(self, x, y):
+        result = (x - y) % self.prime
+        self.operation_counts['add'] += np.size(result)
+        return result
+    
+    def _inverse(self, values):
+        """Batch inverse (one inversion and about 3N multiplications)."""
+        values = np.atleast_1d(values)
+        self.operation_counts['inv'] += 1
+        self.operation_counts['mul'] += 3 * (values.size - 1)
+        return batch_inverse(values.ravel(), self.prime).reshape(values.shape)
+    
+    def _power(self, x, exponent):
+        """x^exponent by square-and-multiply."""
+        result = np.ones_like(x)
+        for bit in bin(exponent)[2:]:
+            result = self._sqr(result)
+            if bit == '1':
+                result = self._mul(result, x)
+        return result
+    
+    def order(self):
+        """
+        Number of points #E(F_prime).
+        
+        Returns:
+            int: Group order
+        """
+        if self._order is None:
+            p = self.prime
+            if p < 1000:
+                trace = _trace_legendre(self.a, self.b, p)
+            else:
+                trace = int(_trace_bsgs(np.array([self.a]), np.array([self.b]),
+                                        np.array([p]), np.random.default_rng(0))[0])
+            self._order = p + 1 - trace
+        return self._order
+    
+    def is_on_curve(self, x, y):
+        """
+        Check y^2 = x^3 + a*x + b.
+        
+        Returns:
+            numpy.ndarray: Boolean mask
+        """
+        x, y = self._array(x), self._array(y)
+        return (y * y - (x * x % self.prime * x + self.a * x + self.b)) % self.prime == 0
+    
+    def torsion_points(self, ell, count=1, seed=0):
+        """
+        Random points of exact order ell in E(F_prime).
+        
+        Args:
+            ell: Odd prime dividing #E(F_prime)
+            count: Number of points
+            seed: Random seed
+            
+        Returns:
+            tuple: (x, y) arrays of length count
+        """
+        N = self.order()
+        if ell < 3 or N % ell:
+            raise ValueError(f"ell = {ell} must be an odd prime dividing #E = {N}")
+        
+        p = self.prime
+        rng = np.random.default_rng(seed)
+        xs, ys = [], []
+        while len(xs) < count:
+            x = int(rng.integers(0, p))
+            y = _sqrt_mod_prime((x**3 + self.a * x + self.b) % p, p)
+            if y is None:
+                continue
+            # Clear the part of N prime to ell, then multiply by ell while the
+            # result stays nonzero: what is left has order exactly ell
+            cofactor = N
+            while cofactor % ell == 0:
+                cofactor //= ell
+            a, modulus = np.array([self.a]), np.array([p])
+            Q = _projective_multiply_mod((np.array([x]), np.array([y]), np.array([1])),
+                                         cofactor, a, modulus)
+            if Q[2][0] == 0:
+                continue
+            while True:
+                multiple = _projective_multiply_mod(Q, ell, a, modulus)
+                if multiple[2][0] == 0:
+                    break
+                Q = multiple
+            X, Y, Z = (int(c[0]) for c in Q)
+            inverse = pow(Z, -1, p)
+            xs.append(X * inverse % p)
+            ys.append(Y * inverse % p)
+        return self._array(xs), self._array(ys)
+    
+    def miller(self, P, x, y, ell):
+        """
+        Miller function f_{ell,P} evaluated at the points (x, y).
+        
+        f_{ell,P} is normalized (every line and vertical is monic), with divisor
+        ell(P) - ell(O) when ell P = O. P may be a single point, broadcast
+        against many (x, y), or arrays matching them.
+        
+        Args:
+            P: Affine point (x_P, y_P), scalars or arrays
+            x, y: Arrays of evaluation points
+            ell: Loop length (the order of P)
+            
+        Returns:
+            tuple: (numerator, denominator) arrays with f = numerator/denominator
+        """
+        x_P, y_P = self._array(P[0]), self._array(P[1])
+        x, y = self._array(x), self._array(y)
+        one = np.ones_like(x_P)
+        X, Y, Z = x_P, y_P, one
+        numerator = np.ones(np.broadcast(x_P, x).shape, dtype=self.dtype)
+        denominator = numerator.copy()
+        
+        for bit in bin(ell)[3:]:
+            # Tangent at T: l = L/(2YZ^2) with L = 2YZ^2 y - wZ x + (wX - 2Y^2 Z)
+            XX = self._sqr(X)
+            w = self._add(self._mul(self.a, self._sqr(Z)), self._add(XX, self._add(XX, XX)))
+            s = self._add(self._mul(Y, Z), self._mul(Y, Z))
+            ss = self._sqr(s)
+            R = self._mul(Y, s)
+            RR = self._sqr(R)
+            B = self._sub(self._sub(self._sqr(self._add(X, R)), XX), RR)
+            h = self._sub(self._sqr(w), self._add(B, B))
+            X3 = self._mul(h, s)
+            Y3 = self._sub(self._mul(w, self._sub(B, h)), self._add(RR, RR))
+            Z3 = self._mul(s, ss)
+            
+            scale = self._mul(s, Z)
+            wZ = self._mul(w, Z)
+            constant = self._sub(self._mul(w, X), R)
+            line = self._add(self._sub(self._mul(scale, y), self._mul(wZ, x)), constant)
+            vertical = self._sub(self._mul(x, Z3), X3)
+            numerator = self._mul(self._mul(self._sqr(numerator), line), Z3)
+            denominator = self._mul(self._mul(self._sqr(denominator), scale), vertical)
+            X, Y, Z = X3, Y3, Z3
+            
+            if bit == '1':
+                # Chord through T and P: l = (dx (y - y_P) - dy (x - x_P)) / dx
+                dx = self._sub(X, self._mul(x_P, Z))
+                dy = self._sub(Y, self._mul(y_P, Z))
+                final = dx == 0
+                dd = self._sqr(dx)
+                ddd = self._mul(dx, dd)
+                R = self._mul(dd, X)
+                A = self._sub(self._add(self._mul(self._sqr(dy), Z), ddd), self._add(R, R))
+                X3 = self._mul(dx, A)
+                Y3 = self._sub(self._mul(dy, self._sub(R, A)), self._mul(ddd, Y))
+                Z3 = self._mul(ddd, Z)
+                
+                line = self._sub(self._mul(dx, self._sub(y, y_P)), self._mul(dy, self._sub(x, x_P)))
+                vertical = self._sub(self._mul(x, Z3), X3)
+                # T = -P: the chord is the vertical x - x_P and T + P = O
+                line = np.where(final, self._sub(x, x_P), self._mul(line, Z3))
+                vertical = np.where(final, 1, self._mul(dx, vertical))
+                numerator = self._mul(numerator, line)
+                denominator = self._mul(denominator, vertical)
+                X, Y, Z = (np.where(final, 0, X3), np.where(final, 1, Y3),
+                           np.where(final, 0, Z3))
+        
+        if ((numerator == 0) | (denominator == 0)).any():
+            raise ValueError("An evaluation point lies in the support of the Miller function")
+        return numerator, denominator
+    
+    def tate_pairing_many(self, P, x, y, ell):
+        """
+        Reduced Tate pairings e(P, Q) = f_{ell,P}(Q)^((prime - 1)/ell) for many Q.
+        
+        The Miller loop for P runs once and is evaluated at all Q together.
+        Requires ell | prime - 1 (embedding degree 1) and Q not in <P>.
+        
+        Args:
+            P: Point (x_P, y_P) of order ell
+            x, y: Arrays of points Q
+            ell: Prime order of P
+            
+        Returns:
+            numpy.ndarray: ell-th roots of unity in F_prime
+        """
+        if (self.prime - 1) % ell:
+            raise ValueError(f"ell = {ell} does not divide prime - 1 = {self.prime - 1}")
+        numerator, denominator = self.miller(P, x, y, ell)
+        value = self._mul(numerator, self._inverse(denominator))
+        return self._power(value, (self.prime - 1) // ell)
+    
+    def tate_pairing(self, P, Q, ell):
+        """
+        Reduced Tate pairing of two points.
+        
+        Returns:
+            int: e(P, Q)
+        """
+        return int(self.tate_pairing_many(P, [Q[0]], [Q[1]], ell)[0])
+    
+    def weil_pairing_many(self, P, x, y, ell):
+        """
+        Weil pairings e(P, Q) = (-1)^ell f_{ell,P}(Q) / f_{ell,Q}(P) for many Q.
+        
+        f_{ell,P} is one Miller loop evaluated at all Q; the loops for the
+        f_{ell,Q} run side by side as array lanes.
+        
+        Args:
+            P: Point (x_P, y_P) of order ell
+            x, y: Arrays of ell-torsion points Q not in <P>
+            ell: Prime order of P
+            
+        Returns:
+            numpy.ndarray: ell-th roots of unity in F_prime
+        """
+        numerator_P, denominator_P = self.miller(P, x, y, ell)
+        numerator_Q, denominator_Q = self.miller((x, y), P[0], P[1], ell)
+        value = self._mul(self._mul(numerator_P, denominator_Q),
+                          self._inverse(self._mul(denominator_P, numerator_Q)))
+        return value if ell % 2 == 0 else (-value) % self.prime
+    
+    def weil_pairing(self, P, Q, ell):
+        """
+        Weil pairing of two points.
+        
+        Returns:
+            int: e(P, Q)
+        """
+        return int(self.weil_pairing_many(P, [Q[0]], [Q[1]], ell)[0])
+
+
+class VeluIsogeny:
+    """
+    Separable isogeny E -> E/G from a finite kernel G by Vélu's formulas.
+    
+    For y^2 = x^3 + a*x + b, with S holding the 2-torsion of G and one point
+    of each pair {Q, -Q} of the rest, put g_Q = 3x_Q^2 + a, u_Q = 4y_Q^2 and
+    v_Q = g_Q (2-torsion) or 2g_Q. Then E/G is y^2 = x^3 + (a - 5v)x + (b - 7w)
+    with v = sum v_Q, w = sum (u_Q + x_Q v_Q), and
+        X = x + sum_Q [v_Q/(x - x_Q) + u_Q/(x - x_Q)^2]
+        Y = y - sum_Q [2u_Q y/(x - x_Q)^3 + v_Q (y - y_Q)/(x - x_Q)^2 + 2g_Q y_Q/(x - x_Q)^2]
+    The per-kernel-point quantities are computed once when the isogeny is
+    built, so evaluating it costs O(#S) per point, vectorized over batches.
+    Works for real curves (floats) and p-adic ones (PAdic coordinates).
+    """
+    
+    def __init__(self, a_4, a_6, kernel):
+        """
+        Build the isogeny.
+        
+        Args:
+            a_4, a_6: Domain curve y^2 = x^3 + a_4*x + a_6
+            kernel: Non-zero points (x, y) of the kernel; both or either of
+                Q and -Q may be given
+        """
+        self.domain = (a_4, a_6)
+        
+        two_torsion, pairs = [], []
+        for Q in kernel:
+            if _is_infinity(Q):
+                continue
+            if any(_coordinates_equal(Q[0], R[0]) for R in two_torsion + pairs):
+                continue
+            (two_torsion if _coordinates_equal(Q[1], 0) else pairs).append(Q)
+        self.degree = 1 + len(two_torsion) + 2 * len(pairs)
+        
+        points = two_torsion + pairs
+        generic = any(isinstance(c, PAdic) for Q in points for c in Q)
+        dtype = object if generic else float
+        self._x = np.array([Q[0] for Q in points], dtype=dtype)
+        self._y = np.array([Q[1] for Q in points], dtype=dtype)
+        self._g = 3 * self._x * self._x + a_4
+        self._u = 4 * self._y * self._y
+        self._v = self._g * np.array([1] * len(two_torsion) + [2] * len(pairs), dtype=dtype)
+        self._gy = 2 * self._g * self._y
+        
+        v = self._v.sum() if len(points) else 0
+        w = (self._u + self._x * self._v).sum() if len(points) else 0
+        self.codomain = (a_4 - 5 * v, a_6 - 7 * w)
+        if not generic:
+            self.codomain = tuple(float(c) for c in self.codomain)
+    
+    def __call__(self, x, y):
+        """
+        Evaluate the isogeny on a batch of points.
+        
+        Args:
+            x, y: Arrays (or scalars) of coordinates on the domain
+            
+        Returns:
+            tuple: (X, Y) arrays on the codomain; kernel points map to (inf, inf)
+            (for floats: points whose x is within 1e-10 relative of a kernel x)
+        """
+        dtype = object if self._x.dtype == object else float
+        x = np.asarray(x, dtype=dtype)
+        y = np.asarray(y, dtype=dtype)
+        shape = x.shape
+        x, y = x.reshape(-1, 1), y.reshape(-1, 1)
+        
+        difference = x - self._x
+        if dtype is object:
+            in_kernel = np.array([[c == 0 for c in row] for row in difference], dtype=bool)
+        else:
+            # Same tolerance as the float group law; kernel x's carry rounding error
+            in_kernel = np.abs(difference) < 1e-10 * np.maximum(1, np.abs(self._x))
+        hit = in_kernel.any(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse = 1 / np.where(in_kernel, 1, difference)
+            inverse_2 = inverse * inverse
+            X = x[:, 0] + (self._v * inverse + self._u * inverse_2).sum(axis=1)
+            Y = y[:, 0] - (2 * self._u * y * inverse_2 * inverse
+                           + (self._v * (y - self._y) + self._gy) * inverse_2).sum(axis=1)
+        
+        if dtype is object:
+            X = np.array([float('inf') if h else c for h, c in zip(hit, X)], dtype=object)
+            Y = np.array([float('inf') if h else c for h, c in zip(hit, Y)], dtype=object)
+        else:
+            X = np.where(hit | ~np.isfinite(x[:, 0]), np.inf, X)
+            Y = np.where(hit | ~np.isfinite(x[:, 0]), np.inf, Y)
+        return X.reshape(shape), Y.reshape(shape)
+
+
+class PAdic:
+    """
+    Element of Q_p with fixed relative precision.
+    
+    A non-zero value is stored as p^valuation * unit with p not dividing the
+    unit and the unit known modulo p^precision (Python ints, so any precision
+    works). Zero is stored as unit 0 with valuation equal to the absolute
+    precision it is known to, i.e. O(p^valuation); an exact zero has
+    valuation inf. Operations track precision loss from cancellation.
+    """
+    
+    # Relative precision used when an exact number meets an exact zero
+    default_precision = 20
+    
+    def __init__(self, p, value=0, precision=None):
+        """
+        Initialize a p-adic number from an integer or rational value.
+        
+        Args:
+            p: Prime number
+            value: int, Fraction or PAdic
+            precision: Relative precision N (default: default_precision)
+        """
+        if precision is None:
+            precision = self.default_precision
+        self.p = p
+        
+        if isinstance(value, PAdic):
+            if value.p != p:
+                raise ValueError(f"Cannot convert a {value.p}-adic number to a {p}-adic one")
+            self.valuation_, self.unit, self.precision = (value.valuation_, value.unit,
+                                                          min(value.precision, precision))
+            self.unit %= p**self.precision
+            return
+        
+        value = Fraction(value)
+        if value == 0:
+            self.valuation_, self.unit, self.precision = math.inf, 0, 0
+            return
+        
+        v_num, num = _split_p_power(value.numerator, p)
+        v_den, den = _split_p_power(value.denominator, p)
+        modulus = p**precision
+        self.valuation_ = v_num - v_den
+        self.unit = num * pow(den, -1, modulus) % modulus
+        self.precision = precision
+    
+    @classmethod
+    def from_parts(cls, p, valuation, unit, precision):
+        """
+        Build p^valuation * unit + O(p^(valuation + precision)) directly.
+        
+        Args:
+            p: Prime number
+            valuation: Valuation (for zero: the absolute precision)
+            unit: Unit (reduced mod p^precision; 0 for zero)
+            precision: Relative precision
+            
+        Returns:
+            PAdic: The number
+        """
+        result = cls.__new__(cls)
+        result.p = p
+        if unit % p**max(precision, 0) == 0 or precision <= 0:
+            result.valuation_, result.unit, result.precision = valuation, 0, 0
+        else:
+            result.valuation_, result.unit, result.precision = (valuation,
+                                                                unit % p**precision,
+                                                                precision)
+        return result
+    
+    def is_zero(self):
+        """Whether the value is zero to the known precision."""
+        return self.unit == 0
+    
+    def valuation(self):
+        """
+        p-adic valuation v_p.
+        
+        Returns:
+            int: Valuation (for zero: the known lower bound, inf if exact)
+        """
+        return self.valuation_
+    
+    def absolute_precision(self):
+        """The value is known modulo p^absolute_precision()."""
+        return self.valuation_ + self.precision
+    
+    def _coerce(self, other):
+        """Convert an int/Fraction to a PAdic precise enough for self."""
+        if isinstance(other, PAdic):
+            if other.p != self.p:
+                raise ValueError(f"Cannot combine {self.p}-adic and {other.p}-adic numbers")
+            return other
+        other = Fraction(other)
+        if other == 0:
+            return PAdic(self.p, 0)
+        absolute = self.absolute_precision()
+        if math.isinf(absolute):
+            return PAdic(self.p, other)
+        v = _fraction_valuation(other, self.p)
+        return PAdic(self.p, other, precision=max(absolute - v, 1))
+    
+    def __add__(self, other):
+        other = self._coerce(other)
+        p = self.p
+        absolute = min(self.absolute_precision(), other.absolute_precision())
+        nonzero = [x for x in (self, other) if not x.is_zero()]
+        if not nonzero:
+            return PAdic.from_parts(p, absolute, 0, 0)
+        
+        v = min(x.valuation_ for x in nonzero)
+        if absolute - v <= 0:
+            return PAdic.from_parts(p, absolute, 0, 0)
+        modulus = p**(absolute - v)
+        total = sum(x.unit * p**(x.valuation_ - v) for x in nonzero) % modulus
+        if total == 0:
+            return PAdic.from_parts(p, absolute, 0, 0)
+        
+        k, unit = _split_p_power(total, p)
+        return PAdic.from_parts(p, v + k, unit, absolute - v - k)
+    
+    __radd__ = __add__
+    
+    def __neg__(self):
+        return PAdic.from_parts(self.p, self.valuation_, -self.unit, self.precision)
+    
+    def __sub__(self, other):
+        return self + (-self._coerce(other))
+    
+    def __rsub__(self, other):
+        return self._coerce(other) + (-self)
+    
+    def __mul__(self, other):
+        other = self._coerce(other)
+        if self.is_zero() or other.is_zero():
+            return PAdic.from_parts(self.p, self.valuation_ + other.valuation_, 0, 0)
+        precision = min(self.precision, other.precision)
+        return PAdic.from_parts(self.p, self.valuation_ + other.valuation_,
+                                self.unit * other.unit, precision)
+    
+    __rmul__ = __mul__
+    
+    def inverse(self):
+        """
+        Multiplicative inverse.
+        
+        Returns:
+            PAdic: 1 / self
+        """
+        if self.is_zero():
+            raise ZeroDivisionError("p-adic zero is not invertible")
+        modulus = self.p**self.precision
+        return PAdic.from_parts(self.p, -self.valuation_, pow(self.unit, -1, modulus),
+                                self.precision)
+    
+    def __truediv__(self, other):
+        return self * self._coerce(other).inverse()
+    
+    def __rtruediv__(self, other):
+        return self._coerce(other) * self.inverse()
+    
+    def __pow__(self, exponent):
+        if exponent < 0:
+            return self.inverse()**(-exponent)
+        result = PAdic(self.p, 1, precision=max(self.precision, 1))
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            base = base * base
+            exponent >>= 1
+        return result
+    
+    def sqrt(self):
+        """
+        Square root by Hensel lifting.
+        
+        Returns:
+            PAdic: A square root r with r^2 = self
+            
+        Raises:
+            ValueError: If self is not a square in Q_p
+        """
+        p = self.p
+        if self.is_zero():
+            return PAdic.from_parts(p, self.valuation_ / 2 if math.isinf(self.valuation_)
+                                    else self.valuation_ // 2, 0, 0)
+        if self.valuation_ % 2:
+            raise ValueError(f"{self} has odd valuation and is not a square")
+        
+        N = self.precision
+        if p == 2:
+            # Units that are squares are 1 mod 8; a root is determined mod 2^(N-1)
+            if N >= 3 and self.unit % 8 != 1 or N == 2 and self.unit % 4 != 1:
+                raise ValueError(f"{self} is not a square in Q_2")
+            root = 1
+            for i in range(3, N):
+                if (root * root - self.unit) % 2**(i + 1):
+                    root += 2**(i - 1)
+            return PAdic.from_parts(p, self.valuation_ // 2, root, max(N - 1, 1))
+        
+        root = _sqrt_mod_prime(self.unit % p, p)
+        if root is None:
+            raise ValueError(f"{self} is not a square in Q_{p}")
+        
+        # Newton iteration r <- r - (r^2 - u) / (2r), doubling precision each step
+        k = 1
+        while k < N:
+            k = min(2 * k, N)
+            modulus = p**k
+            root = (root - (root * root - self.unit) * pow(2 * root, -1, modulus)) % modulus
+        return PAdic.from_parts(p, self.valuation_ // 2, root, N)
+    
+    def __eq__(self, other):
+        try:
+            return (self - other).is_zero()
+        except (TypeError, ValueError):
+            return NotImplemented
+    
+    __hash__ = None
+    
+    def __abs__(self):
+        """p-adic absolute value |x|_p = p^(-v_p(x))."""
+        if self.is_zero():
+            return 0.0
+        return float(self.p)**(-self.valuation_)
+    
+    def to_fraction(self):
+        """
+        Rational representative p^valuation * unit (unit in [0, p^precision)).
+        
+        Returns:
+            Fraction: Representative
+        """
+        if self.is_zero():
+            return Fraction(0)
+        return Fraction(self.unit) * Fraction(self.p)**self.valuation_
+    
+    def __str__(self):
+        if self.is_zero():
+            return f"O({self.p}^{self.valuation_})"
+        return (f"{self.unit}*{self.p}^{self.valuation_} + "
+                f"O({self.p}^{self.absolute_precision()})")
+    
+    def __repr__(self):
+        return f"PAdic({self.p}, {self})"
+    
+    def __format__(self, spec):
+        return str(self)
+
+
+class PAdicVector:
+    """
+    NumPy-backed vector of p-adic numbers for bulk arithmetic.
+    
+    Entries are stored as parallel arrays of valuations, units and relative
+    precisions. Units are reduced modulo p^N for a common storage precision
+    N, the cap on every entry's relative precision. As in PAdic, each entry
+    tracks the precision it loses to cancellation, and zero entries store the
+    absolute precision they are known to as their valuation. Units use int64
+    when p^(2N) fits, otherwise Python ints in object arrays.
+    """
+    
+    def __init__(self, p, values=(), precision=None):
+        """
+        Initialize a p-adic vector.
+        
+        Args:
+            p: Prime number
+            values: Iterable of ints, Fractions or PAdic numbers
+            precision: Storage precision N (default: PAdic.default_precision)
+        """
+        if precision is None:
+            precision = PAdic.default_precision
+        entries = [PAdic(p, value, precision) for value in values]
+        # An exact zero has valuation inf; store it as O(p^N)
+        valuations = [precision if math.isinf(x.valuation_) else int(x.valuation_)
+                      for x in entries]
+        self._set(p, precision, np.array(valuations, dtype=np.int64),
+                  [x.unit for x in entries],
+                  np.array([x.precision for x in entries], dtype=np.int64))
+    
+    @classmethod
+    def from_arrays(cls, p, valuations, units, precision, precisions=None):
+        """
+        Build a vector from valuation and unit arrays (units reduced mod p^N).
+        
+        Args:
+            p: Prime number
+            valuations: Array of valuations
+            units: Array of units
+            precision: Storage precision N
+            precisions: Array of relative precisions (default: N for every entry)
+            
+        Returns:
+            PAdicVector: The vector, normalized so units are prime to p
+        """
+        valuations = np.asarray(valuations, dtype=np.int64)
+        if precisions is None:
+            precisions = np.full(valuations.shape, precision, dtype=np.int64)
+        result = cls.__new__(cls)
+        result._set(p, precision, valuations, units, precisions)
+        return result._normalized()
+    
+    def _set(self, p, precision, valuations, units, precisions):
+        self.p = p
+        self.precision = precision
+        self.modulus = p**precision
+        self.dtype = np.int64 if self.modulus**2 < (1 << 63) else object
+        self.valuations = valuations
+        self.precisions = np.clip(np.asarray(precisions, dtype=np.int64), 0, precision)
+        if self.dtype is object:
+            self.units = np.array([int(u) for u in np.ravel(units)], dtype=object)
+        else:
+            self.units = np.asarray(units, dtype=np.int64)
+        # Digits beyond each entry's own precision are unknown; drop them
+        self.units = self.units % self._powers()[self.precisions]
+    
+    def _powers(self):
+        """Array of p^k for k = 0, ..., N in the unit dtype."""
+        return np.array([self.p**k for k in range(self.precision + 1)], dtype=self.dtype)
+    
+    def _normalized(self):
+        """
+        Move factors of p from the units into the valuations.
+        
+        Each factor moved costs one digit of relative precision; entries left
+        with unit 0 become zeros known to their absolute precision.
+        """
+        p = self.p
+        units = self.units.copy()
+        valuations = self.valuations.copy()
+        precisions = self.precisions.copy()
+        zero = units == 0
+        divisible = ~zero & (units % p == 0)
+        while divisible.any():
+            units[divisible] //= p
+            valuations[divisible] += 1
+            precisions[divisible] -= 1
+            divisible = ~zero & (units % p == 0)
+        valuations = np.where(zero, valuations + precisions, valuations)
+        precisions = np.where(zero, 0, precisions)
+        self.units, self.valuations, self.precisions = units, valuations, precisions
+        return self
+    
+    def _coerce(self, other):
+        if isinstance(other, PAdicVector):
+            if other.p != self.p:
+                raise ValueError(f"Cannot combine {self.p}-adic and {other.p}-adic vectors")
+            return other
+        return PAdicVector(self.p, [other], self.precision)
+    
+    def __len__(self):
+        return len(self.units)
+    
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return PAdic.from_parts(self.p, int(self.valuations[index]),
+                                    int(self.units[index]), int(self.precisions[index]))
+        return PAdicVector.from_arrays(self.p, self.valuations[index], self.units[index],
+                                       self.precision, self.precisions[index])
+    
+    def to_list(self):
+        """
+        Convert to a list of PAdic numbers.
+        
+        Returns:
+            list: Entries as PAdic
+        """
+        return [self[i] for i in range(len(self))]
+    
+    def valuation(self):
+        """
+        Entrywise valuations (zero entries report their absolute precision).
+        
+        Returns:
+            numpy.ndarray: Valuations
+        """
+        return self.valuations.copy()
+    
+    def absolute_precision(self):
+        """
+        Entrywise absolute precision: entry i is known modulo p^result[i].
+        
+        Returns:
+            numpy.ndarray: valuations + relative precisions
+        """
+        return self.valuations + self.precisions
+    
+    def __add__(self, other):
+        other = self._coerce(other)
+        N = self.precision
+        absolute = np.minimum(self.absolute_precision(), other.absolute_precision())
+        # Zero entries contribute nothing; their valuation is already their cap
+        v = np.minimum(self.valuations, other.valuations)
+        
+        # Shifts of N or more vanish mod p^N
+        powers = self._powers()
+        powers[N] = 0
+        shift_a = powers[np.minimum(self.valuations - v, N)]
+        shift_b = powers[np.minimum(other.valuations - v, N)]
+        units = (self.units * shift_a + other.units * shift_b) % self.modulus
+        return PAdicVector.from_arrays(self.p, v, units, N, absolute - v)
+    
+    __radd__ = __add__
+    
+    def __neg__(self):
+        return PAdicVector.from_arrays(self.p, self.valuations, -self.units, self.precision,
+                                       self.precisions)
+    
+    def __sub__(self, other):
+        return self + (-self._coerce(other))
+    
+    def __rsub__(self, other):
+        return self._coerce(other) + (-self)
+    
+    def __mul__(self, other):
+        other = self._coerce(other)
+        units = self.units * other.units % self.modulus
+        return PAdicVector.from_arrays(self.p, self.valuations + other.valuations, units,
+                                       self.precision,
+                                       np.minimum(self.precisions, other.precisions))
+    
+    __rmul__ = __mul__
+    
+    def inverse(self):
+        """
+        Entrywise inverse; all units are inverted together with batch_inverse().
+        
+        Returns:
+            PAdicVector: 1 / self
+        """
+        if (self.units == 0).any():
+            raise ZeroDivisionError("p-adic zero is not invertible")
+        units = batch_inverse(self.units, modulus=self.modulus)
+        return PAdicVector.from_arrays(self.p, -self.valuations, units, self.precision,
+                                       self.precisions)
+    
+    def __truediv__(self, other):
+        return self * self._coerce(other).inverse()
+    
+    def __rtruediv__(self, other):
+        return self._coerce(other) * self.inverse()
+    
+    def sqrt(self):
+        """
+        Entrywise square roots by vectorized Hensel lifting (odd p only).
+        
+        Returns:
+            PAdicVector: Square roots
+            
+        Raises:
+            ValueError: If p = 2 or some entry is not a square
+        """
+        p = self.p
+        if p == 2:
+            raise ValueError("PAdicVector.sqrt supports odd primes only")
+        zero = self.units == 0
+        if (self.valuations[~zero] % 2).any():
+            raise ValueError("Entries with odd valuation are not squares")
+        
+        residues = [int(u) % p for u in self.units]
+        roots = [_sqrt_mod_prime(r, p) if r else 0 for r in residues]
+        if any(root is None for root in roots):
+            raise ValueError(f"Some entries are not squares in Q_{p}")
+        root = np.array(roots, dtype=self.dtype)
+        
+        # Newton iteration on all entries at once, doubling precision each step
+        units = np.where(zero, 1, self.units)
+        root = np.where(zero, 1, root)
+        k = 1
+        while k < self.precision:
+            k = min(2 * k, self.precision)
+            modulus = p**k
+            correction = (root * root - units) % modulus
+            correction = correction * batch_inverse(2 * root % modulus, modulus=modulus)
+            root = (root - correction) % modulus
+        
+        root = np.where(zero, 0, root)
+        return PAdicVector.from_arrays(p, self.valuations // 2, root, self.precision,
+                                       self.precisions)
+    
+    def __repr__(self):
+        return f"PAdicVector({self.p}, {[str(x) for x in self.to_list()]})"
+
+
+def teichmuller_representatives(p, precision, residues=None):
+    """
+    Teichmüller representatives omega(a) mod p^precision in one batch.
+    
+    omega(a) is the unique root of x^p = x in Z_p with omega(a) = a mod p. It is
+    found by Newton iteration on f(x) = x^p - x, run on all residues at once.
+    f'(x) = p x^(p-1) - 1 is a unit, so each step doubles the p-adic precision
+    and only ceil(log2(precision)) steps are needed, instead of the naive
+    a^(p^(precision - 1)), which costs precision - 1 full modular powers.
+    
+    When most of F_p is requested, omega being multiplicative is used as
+    well: only a primitive root g is Newton-lifted, and omega(g^i) = omega(g)^i
+    fills the rest of the table with one multiplication per residue.
+    
+    Args:
+        p: Prime number
+        precision: Number N of p-adic digits
+        residues: Array-like of integers (default: every residue 0, ..., p - 1);
+            only a mod p matters, and repeated residues are computed once
+            
+    Returns:
+        numpy.ndarray: omega(a) mod p^N for each input, as int64 when p^(2N)
+        fits and Python ints otherwise
+    """
+    modulus = p**precision
+    dtype = np.int64 if modulus**2 < (1 << 63) else object
+    
+    if residues is None:
+        return _teichmuller_table(p, precision, dtype)
+    
+    reduced = np.array([int(a) % p for a in np.ravel(residues)], dtype=np.int64)
+    unique, inverse = np.unique(reduced, return_inverse=True)
+    if len(unique) > p // 4:
+        omega = _teichmuller_table(p, precision, dtype)[unique]
+    else:
+        omega = _teichmuller_newton(unique.astype(dtype), p, precision)
+    return omega[inverse].reshape(np.shape(residues))
+
+
+def _teichmuller_newton(x, p, precision):
+    """
+    Vectorized Newton lift of residues x to roots of x^p = x mod p^precision.
+    
+    Args:
+        x: Integer array of residues mod p
+        p: Prime number
+        precision: Number of p-adic digits
+        
+    Returns:
+        numpy.ndarray: Lifts mod p^precision
+    """
+    # Newton's method with the derivative evaluated at the root: x^(p-1) = 1 to
+    # the current precision, so f'(x) = p x^(p-1) - 1 = p - 1 there, and the
+    # O(p^k) error in the derivative only perturbs the step at O(p^(2k))
+    k = 1
+    while k < precision:
+        k = min(2 * k, precision)
+        modulus_k = p**k
+        f = (_power_mod(x, p, modulus_k) - x) % modulus_k
+        x = (x - f * pow(p - 1, -1, modulus_k)) % modulus_k
+    return x
+
+
+def _teichmuller_table(p, precision, dtype):
+    """
+    omega(a) for every a in F_p from the Newton lift of one primitive root.
+    
+    The powers omega(g)^i are laid out as a sqrt(p) x sqrt(p) grid: one row of
+    consecutive powers, then each further row is the previous one times
+    omega(g)^B, so the whole table takes about sqrt(p) vectorized steps.
+    
+    Args:
+        p: Prime number
+        precision: Number of p-adic digits
+        dtype: int64 or object
+        
+    Returns:
+        numpy.ndarray: Table indexed by residue
+    """
+    modulus = p**precision
+    table = np.zeros(p, dtype=dtype)
+    if p == 2:
+        table[1] = 1
+        return table
+    
+    g = _primitive_root(p)
+    omega_g = int(_teichmuller_newton(np.array([g], dtype=dtype), p, precision)[0])
+    
+    order = p - 1
+    block = math.isqrt(order - 1) + 1
+    lifts = [1]
+    roots = [1]
+    for _ in range(block - 1):
+        lifts.append(lifts[-1] * omega_g % modulus)
+        roots.append(roots[-1] * g % p)
+    lifts = np.array(lifts, dtype=dtype)
+    roots = np.array(roots, dtype=np.int64)
+    lift_step = lifts[-1] * omega_g % modulus
+    root_step = int(roots[-1]) * g % p
+    
+    for start in range(0, order, block):
+        count = min(block, order - start)
+        table[roots[:count]] = lifts[:count]
+        lifts = lifts * lift_step % modulus
+        roots = roots * root_step % p
+    
+    return table
+
+
+def _primitive_root(p):
+    """Smallest primitive root modulo an odd prime p."""
+    factors = set()
+    n = p - 1
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors.add(d)
+            n //= d
+        d += 1
+    if n > 1:
+        factors.add(n)
+    
+    g = 2
+    while any(pow(g, (p - 1) // f, p) == 1 for f in factors):
+        g += 1
+    return g
+
+
+def teichmuller_lift(a, p, precision=None):
+    """
+    Teichmüller representative omega(a) as a PAdic number.
+    
+    Args:
+        a: Integer (only a mod p matters)
+        p: Prime number
+        precision: Number of p-adic digits (default: PAdic.default_precision)
+        
+    Returns:
+        PAdic: omega(a)
+    """
+    if precision is None:
+        precision = PAdic.default_precision
+    omega = int(teichmuller_representatives(p, precision, [a])[0])
+    return PAdic(p, omega, precision)
+
+
+def _power_mod(x, exponent, modulus):
+    """
+    Elementwise x^exponent mod modulus by square-and-multiply.
+    
+    Args:
+        x: Integer array (int64 with modulus^2 < 2^63, or object)
+        exponent: Non-negative Python int
+        modulus: Modulus
+        
+    Returns:
+        numpy.ndarray: Powers
+    """
+    result = np.ones_like(x)
+    base = x % modulus
+    while exponent:
+        if exponent & 1:
+            result = result * base % modulus
+        base = base * base % modulus
+        exponent >>= 1
+    return result
+
+
+def primes_up_to(bound):
+    """
+    All primes <= bound (sieve of Eratosthenes).
+    
+    Returns:
+        numpy.ndarray: Primes as int64
+    """
+    if bound < 2:
+        return np.zeros(0, dtype=np.int64)
+    sieve = np.ones(bound + 1, dtype=bool)
+    sieve[:2] = False
+    for d in range(2, math.isqrt(bound) + 1):
+        if sieve[d]:
+            sieve[d * d::d] = False
+    return np.flatnonzero(sieve).astype(np.int64)
+
+
+def tate_model_point_counts(a_4, a_6, delta, bound, legendre_bound=1000, batch_size=4096,
+                            seed=0):
+    """
+    Count points on y^2 + xy = x^3 + a_4*x + a_6 modulo all good primes l <= bound.
+    
+    The engine behind TateCurve.point_counts(), usable for any rational Tate
+    model (for example an integral truncation at a p-adic q).
+    
+    Args:
+        a_4, a_6: Rational coefficients (int or Fraction)
+        delta: Their discriminant (see _tate_discriminant())
+        bound: Largest prime l
+        legendre_bound: Primes below this use the O(l) character sum
+        batch_size: Number of primes per baby-step giant-step batch
+        seed: Random seed for the choice of points
+        
+    Returns:
+        dict: 'primes', 'counts' and 'traces' as in TateCurve.point_counts()
+    """
+    a_4, a_6, delta = Fraction(a_4), Fraction(a_6), Fraction(delta)
+    primes = primes_up_to(bound)
+    
+    denominators = a_4.denominator * a_6.denominator * delta.denominator
+    good = np.array([denominators % l != 0 and delta.numerator % l != 0
+                     for l in primes.tolist()], dtype=bool)
+    primes = primes[good]
+    traces = np.zeros(len(primes), dtype=np.int64)
+    
+    # l = 2, 3: count the Tate model y^2 + xy = x^3 + a_4 x + a_6 directly
+    small = primes < 5
+    for index in np.flatnonzero(small):
+        l = int(primes[index])
+        r_4, r_6 = _reduce_mod(a_4, l), _reduce_mod(a_6, l)
+        count = 1 + sum((y * y + x * y - x**3 - r_4 * x - r_6) % l == 0
+                        for x in range(l) for y in range(l))
+        traces[index] = l + 1 - count
+    
+    # l >= 5: short model Y^2 = X^3 - 27 c_4 X - 54 c_6
+    c_4 = 1 - 48 * a_4
+    c_6 = -1 + 72 * a_4 - 864 * a_6
+    A = np.array([_reduce_mod(-27 * c_4, l) for l in primes.tolist()], dtype=np.int64)
+    B = np.array([_reduce_mod(-54 * c_6, l) for l in primes.tolist()], dtype=np.int64)
+    
+    legendre = ~small & (primes < legendre_bound)
+    for index in np.flatnonzero(legendre):
+        traces[index] = _trace_legendre(int(A[index]), int(B[index]), int(primes[index]))
+    
+    rng = np.random.default_rng(seed)
+    large = np.flatnonzero(primes >= max(legendre_bound, 5))
+    for start in range(0, len(large), batch_size):
+        lanes = large[start:start + batch_size]
+        traces[lanes] = _trace_bsgs(A[lanes], B[lanes], primes[lanes], rng)
+    
+    return {
+        'primes': primes,
+        'counts': primes + 1 - traces,
+        'traces': traces,
+    }
+
+
+def _reduce_mod(x, modulus):
+    """Reduce a rational number with denominator prime to modulus."""
+    x = Fraction(x)
+    return x.numerator * pow(x.denominator, -1, modulus) % modulus
+
+
+def _trace_legendre(A, B, l):
+    """
+    a_l of Y^2 = X^3 + A X + B over F_l as minus the Legendre-symbol sum.
+    
+    Returns:
+        int: Trace of Frobenius
+    """
+    x = np.arange(l, dtype=np.int64)
+    chi = -np.ones(l, dtype=np.int64)
+    chi[x * x % l] = 1
+    chi[0] = 0
+    rhs = (x * x % l * x + A * x + B) % l
+    return -int(chi[rhs].sum())
+
+
+def _power_mod_lanes(x, exponents, modulus):
+    """
+    x[i]^exponents[i] mod modulus[i] for int64 lanes (modulus < 2^31).
+    
+    Returns:
+        numpy.ndarray: Powers
+    """
+    result = np.ones_like(x)
+    base = x % modulus
+    e = exponents.copy()
+    while (e > 0).any():
+        odd = (e & 1) == 1
+        result = np.where(odd, result * base % modulus, result)
+        base = base * base % modulus
+        e >>= 1
+    return result
+
+
+def _projective_add_mod(P, Q, modulus):
+    """
+    add-1998-cmo-2 on (X, Y, Z) int64 lanes modulo per-lane primes.
+    
+    Infinity (Z = 0) on either side is handled by masks. P = Q cannot be
+    handled by this formula and is reported instead.
+    
+    Args:
+        P, Q: Tuples of three int64 arrays
+        modulus: Per-lane primes
+        
+    Returns:
+        tuple: (sum, degenerate) where degenerate marks lanes with P = Q
+    """
+    m = modulus
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    Y1Z2 = Y1 * Z2 % m
+    X1Z2 = X1 * Z2 % m
+    Z1Z2 = Z1 * Z2 % m
+    u = (Y2 * Z1 - Y1Z2) % m
+    v = (X2 * Z1 - X1Z2) % m
+    uu = u * u % m
+    vv = v * v % m
+    vvv = v * vv % m
+    R = vv * X1Z2 % m
+    A = (uu * Z1Z2 % m - vvv - 2 * R) % m
+    X3 = v * A % m
+    Y3 = (u * ((R - A) % m) - vvv * Y1Z2 % m) % m
+    Z3 = vvv * Z1Z2 % m
+    
+    p_inf = Z1 == 0
+    q_inf = Z2 == 0
+    degenerate = ~p_inf & ~q_inf & (u == 0) & (v == 0)
+    X3 = np.where(p_inf, X2, np.where(q_inf, X1, X3))
+    Y3 = np.where(p_inf, Y2, np.where(q_inf, Y1, Y3))
+    Z3 = np.where(p_inf, Z2, np.where(q_inf, Z1, Z3))
+    return (X3, Y3, Z3), degenerate
+
+
+def _projective_double_mod(P, a, modulus):
+    """
+    dbl-2007-bl on (X, Y, Z) int64 lanes for Y^2 = X^3 + a X + b mod per-lane primes.
+    
+    Returns:
+        tuple: Doubled points (infinity stays at infinity)
+    """
+    m = modulus
+    X1, Y1, Z1 = P
+    XX = X1 * X1 % m
+    w = (a * (Z1 * Z1 % m) + 3 * XX) % m
+    s = 2 * Y1 * Z1 % m
+    ss = s * s % m
+    R = Y1 * s % m
+    RR = R * R % m
+    B = ((X1 + R) * (X1 + R) - XX - RR) % m
+    h = (w * w - 2 * B) % m
+    X3 = h * s % m
+    Y3 = (w * ((B - h) % m) - 2 * RR) % m
+    Z3 = s * ss % m
+    
+    p_inf = Z1 == 0
+    return (np.where(p_inf, X1, X3), np.where(p_inf, Y1, Y3), np.where(p_inf, Z1, Z3))
+
+
+def _projective_sum_mod(P, Q, a, modulus):
+    """Complete addition on int64 lanes: the addition formula, doubling where P = Q."""
+    total, degenerate = _projective_add_mod(P, Q, modulus)
+    if degenerate.any():
+        doubled = _projective_double_mod(P, a, modulus)
+        total = tuple(np.where(degenerate, d, t) for d, t in zip(doubled, total))
+    return total
+
+
+def _projective_multiply_mod(P, k, a, modulus):
+    """k P by double-and-add on int64 lanes (same scalar k for every lane)."""
+    result = (np.zeros_like(P[0]), np.ones_like(P[0]), np.zeros_like(P[0]))
+    for bit in bin(k)[2:]:
+        result = _projective_double_mod(result, a, modulus)
+        if bit == '1':
+            result = _projective_sum_mod(result, P, a, modulus)
+    return result
+
+
+def _affine_lanes_mod(points, modulus):
+    """
+    Affine (x, y) of projective points stacked as columns, modulo per-lane primes.
+    
+    Args:
+        points: List of (X, Y, Z) int64 array triples
+        modulus: (N, 1) array of primes
+        
+    Returns:
+        tuple: (x, y) arrays of shape (N, len(points)); 0 at infinity
+    """
+    X, Y, Z = (np.stack(column, axis=1) for column in zip(*points))
+    inverse = _power_mod_lanes(Z, modulus - 2, modulus)
+    return X * inverse % modulus, Y * inverse % modulus
+
+
+def _trace_bsgs(A, B, primes, rng, max_attempts=8):
+    """
+    a_l of Y^2 = X^3 + A X + B for a batch of primes by baby-step giant-step.
+    
+    For a random x with d = x^3 + A x + B != 0, the point (x d, d^2) lies on
+    the twist Y^2 = X^3 + A d^2 X + B d^3, which is E itself when d is a square
+    and the quadratic twist (trace -a_l) otherwise, so no square roots are
+    needed. Writing t = i (2m + 1) + j with |j| <= m, the trace of that curve is
+    the t in the Hasse interval |t| <= 2 sqrt(l) with (l + 1) P - i (2m + 1) P = j P;
+    baby steps j P and giant steps are compared in projective coordinates by
+    cross-multiplication, so the whole search is division-free. Lanes where P
+    has too small an order (ambiguous match) retry with a new x, and
+    whatever is left falls back to the Legendre-symbol sum.
+    
+    Args:
+        A, B: Per-lane curve coefficients mod l
+        primes: Per-lane primes (< 2^31)
+        rng: NumPy random generator
+        max_attempts: Number of random points tried per prime
+        
+    Returns:
+        numpy.ndarray: Traces a_l
+    """
+    traces = np.zeros(len(primes), dtype=np.int64)
+    pending = np.arange(len(primes))
+    
+    for _ in range(max_attempts):
+        if len(pending) == 0:
+            break
+        l = primes[pending]
+        x = rng.integers(0, l)
+        d = (x * x % l * x + A[pending] * x + B[pending]) % l
+        usable = d != 0
+        
+        d2 = d * d % l
+        a = A[pending] * d2 % l
+        P = (x * d % l, d2, np.where(usable, 1, 0).astype(np.int64))
+        t, solved = _bsgs_trace_lanes(P, a, l)
+        solved &= usable
+        
+        chi = _power_mod_lanes(d, (l - 1) // 2, l)
+        chi = np.where(chi == 1, 1, -1)
+        traces[pending[solved]] = (chi * t)[solved]
+        pending = pending[~solved]
+    
+    for index in pending:
+        traces[index] = _trace_legendre(int(A[index]), int(B[index]), int(primes[index]))
+    
+    return traces
+
+
+def _bsgs_trace_lanes(P, a, l):
+    """
+    Find the unique t with |t| <= 2 sqrt(l) and (l + 1 - t) P = O, per lane.
+    
+    Args:
+        P: Projective points (X, Y, Z) as int64 arrays
+        a: Per-lane curve coefficient a in Y^2 = X^3 + a X + b
+        l: Per-lane primes
+        
+    Returns:
+        tuple: (t, solved) arrays; solved is False where the match is
+        ambiguous
+    """
+    hasse = np.array([math.isqrt(4 * int(v)) for v in l], dtype=np.int64)
+    m = math.isqrt(int(hasse.max())) + 1
+    giant_count = int(hasse.max()) // (2 * m + 1) + 1
+    
+    # Baby steps B_j = j P for j = 0..m + 1
+    infinity = (np.zeros_like(l), np.ones_like(l), np.zeros_like(l))
+    baby = [infinity, P]
+    while len(baby) < m + 2:
+        baby.append(_projective_sum_mod(baby[-1], P, a, l))
+    # jP = O for some 0 < j <= m + 1 means P has too small an order
+    bad = np.zeros(len(l), dtype=bool)
+    for j in range(1, m + 2):
+        bad |= baby[j][2] == 0
+    
+    # S = (2m + 1) P and T = (l + 1) P
+    S = _projective_sum_mod(baby[m], baby[m + 1], a, l)
+    T = infinity
+    for column in _binary_digits(l + 1).T:
+        T = _projective_double_mod(T, a, l)
+        added = _projective_sum_mod(T, P, a, l)
+        T = tuple(np.where(column == 1, new, old) for new, old in zip(added, T))
+    
+    # Giant steps G_i = T - i S for |i| <= giant_count
+    minus_S = (S[0], (-S[1]) % l, S[2])
+    giants = {0: T}
+    for sign, step_point in ((1, minus_S), (-1, S)):
+        G = T
+        for i in range(1, giant_count + 1):
+            G = _projective_sum_mod(G, step_point, a, l)
+            giants[sign * i] = G
+    
+    # Normalise to affine (Fermat inverses per lane) and match x(G_i) = x(B_j);
+    # y decides the sign of j
+    lm = l[:, None]
+    steps = np.array(sorted(giants))
+    baby_x, baby_y = _affine_lanes_mod(baby[1:m + 1], lm)
+    giant_x, giant_y = _affine_lanes_mod([giants[i] for i in steps], lm)
+    giant_infinite = np.stack([giants[i][2] for i in steps], axis=1) == 0
+    
+    offset = steps[None, :, None] * (2 * m + 1)
+    j = np.arange(1, m + 1)[None, None, :]
+    same_x = ~giant_infinite[:, :, None] & (giant_x[:, :, None] == baby_x[:, None, :])
+    # G_i = jP and G_i = -jP are separate matches (both hold when 2 jP = O)
+    plus = same_x & (giant_y[:, :, None] == baby_y[:, None, :])
+    minus = same_x & (giant_y[:, :, None] == (-baby_y[:, None, :]) % lm[:, :, None])
+    plus &= np.abs(offset + j) <= hasse[:, None, None]
+    minus &= np.abs(offset - j) <= hasse[:, None, None]
+    at_infinity = giant_infinite & (np.abs(offset[:, :, 0]) <= hasse[:, None])
+    
+    big = np.iinfo(np.int64).max
+    lowest = np.minimum.reduce([np.where(plus, offset + j, big).min(axis=(1, 2)),
+                                np.where(minus, offset - j, big).min(axis=(1, 2)),
+                                np.where(at_infinity, offset[:, :, 0], big).min(axis=1)])
+    highest = np.maximum.reduce([np.where(plus, offset + j, -big).max(axis=(1, 2)),
+                                 np.where(minus, offset - j, -big).max(axis=(1, 2)),
+                                 np.where(at_infinity, offset[:, :, 0], -big).max(axis=1)])
+    
+    # Solved iff exactly one trace in the Hasse interval matches
+    t = lowest
+    solved = ~bad & (lowest == highest)
+    return t, solved
+
+
+# Memo of division polynomials keyed by (curve key, n), least recently used
+# first; at most DIVISION_POLYNOMIAL_CACHE_SIZE entries are kept
+DIVISION_POLYNOMIAL_CACHE_SIZE = 512
+_DIVISION_POLYNOMIALS = OrderedDict()
+_DIVISION_POLYNOMIAL_STATS = {'hits': 0, 'misses': 0}
+
+
+def _coefficient_key(value):
+    """Hashable key for a curve coefficient (PAdic numbers are not hashable)."""
+    if isinstance(value, PAdic):
+        return ('padic', value.p, value.valuation_, value.unit, value.precision)
+    return value
+
+
+def _poly_sub(a, b):
+    """Difference of two polynomials (coefficient arrays, highest degree first)."""
+    size = max(len(a), len(b))
+    a = np.concatenate((np.zeros(size - len(a), dtype=a.dtype), a)) if len(a) < size else a
+    b = np.concatenate((np.zeros(size - len(b), dtype=b.dtype), b)) if len(b) < size else b
+    return a - b
+
+
+def _poly_mul(*factors):
+    """Product of polynomials (coefficient arrays, highest degree first)."""
+    result = factors[0]
+    for factor in factors[1:]:
+        result = np.convolve(result, factor)
+    return result
+
+
+def division_polynomial(a_4, a_6, n):
+    """
+    Division polynomial of y^2 = x^3 + a_4*x + a_6 as a polynomial in x.
+    
+    Returns f_n with psi_n = f_n for odd n and psi_n = 2y * f_n for even n,
+    built by the standard doubling recursion with y^2 eliminated through
+    F = 4(x^3 + a_4*x + a_6):
+        f_{2m+1} = F^2 f_{m+2} f_m^3 - f_{m-1} f_{m+1}^3   (m even)
+        f_{2m+1} = f_{m+2} f_m^3 - F^2 f_{m-1} f_{m+1}^3   (m odd)
+        f_{2m} = f_m (f_{m+2} f_{m-1}^2 - f_{m-2} f_{m+1}^2)
+    Every f_k is memoized per curve, so queries for several n share the
+    smaller f_k; the memo is bounded by DIVISION_POLYNOMIAL_CACHE_SIZE.
+    
+    Args:
+        a_4, a_6: Curve coefficients (floats, Fractions or PAdic numbers)
+        n: Non-negative integer
+        
+    Returns:
+        numpy.ndarray: Read-only coefficients of f_n, highest degree first
+        (float for float curves, object otherwise), shared with the memo
+    """
+    if n < 0:
+        raise ValueError(f"n must be non-negative, got {n}")
+    
+    key = (_coefficient_key(a_4), _coefficient_key(a_6), n)
+    if key in _DIVISION_POLYNOMIALS:
+        _DIVISION_POLYNOMIAL_STATS['hits'] += 1
+        _DIVISION_POLYNOMIALS.move_to_end(key)
+        return _DIVISION_POLYNOMIALS[key]
+    _DIVISION_POLYNOMIAL_STATS['misses'] += 1
+    
+    is_float = isinstance(a_4, (float, np.floating)) and isinstance(a_6, (float, np.floating))
+    dtype = float if is_float else object
+    one = a_6 - a_6 + 1
+    
+    def f(k):
+        return division_polynomial(a_4, a_6, k)
+    
+    if n == 0:
+        result = np.array([one - 1], dtype=dtype)
+    elif n in (1, 2):
+        result = np.array([one], dtype=dtype)
+    elif n == 3:
+        result = np.array([3 * one, 0 * one, 6 * a_4, 12 * a_6, -a_4 * a_4], dtype=dtype)
+    elif n == 4:
+        result = 2 * np.array([one, 0 * one, 5 * a_4, 20 * a_6, -5 * a_4 * a_4,
+                               -4 * a_4 * a_6, -8 * a_6 * a_6 - a_4 * a_4 * a_4], dtype=dtype)
+    else:
+        m = n // 2
+        if n % 2:
+            F = 4 * np.array([one, 0 * one, a_4, a_6], dtype=dtype)
+            F2 = _poly_mul(F, F)
+            first = _poly_mul(f(m + 2), f(m), f(m), f(m))
+            second = _poly_mul(f(m - 1), f(m + 1), f(m + 1), f(m + 1))
+            if m % 2 == 0:
+                result = _poly_sub(_poly_mul(F2, first), second)
+            else:
+                result = _poly_sub(first, _poly_mul(F2, second))
+        else:
+            result = _poly_mul(f(m), _poly_sub(_poly_mul(f(m + 2), f(m - 1), f(m - 1)),
+                                               _poly_mul(f(m - 2), f(m + 1), f(m + 1))))
+    
+    result.setflags(write=False)
+    _DIVISION_POLYNOMIALS[key] = result
+    while len(_DIVISION_POLYNOMIALS) > DIVISION_POLYNOMIAL_CACHE_SIZE:
+        _DIVISION_POLYNOMIALS.popitem(last=False)
+    return result
+
+
+def division_polynomial_cache_info():
+    """
+    Report statistics of the division polynomial memo.
+    
+    Returns:
+        dict: 'hits', 'misses' and 'size'
+    """
+    return {**_DIVISION_POLYNOMIAL_STATS, 'size': len(_DIVISION_POLYNOMIALS)}
+
+
+def _taylor_shift(coefficients, shift):
+    """Coefficients of f(x + shift) from those of f(x), highest degree first."""
+    shifted = list(coefficients)
+    for i in range(len(shifted) - 1):
+        for j in range(1, len(shifted) - i):
+            shifted[j] = shifted[j] + shift * shifted[j - 1]
+    return shifted
+
+
+def _p_adic_integral_roots(coefficients, p, precision):
+    """
+    Roots in Z_p of an integer polynomial known modulo p^precision.
+    
+    Works digit by digit: every residue r with f(r) = 0 mod p is kept, and the
+    search continues on f(r + p x) with its content divided out. A branch is
+    accepted once it passes a simple root modulo p, where Hensel's lemma
+    guarantees a unique root in Z_p; branches that run out of precision before
+    that are artifacts of the truncated coefficients and are dropped.
+    
+    Args:
+        coefficients: Python ints, highest degree first, not all divisible by p
+        p: Prime number
+        precision: Absolute precision of the coefficients
+        
+    Returns:
+        list: (root, digits) pairs with root known modulo p^digits
+    """
+    roots = []
+    stack = [(list(coefficients), 0, 0, precision, False)]
+    while stack:
+        f, base, digits, N, certified = stack.pop()
+        modulus = p**N
+        degree = len(f) - 1
+        for r in range(p):
+            value = slope = 0
+            for i, c in enumerate(f):
+                value = (value * r + c) % p
+                if i < degree:
+                    slope = (slope * r + (degree - i) * c) % p
+            if value:
+                continue
+            
+            # Coefficients of g(x) = f(r + p x) mod p^N via Taylor shift
+            g = [c % modulus for c in f]
+            for i in range(1, len(g)):
+                for j in range(1, len(g) - i + 1):
+                    g[j] = (g[j] + r * g[j - 1]) % modulus
+            g = [c * p**(degree - i) % modulus for i, c in enumerate(g)]
+            
+            content = min((_split_p_power(c, p)[0] for c in g if c), default=N)
+            root = base + r * p**digits
+            simple = certified or slope != 0
+            if content >= N:
+                if simple:
+                    roots.append((root, digits + 1))
+            else:
+                stack.append(([c // p**content for c in g], root, digits + 1,
+                              N - content, simple))
+    return roots
+
+
+def agm(a, b, tolerance=1e-15, max_iterations=64):
+    """
+    Arithmetic-geometric mean of real or complex arrays.
+    
+    Uses the optimal choice of sign (|a_n - b_n| <= |a_n + b_n|), starting with
+    b itself, which keeps the iteration on the branch that gives lattice
+    periods. Converges quadratically; all lanes iterate together.
+    
+    Args:
+        a, b: Scalars or arrays
+        tolerance: Relative stopping criterion
+        max_iterations: Iteration cap
+        
+    Returns:
+        numpy.ndarray: M(a, b) (complex)
+    """
+    a = np.asarray(a, dtype=complex)
+    b = np.asarray(b, dtype=complex)
+    b = np.where(np.abs(a - b) > np.abs(a + b), -b, b)
+    for _ in range(max_iterations):
+        if (np.abs(a - b) <= tolerance * np.abs(a)).all():
+            break
+        a, b = (a + b) / 2, np.sqrt(a * b)
+        b = np.where(np.abs(a - b) > np.abs(a + b), -b, b)
+    return a
+
+
+def _two_torsion_roots(a_4, a_6):
+    """
+    Roots e_i of Y^2 = 4(X - e_1)(X - e_2)(X - e_3) for the Tate model, vectorized.
+    
+    With X = x + 1/12 and Y = 2y + x, y^2 + xy = x^3 + a_4*x + a_6 becomes
+    Y^2 = 4X^3 + ..., whose roots are those of 4x^3 + x^2 + 4a_4*x + 4a_6 shifted
+    by 1/12; they are found for all curves at once as companion-matrix
+    eigenvalues.
+    
+    Returns:
+        numpy.ndarray: Complex roots, shape a_4.shape + (3,)
+    """
+    a_4, a_6 = np.broadcast_arrays(np.asarray(a_4, dtype=complex),
+                                   np.asarray(a_6, dtype=complex))
+    companion = np.zeros(a_4.shape + (3, 3), dtype=complex)
+    companion[..., 0, :] = np.stack([-0.25 * np.ones_like(a_4), -a_4, -a_6], axis=-1)
+    companion[..., 1, 0] = 1
+    companion[..., 2, 1] = 1
+    return np.linalg.eigvals(companion) + 1 / 12
+
+
+def periods(a_4, a_6):
+    """
+    Period lattice of the Tate model y^2 + xy = x^3 + a_4*x + a_6 over C.
+    
+    The periods of dX/Y on Y^2 = 4(X - e_1)(X - e_2)(X - e_3) are
+    pi/M(sqrt(e_1 - e_3), sqrt(e_1 - e_2)) and pi/M(sqrt(e_2 - e_3), sqrt(e_2 - e_1))
+    with the optimal AGM, where e_1 is the root farthest from the other two.
+    When two roots nearly coincide (the curve is numerically nodal) omega_1
+    stays accurate, while omega_2 inherits their cancellation.
+    
+    Args:
+        a_4, a_6: Real or complex scalars or arrays
+        
+    Returns:
+        tuple: (omega_1, omega_2) complex arrays generating the lattice
+    """
+    e = _two_torsion_roots(a_4, a_6)
+    # Put the most isolated root first so omega_1 avoids the closest pair
+    gaps = np.abs(e[..., :, None] - e[..., None, :]) + np.where(np.eye(3, dtype=bool), np.inf, 0)
+    first = gaps.min(axis=-1).argmax(axis=-1)
+    order = (first[..., None] + np.arange(3)) % 3
+    e = np.take_along_axis(e, order, axis=-1)
+    e_1, e_2, e_3 = e[..., 0], e[..., 1], e[..., 2]
+    omega_1 = np.pi / agm(np.sqrt(e_1 - e_3), np.sqrt(e_1 - e_2))
+    omega_2 = np.pi / agm(np.sqrt(e_2 - e_3), np.sqrt(e_2 - e_1))
+    return omega_1, omega_2
+
+
+def q_from_weierstrass(a_4, a_6):
+    """
+    Recover q from the Tate model coefficients (a_4, a_6) over R or C.
+    
+    The Tate model of E_q has period lattice 2 pi i (Z + tau Z) with
+    q = exp(2 pi i tau), so q itself (not just some parameter of an
+    isomorphic curve) is determined by the model. Over R only the real period
+    is needed: it is -log q for q > 0 (three real 2-torsion points) and
+    -2 log|q| for q < 0 (one real root e_1, where it is
+    2 pi / M(2 sqrt r, sqrt(2r + 3 e_1)) with r = |e_1 - e_2|), and it only
+    involves the isolated root, so it stays accurate even when the other two
+    roots nearly collide.
+    Over C, 2 pi i is located in the AGM lattice, the basis is completed by an
+    extended Euclid step, and q is read off from tau; when the second period
+    is swamped by cancellation, q is taken from the accurate one (a small
+    power of q is exp(-omega_1)), checked against the model.
+    Everything is vectorized over arrays of curves.
+    
+    For |q| close to 1 the map q -> (a_4, a_6) is badly conditioned and the
+    recovered q loses accuracy. Worse, Delta(q) is then below the rounding of
+    the coefficients, and E_q for q < 0 agrees with E_(q^2) to double
+    precision (about 1e-15 relative at q = -0.8, 2e-10 at q = -0.7): from
+    q ~ -0.77 down (and q ~ 0.6 up for the reverse mix-up) the sign of q can
+    no longer be read off the coefficients, and either parameter is returned.
+    
+    Args:
+        a_4, a_6: Real or complex scalars or arrays (e.g. from
+            TateCurve.weierstrass_coefficients or TateCurveFamily)
+            
+    Returns:
+        numpy.ndarray: q (real when a_4 and a_6 are real)
+    """
+    if not (np.iscomplexobj(a_4) or np.iscomplexobj(a_6)):
+        a_4, a_6 = np.broadcast_arrays(np.asarray(a_4, dtype=float),
+                                       np.asarray(a_6, dtype=float))
+        e = _two_torsion_roots(a_4, a_6)
+        scale = np.abs(e).max(axis=-1)
+        # Three real roots (Delta > 0, q > 0) or one (Delta < 0, q < 0)
+        split = (np.abs(e.imag) <= 1e-7 * scale[..., None]).all(axis=-1)
+        
+        # The isolated root: the largest when all are real, otherwise the real one
+        key = np.where(split[..., None], -e.real, np.abs(e.imag))
+        e = np.take_along_axis(e, np.argsort(key, axis=-1), axis=-1)
+        x_1 = e[..., 0].real - 1 / 12
+        # One Newton step on 4x^3 + x^2 + 4 a_4 x + 4 a_6 sharpens the isolated root
+        slope = 12 * x_1**2 + 2 * x_1 + 4 * a_4
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = (4 * x_1**3 + x_1**2 + 4 * a_4 * x_1 + 4 * a_6) / slope
+        x_1 = np.where(np.isfinite(step), x_1 - step, x_1)
+        e_1 = x_1 + 1 / 12
+        
+        # Split: omega = pi / M(sqrt(e_1 - e_3), sqrt(e_1 - e_2)) with e_1 > e_2 > e_3
+        e_2, e_3 = e[..., 1].real, e[..., 2].real
+        omega_split = (np.pi / agm(np.sqrt(np.abs(e_1 - e_3)),
+                                   np.sqrt(np.abs(e_1 - e_2)))).real
+        # Non-split: omega = 2 pi / M(2 sqrt r, sqrt(2r + 3 e_1)), where
+        # r^2 = |e_1 - e_2|^2 = |p'(x_1)| / 4 for p = 4x^3 + x^2 + 4 a_4 x + 4 a_6.
+        # With e_2 = -e_1/2 + iv, 2r + 3 e_1 = 4 v^2 / (2r - 3 e_1), which avoids
+        # the cancellation for e_1 < 0 (small |q|)
+        r = np.sqrt(np.abs(slope)) / 2
+        v = np.abs(e[..., 1].imag)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            second = np.where(e_1 >= 0, 2 * r + 3 * e_1, 4 * v**2 / (2 * r - 3 * e_1))
+        omega_nonsplit = (2 * np.pi / agm(2 * np.sqrt(r), np.sqrt(np.abs(second)))).real
+        return np.where(split, np.exp(-omega_split), -np.exp(-omega_nonsplit / 2))
+    
+    omega_1, omega_2 = periods(a_4, a_6)
+    
+    # Solve m omega_1 + n omega_2 = 2 pi i over the reals
+    determinant = omega_1.real * omega_2.imag - omega_1.imag * omega_2.real
+    m = (-omega_2.real * 2 * np.pi) / determinant
+    n = (omega_1.real * 2 * np.pi) / determinant
+    finite = np.isfinite(m) & np.isfinite(n)
+    m_int = np.rint(np.where(finite, m, 0)).astype(np.int64)
+    n_int = np.rint(np.where(finite, n, 0)).astype(np.int64)
+    found = finite & (np.abs(m - m_int) <= 1e-3) & (np.abs(n - n_int) <= 1e-3)
+    
+    # Complete (m, n) to a unimodular basis: m l - n k = 1
+    gcd, x, y = _extended_gcd(m_int, n_int)
+    found &= np.abs(gcd) == 1
+    k, l = -y * gcd, x * gcd
+    # Where n != 0, omega_2 = (2 pi i - m omega_1)/n keeps tau on the accurate omega_1
+    safe_n = np.where(n_int == 0, 1, n_int)
+    omega_2 = np.where(n_int == 0, omega_2, (2j * np.pi - m_int * omega_1) / safe_n)
+    tau = (k * omega_1 + l * omega_2) / (2j * np.pi)
+    tau = np.where(tau.imag < 0, -tau, tau)
+    
+    q = np.where(found, np.exp(2j * np.pi * tau), np.nan)
+    if found.all():
+        return q
+    
+    # Numerically nodal curves: omega_2 is unusable, but the accurate omega_1
+    # is the vanishing cycle 2 pi i (m + n tau), so q^n = exp(-omega_1) for a
+    # small n. Candidates whose models match (a_4, a_6) to working accuracy
+    # cannot be told apart; the one of smallest |q| is kept
+    lanes = np.flatnonzero(~found.ravel())
+    omega = omega_1.ravel()[lanes]
+    log_power = np.where(omega.real > 0, -omega, omega)[:, None]
+    roots = [(n, j) for n in range(1, 7) for j in range(n)]
+    n = np.array([n for n, _ in roots])
+    j = np.array([j for _, j in roots])
+    candidates = np.exp((log_power + 2j * np.pi * j) / n)
+    family = TateCurveFamily(q_values=candidates.ravel(), tolerance=1e-12,
+                             max_precision=100000)
+    b_4, b_6 = (c.reshape(candidates.shape) for c in family.weierstrass_coefficients())
+    a_4 = np.broadcast_to(a_4, q.shape).ravel()[lanes, None]
+    a_6 = np.broadcast_to(a_6, q.shape).ravel()[lanes, None]
+    mismatch = np.abs(b_4 - a_4) / np.abs(a_4) + np.abs(b_6 - a_6) / np.abs(a_6)
+    mismatch = np.where(np.isnan(mismatch), np.inf, mismatch)
+    matching = mismatch <= mismatch.min(axis=1, keepdims=True) + 1e-9
+    best = np.where(matching, np.abs(candidates), np.inf).argmin(axis=1)
+    q = q.ravel()
+    q[lanes] = candidates[np.arange(len(lanes)), best]
+    return q.reshape(found.shape)
+
+
+def _tate_discriminant(a_4, a_6):
+    """Discriminant of y^2 + xy = x^3 + a_4*x + a_6 (exact for Fractions)."""
+    # Delta = -b_2^2 b_8 - 8 b_4^3 - 27 b_6^2 + 9 b_2 b_4 b_6 with a_1 = 1
+    return -(a_6 - a_4**2) - 64 * a_4**3 - 432 * a_6**2 + 72 * a_4 * a_6
+
+
+def _extended_gcd(a, b):
+    """
+    Vectorized extended Euclid: (g, x, y) with a x + b y = g for int arrays.
+    
+    Returns:
+        tuple: Arrays g, x, y
+    """
+    old_r, r = a.copy(), b.copy()
+    old_s, s = np.ones_like(a), np.zeros_like(a)
+    old_t, t = np.zeros_like(a), np.ones_like(a)
+    while (r != 0).any():
+        active = r != 0
+        quotient = np.where(active, old_r // np.where(active, r, 1), 0)
+        old_r, r = np.where(active, r, old_r), np.where(active, old_r - quotient * r, r)
+        old_s, s = np.where(active, s, old_s), np.where(active, old_s - quotient * s, s)
+        old_t, t = np.where(active, t, old_t), np.where(active, old_t - quotient * t, t)
+    return old_r, old_s, old_t
+
+
+# Shared q-series coefficient tables, keyed by ('sigma', k, precision),
+# ('weierstrass', precision), ('j', precision) or ('q_of_j', precision), least
+# recently used first; at most SERIES_TABLE_CACHE_SIZE entries are kept
+SERIES_TABLE_CACHE_SIZE = 64
+_SERIES_TABLES = OrderedDict()
+
+
+def _series_table(key, build):
+    """
+    Look up a shared coefficient table, building and storing it on a miss.
+    
+    Tables are handed to every caller, so arrays are marked read-only and
+    sequences are stored as tuples.
+    
+    Args:
+        key: Cache key
+        build: Zero-argument function computing the table
+        
+    Returns:
+        The table (read-only array, tuple of read-only arrays, or tuple of ints)
+    """
+    if key in _SERIES_TABLES:
+        _SERIES_TABLES.move_to_end(key)
+        return _SERIES_TABLES[key]
+    
+    table = build()
+    if isinstance(table, np.ndarray):
+        table.setflags(write=False)
+    elif isinstance(table, tuple):
+        for part in table:
+            part.setflags(write=False)
+    else:
+        table = tuple(table)
+    _SERIES_TABLES[key] = table
+    while len(_SERIES_TABLES) > SERIES_TABLE_CACHE_SIZE:
+        _SERIES_TABLES.popitem(last=False)
+    return table
+
+
+def q_from_j(j, precision=30, newton_steps=30, tolerance=1e-15):
+    """
+    Solve j(q) = j for q over R or C, vectorized over arrays of j.
+    
+    For |j| > 2 * 1728 the reverted series q(1/j) (see q_from_j_coefficients)
+    converges geometrically and gives q directly; smaller |j| starts from
+    q ~ 1/(j - 744). Newton steps on f(q) = g(q) - j q, with g = q j(q) from
+    j_series_coefficients, then polish every entry. They are taken on f / f'
+    (Schroeder's variant), which keeps quadratic convergence next to the
+    triple root at j = 0 and the double root at j = 1728. The result is the root with
+    tau = log(q) / (2 pi i) in the standard fundamental domain, |q| <= exp(-pi sqrt 3).
+    For real j in (0, 1728) that root is not real; the one with Im q > 0 is returned.
+    
+    Args:
+        j: Real or complex scalar or array of j-invariants
+        precision: Series truncation precision for both tables
+        newton_steps: Maximum number of Newton steps
+        tolerance: Relative step size at which Newton stops
+        
+    Returns:
+        numpy.ndarray: q (real when j is real and every root is real)
+    """
+    j_array = np.asarray(j)
+    shape = j_array.shape
+    real_input = not np.iscomplexobj(j_array)
+    j_array = j_array.astype(complex).ravel()
+    
+    reverted = np.array(q_from_j_coefficients(precision), dtype=float)
+    g = np.array(j_series_coefficients(precision), dtype=float)
+    g_prime = g[1:] * np.arange(1, len(g))
+    g_second = g_prime[1:] * np.arange(1, len(g_prime))
+    
+    finite = np.isfinite(j_array)
+    safe_j = np.where(finite, j_array, 1)
+    large = np.abs(safe_j) > 2 * 1728
+    # Elsewhere q ~ 1/(j - 744), nudged off the real axis (so non-real roots can
+    # be reached) and capped at the size of the fundamental domain, except near
+    # the branch points: j ~ c (q - q_rho)^3 at q_rho = -exp(-pi sqrt 3) and
+    # j - 1728 ~ d (q - q_i)^2 at q_i = exp(-2 pi)
+    guess = 1 / (safe_j - 744 + 1j)
+    guess *= np.minimum(1, 0.003 / np.abs(guess))
+    q_rho, q_i = -np.exp(-np.pi * np.sqrt(3)), np.exp(-2 * np.pi)
+    g_third = g_second[1:] * np.arange(1, len(g_second))
+    c = _horner(g_third, q_rho) / (6 * q_rho)
+    d = _horner(g_second, q_i) / (2 * q_i)
+    guess = np.where(np.abs(safe_j) < 400, q_rho + (safe_j / c + 0j)**(1 / 3), guess)
+    guess = np.where(np.abs(safe_j - 1728) < 400, q_i + np.sqrt((safe_j - 1728) / d + 0j),
+                     guess)
+    q = np.where(large, _horner(reverted, 1 / np.where(large, safe_j, 1)), guess)
+    
+    active = np.flatnonzero(finite)
+    for _ in range(newton_steps):
+        if active.size == 0:
+            break
+        q_active, j_active = q[active], safe_j[active]
+        f = _horner(g, q_active) - j_active * q_active
+        f_prime = _horner(g_prime, q_active) - j_active
+        f_second = _horner(g_second, q_active)
+        # Newton on f / f': stays quadratic near the multiple roots at j = 0, 1728
+        step = f * f_prime / (f_prime**2 - f * f_second)
+        step = np.where(np.isfinite(step), step, 0)
+        # Damp steps that would leave the disc where the truncated series is reliable
+        step *= np.minimum(1, np.maximum(0.006 - np.abs(q_active), 0.001) / np.maximum(np.abs(step), 1e-300))
+        q[active] = q_active - step
+        active = active[np.abs(step) > tolerance * np.abs(q[active])]
+    
+    # Move roots found outside the fundamental domain into it (j is SL_2(Z)-invariant);
+    # the domain is not a disc in q, so e.g. real q in (exp(-2 pi), exp(-pi sqrt 3))
+    # has |q| small enough but |tau| < 1
+    nonzero = np.flatnonzero(finite & (q != 0))
+    tau = np.log(q[nonzero]) / (2j * np.pi)
+    reduced = _reduce_to_fundamental_domain(tau)
+    moved = np.abs(reduced - tau) > 1e-9
+    q[nonzero[moved]] = np.exp(2j * np.pi * reduced[moved])
+    # The other root of a conjugate pair lies in the domain too; pick Im q >= 0
+    q = np.where(finite & (j_array.imag == 0) & (q.imag < 0), q.conj(), q)
+    q = np.where(finite, q, 0)
+    
+    if real_input and (np.abs(q.imag) <= 1e-12 * np.abs(q)).all():
+        q = q.real
+    return q.reshape(shape)
+
+
+def _reduce_to_fundamental_domain(tau, max_iterations=100):
+    """
+    Map points of the upper half plane into the standard fundamental domain
+    |Re tau| <= 1/2, |tau| >= 1 by the translations and the inversion tau -> -1/tau.
+    
+    Args:
+        tau: Complex array with Im tau > 0
+        max_iterations: Bound on the number of inversions
+        
+    Returns:
+        numpy.ndarray: Equivalent points in the fundamental domain
+    """
+    tau = np.array(tau, dtype=complex)
+    for _ in range(max_iterations):
+        tau = tau - np.round(tau.real)
+        inside = np.abs(tau) < 1 - 1e-12
+        if not inside.any():
+            break
+        tau[inside] = -1 / tau[inside]
+    return tau
+
+
+def _integer_table(precision, magnitude):
+    """Zero array of length precision + 1, int64 if magnitude fits, else Python ints."""
+    if magnitude < (1 << 62):
+        return np.zeros(precision + 1, dtype=np.int64)
+    return np.array([0] * (precision + 1), dtype=object)
+
+
+def sigma_table(k, precision):
+    """
+    Divisor sums sigma_k(n) = sum of d^k over d | n, for 0 <= n <= precision.
+    
+    Built with a sieve (each d adds d^k to its multiples) in O(N log N) and
+    shared across all callers.
+    
+    Args:
+        k: Power of the divisors
+        precision: Largest n in the table
+        
+    Returns:
+        numpy.ndarray: Read-only table with sigma_k(0) = 0
+    """
+    def build():
+        # sigma_k(n) < zeta(k) n^k < 2 n^k for k >= 2
+        table = _integer_table(precision, 8 * precision**k)
+        for d in range(1, precision + 1):
+            table[d::d] += d**k
+        return table
+    
+    return _series_table(('sigma', k, precision), build)
+
+
+def weierstrass_series_coefficients(precision):
+    """
+    Integer power-series coefficients of a_4(q) and a_6(q) up to q^precision.
+    
+    Expanding q^n / (1 - q^n) as a geometric series turns the Lambert series
+    into ordinary power series:
+    
+        a_4(q) = -5 * sum sigma_3(m) q^m
+        a_6(q) = -sum (5 sigma_3(m) + 7 sigma_5(m)) / 12 * q^m
+    
+    (5 sigma_3 + 7 sigma_5 is always divisible by 12.) Truncating at q^precision
+    matches the term-by-term sum to O(q^(precision + 1)).
+    
+    Args:
+        precision: Series truncation precision
+        
+    Returns:
+        tuple: Read-only (a_4 coefficients, a_6 coefficients), index m holds
+        the q^m term
+    """
+    def build():
+        sigma_3 = sigma_table(3, precision)
+        sigma_5 = sigma_table(5, precision)
+        return -5 * sigma_3, -((5 * sigma_3 + 7 * sigma_5) // 12)
+    
+    return _series_table(('weierstrass', precision), build)
+
+
+def _truncated_product(a, b, length):
+    """First length coefficients of the product of two power series (lists of ints)."""
+    result = [0] * length
+    for i, a_i in enumerate(a[:length]):
+        if a_i:
+            for k, b_k in enumerate(b[:length - i]):
+                result[i + k] += a_i * b_k
+    return result
+
+
+def j_series_coefficients(precision):
+    """
+    Integer coefficients of q * j(q) = 1 + 744 q + 196884 q^2 + ... up to q^precision.
+    
+    Uses j = E_4^3 / Delta with 1728 Delta = E_4^3 - E_6^2, where
+    E_4 = 1 + 240 sum sigma_3(m) q^m and E_6 = 1 - 504 sum sigma_5(m) q^m;
+    Delta / q has constant term 1, so the division is exact over Z.
+    
+    Args:
+        precision: Series truncation precision
+        
+    Returns:
+        tuple: Python ints, index m holds the q^m term of q * j(q)
+    """
+    def build():
+        length = precision + 2
+        sigma_3 = sigma_table(3, length)
+        sigma_5 = sigma_table(5, length)
+        e_4 = [1] + [240 * int(s) for s in sigma_3[1:length]]
+        e_6 = [1] + [-504 * int(s) for s in sigma_5[1:length]]
+        e_4_cubed = _truncated_product(_truncated_product(e_4, e_4, length), e_4, length)
+        e_6_squared = _truncated_product(e_6, e_6, length)
+        # Delta / q, dropping the zero constant term of Delta
+        delta = [(x - y) // 1728 for x, y in zip(e_4_cubed[1:], e_6_squared[1:])]
+        # Long division E_4^3 / (Delta / q)
+        quotient = []
+        for m in range(precision + 1):
+            quotient.append(e_4_cubed[m] - sum(quotient[i] * delta[m - i] for i in range(m)))
+        return quotient
+    
+    return _series_table(('j', precision), build)
+
+
+def q_from_j_coefficients(precision):
+    """
+    Integer coefficients of the reverted series q = t + 744 t^2 + 750420 t^3 + ...
+    in t = 1/j, up to t^precision.
+    
+    With g(q) = q * j(q) we have t = q / g(q), so Lagrange inversion gives
+    [t^n] q = [q^(n-1)] g(q)^n / n. The table is built once per precision, after
+    which converting any number of j values is a polynomial evaluation.
+    
+    Args:
+        precision: Series truncation precision
+        
+    Returns:
+        tuple: Python ints, index n holds the t^n term (index 0 is 0)
+    """
+    def build():
+        g = j_series_coefficients(precision)
+        coefficients = [0]
+        power = list(g)
+        for n in range(1, precision + 1):
+            coefficients.append(power[n - 1] // n)
+            power = _truncated_product(power, g, precision)
+        return coefficients
+    
+    return _series_table(('q_of_j', precision), build)
+
+
+def _series_prefix(terms):
+    """
+    Coefficient tables truncated after q^terms.
+    
+    Tables are built at the next power of two and sliced, so curves with many
+    different term counts share a handful of tables.
+    
+    Args:
+        terms: Number of series terms
+        
+    Returns:
+        tuple: (a_4 coefficients, a_6 coefficients) of length terms + 1
+    """
+    size = 1 << max(int(terms), 1).bit_length()
+    a_4_coeffs, a_6_coeffs = weierstrass_series_coefficients(size)
+    return a_4_coeffs[:terms + 1], a_6_coeffs[:terms + 1]
+
+
+def _horner_ragged(coefficients, q, terms):
+    """
+    Horner evaluation where entry i keeps only the terms up to q^terms[i].
+    
+    Entries are sorted by term count, so at degree m only the prefix of
+    entries with terms >= m is updated and the total work is sum(terms).
+    
+    Args:
+        coefficients: Coefficient table covering max(terms)
+        q: Array of evaluation points
+        terms: Array of per-entry truncation degrees
+        
+    Returns:
+        numpy.ndarray: Polynomial values
+    """
+    order = np.argsort(-terms, kind='stable')
+    q_sorted = q[order]
+    descending = -terms[order]
+    
+    result = np.zeros(len(q), dtype=np.result_type(q, float))
+    for m in range(int(terms.max()), -1, -1):
+        k = np.searchsorted(descending, -m, side='right')
+        result[:k] = result[:k] * q_sorted[:k] + coefficients[m]
+    
+    values = np.empty_like(result)
+    values[order] = result
+    return values
+
+
+# Upper bounds for zeta(3) and zeta(5); sigma_k(m) <= zeta(k) m^k
+_ZETA_3 = 1.2020569031595946
+_ZETA_5 = 1.0369277551433701
+
+
+def truncation_error_bound(q_abs, terms):
+    """
+    Certified bounds on the tails of the a_4 and a_6 series.
+    
+    With r = |q| and M = terms + 1, sigma_k(m) <= zeta(k) m^k and the ratio of
+    consecutive terms m^k r^m is at most rho = (1 + 1/M)^k r for m >= M, so
+    
+        sum_{m >= M} sigma_k(m) r^m <= zeta(k) M^k r^M / (1 - rho)
+    
+    whenever rho < 1 (otherwise the bound is inf).
+    
+    Args:
+        q_abs: |q| (scalar or array)
+        terms: Number of series terms kept (scalar or array)
+        
+    Returns:
+        tuple: (bound for a_4, bound for a_6)
+    """
+    r = np.asarray(q_abs, dtype=float)
+    M = np.asarray(terms, dtype=float) + 1
+    
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        head = r**M
+        rho_3 = (1 + 1 / M)**3 * r
+        rho_5 = (1 + 1 / M)**5 * r
+        tail_3 = np.where(rho_3 < 1, _ZETA_3 * M**3 * head / (1 - rho_3), np.inf)
+        tail_5 = np.where(rho_5 < 1, _ZETA_5 * M**5 * head / (1 - rho_5), np.inf)
+    
+    return 5 * tail_3, (5 * tail_3 + 7 * tail_5) / 12
+
+
+def terms_for_tolerance(q_abs, tolerance, max_terms=10000):
+    """
+    Smallest number of series terms whose tail bound is within tolerance.
+    
+    Candidate term counts are scanned in geometrically growing blocks and
+    curves drop out as soon as they are resolved, so small |q| costs almost
+    nothing.
+    
+    Args:
+        q_abs: |q| (scalar or array)
+        tolerance: Target bound on both a_4 and a_6 truncation errors
+        max_terms: Largest number of terms to consider
+        
+    Returns:
+        numpy.ndarray: Terms per entry (-1 if max_terms is not enough)
+    """
+    r = np.atleast_1d(np.asarray(q_abs, dtype=float))
+    result = np.full(r.shape, -1)
+    active = np.flatnonzero(r < 1)
+    
+    start, block = 1, 16
+    while active.size and start <= max_terms:
+        candidates = np.arange(start, min(start + block, max_terms + 1))
+        bound_4, bound_6 = truncation_error_bound(r[active, None], candidates[None, :])
+        ok = np.maximum(bound_4, bound_6) <= tolerance
+        found = ok.any(axis=1)
+        result[active[found]] = candidates[ok[found].argmax(axis=1)]
+        active = active[~found]
+        start += block
+        block *= 2
+    
+    return result
+
+
+def _horner(coefficients, q):
+    """
+    Evaluate sum coefficients[m] * q^m by Horner's rule.
+    
+    Works for any q supporting + and * with Python ints (floats, PAdic
+    numbers, NumPy arrays of q values); Fractions go through
+    _horner_rational().
+    
+    Args:
+        coefficients: Coefficient array, index m holds the q^m term
+        q: Evaluation point
+        
+    Returns:
+        Value of the polynomial at q
+    """
+    if isinstance(q, Fraction):
+        return _horner_rational(coefficients, q)
+    # Zero of the same type (and, for PAdic, precision) as q
+    result = q - q
+    for c in reversed(coefficients.tolist()):
+        result = result * q + c
+    return result
+
+
+def _horner_rational(coefficients, q):
+    """
+    Exact evaluation at a rational q = a/b over a common denominator.
+    
+    Computes the integer sum c_m a^m b^(N - m) and divides by b^N once, so the
+    work runs on Python ints and only the final Fraction is reduced (Horner
+    directly on Fractions takes a gcd at every step). The sum is built by
+    binary splitting (see _rational_split()), so the big products are
+    balanced and use CPython's Karatsuba multiplication.
+    
+    The value itself has about N * log2(max(|a|, b)) bits, which sets the
+    cost: it grows faster than linearly in N, while the float pass is linear,
+    so the gap widens with the number of terms. Measured against the float
+    Horner pass on the same table (N = 400 / 1600 / 6400 terms):
+        q = 1/3:            4x / 5x / 10x
+        q = 1/125:          7x / 10x / 23x
+        q = 12345/67891:   15x / 46x / 92x
+    Exact mode is meant for moderate N; use a float or PAdic q for long series.
+    
+    Args:
+        coefficients: Integer coefficient array, index m holds the q^m term
+        q: int or Fraction
+        
+    Returns:
+        Fraction: Value of the polynomial at q
+    """
+    q = Fraction(q)
+    result, _, denominator_power = _rational_split(coefficients.tolist(), q.numerator,
+                                                   q.denominator)
+    # denominator_power is b^(N + 1)
+    return Fraction(result, denominator_power // q.denominator)
+
+
+def _rational_split(coefficients, a, b):
+    """
+    Binary-splitting core of _horner_rational().
+    
+    Args:
+        coefficients: List of n integer coefficients c_0, ..., c_(n-1)
+        a, b: Numerator and denominator of q
+        
+    Returns:
+        tuple: (sum c_m a^m b^(n - 1 - m), a^n, b^n)
+    """
+    n = len(coefficients)
+    if n <= 32:
+        result = 0
+        denominator_power = 1
+        for c in reversed(coefficients):
+            result = result * a + c * denominator_power
+            denominator_power *= b
+        return result, a**n, denominator_power
+    
+    half = n // 2
+    low, a_low, b_low = _rational_split(coefficients[:half], a, b)
+    high, a_high, b_high = _rational_split(coefficients[half:], a, b)
+    return low * b_high + a_low * high, a_low * a_high, b_low * b_high
+
+
+# Headless figures reused by render_curve() and render_grid(), keyed by layout,
+# least recently used first; at most AGG_FIGURE_CACHE_SIZE are kept. They are
+# only drawn on and saved, never returned to callers.
+AGG_FIGURE_CACHE_SIZE = 4
+_AGG_FIGURES = OrderedDict()
+
+
+def _fitted_y_range(rhs):
+    """Symmetric y-range with a margin around the largest sqrt(rhs) over the x-grid."""
+    top = math.sqrt(max(float(np.max(rhs)), 0.0))
+    top = 1.1 * top if top > 0 else 1.0
+    return (-top, top)
+
+
+def _agg_figure(shape, figsize):
+    """
+    Cached headless (Agg) figure with a grid of axes, cleared for reuse.
+    
+    Args:
+        shape: (rows, columns) of axes
+        figsize: Figure size in inches
+        
+    Returns:
+        tuple: (figure, 2-D array of axes)
+    """
+    key = (shape, tuple(figsize))
+    if key in _AGG_FIGURES:
+        _AGG_FIGURES.move_to_end(key)
+    else:
+        figure = Figure(figsize=figsize, layout='constrained')
+        FigureCanvasAgg(figure)
+        _AGG_FIGURES[key] = (figure, figure.subplots(*shape, squeeze=False))
+        while len(_AGG_FIGURES) > AGG_FIGURE_CACHE_SIZE:
+            _AGG_FIGURES.popitem(last=False)
+    figure, axes = _AGG_FIGURES[key]
+    for ax in axes.flat:
+        ax.clear()
+        ax.set_axis_on()
+    return figure, axes
+
+
+def _is_exact_number(value):
+    """Whether value is an exact scalar (int, Fraction or PAdic), not a float or array."""
+    return isinstance(value, (int, Fraction, PAdic))
+
+
+def _format_number(value):
+    """Format a coefficient: six decimals for numbers, str() for PAdic."""
+    if isinstance(value, PAdic):
+        return str(value)
+    if isinstance(value, Fraction):
+        value = float(value)
+    return f"{value:.6f}"
+
+
+def _is_infinity(P):
+    """Whether P is the point at infinity (inf, inf)."""
+    return isinstance(P[0], float) and math.isinf(P[0])
+
+
+def _coordinates_equal(a, b):
+    """Equality of coordinates: p-adic equality, or closeness for floats."""
+    if isinstance(a, PAdic) or isinstance(b, PAdic):
+        return a == b
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def _split_p_power(n, p):
+    """
+    Write a non-zero integer as p^k * m with p not dividing m.
+    
+    Returns:
+        tuple: (k, m)
+    """
+    k = 0
+    while n % p == 0:
+        n //= p
+        k += 1
+    return k, n
+
+
+def _fraction_valuation(x, p):
+    """p-adic valuation of a non-zero rational number."""
+    x = Fraction(x)
+    return _split_p_power(x.numerator, p)[0] - _split_p_power(x.denominator, p)[0]
+
+
+def _sqrt_mod_prime(a, p):
+    """
+    Square root of a modulo an odd prime p (Tonelli-Shanks).
+    
+    Returns:
+        int or None: A root, or None if a is not a quadratic residue
+    """
+    a %= p
+    if a == 0:
+        return 0
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    
+    # p - 1 = s * 2^e with s odd; z is any non-residue
+    s, e = p - 1, 0
+    while s % 2 == 0:
+        s //= 2
+        e += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    
+    x = pow(a, (s + 1) // 2, p)
+    b = pow(a, s, p)
+    g = pow(z, s, p)
+    r = e
+    while b != 1:
+        m, t = 0, b
+        while t != 1:
+            t = t * t % p
+            m += 1
+        gs = pow(g, 1 << (r - m - 1), p)
+        x = x * gs % p
+        g = gs * gs % p
+        b = b * g % p
+        r = m
+    return x
+
+
+def batch_inverse(values, modulus=None):
+    """
+    Invert many values at once with Montgomery's trick.
+    
+    A product tree is built over the inputs, only its root is inverted, and the
+    individual inverses are recovered on the way back down, so N inverses cost
+    one inversion plus about 3N multiplications (all vectorized per tree level).
+    For floats the tree keeps mantissas and binary exponents apart so the
+    running products cannot overflow or underflow.
+    
+    Args:
+        values: 1-D array-like of numbers
+        modulus: If given, invert integers modulo this number instead
+        
+    Returns:
+        numpy.ndarray: Inverses (inf for zero floats)
+    """
+    if modulus is not None:
+        values = np.asarray(values) % modulus
+        if (values == 0).any():
+            raise ZeroDivisionError("batch_inverse: zero is not invertible")
+        
+        def multiply(a, b):
+            return a * b % modulus
+        
+        def invert(a):
+            return np.array([pow(int(a[0]), -1, modulus)], dtype=a.dtype)
+        
+        one = np.ones(1, dtype=values.dtype)
+        return _product_tree_inverse(values, multiply, invert, one)
+    
+    values = np.asarray(values, dtype=float)
+    zero = values == 0
+    mantissa, exponent = np.frexp(np.where(zero, 1.0, values))
+    
+    def multiply(a, b):
+        m, e = np.frexp(a[0] * b[0])
+        return m, e + a[1] + b[1]
+    
+    def invert(a):
+        m, e = np.frexp(1.0 / a[0])
+        return m, e - a[1]
+    
+    one = (np.ones(1), np.zeros(1, dtype=int))
+    m, e = _product_tree_inverse((mantissa, exponent), multiply, invert, one)
+    result = np.ldexp(m, e)
+    result[zero] = np.inf
+    return result
+
+
+def _product_tree_inverse(values, multiply, invert, one):
+    """
+    Montgomery batch inversion over a product tree.
+    
+    Args:
+        values: Array (or tuple of parallel arrays) of elements
+        multiply: Elementwise product of two such arrays
+        invert: Inverse of a length-1 array
+        one: Length-1 array holding the multiplicative identity
+        
+    Returns:
+        Inverses in the same representation as values
+    """
+    def take(a, index):
+        return tuple(c[index] for c in a) if isinstance(a, tuple) else a[index]
+    
+    def concat(a, b):
+        if isinstance(a, tuple):
+            return tuple(np.concatenate((x, y)) for x, y in zip(a, b))
+        return np.concatenate((a, b))
+    
+    def length(a):
+        return len(a[0]) if isinstance(a, tuple) else len(a)
+    
+    n = length(values)
+    if n == 0:
+        return values
+    
+    # Build the tree bottom-up, padding odd levels with the identity
+    levels = [values]
+    while length(levels[-1]) > 1:
+        level = levels[-1]
+        if length(level) % 2:
+            level = concat(level, one)
+            levels[-1] = level
+        levels.append(multiply(take(level, slice(0, None, 2)),
+                               take(level, slice(1, None, 2))))
+    
+    # Invert the root, then push inverses down: inv(left) = inv(parent) * right
+    inverse = invert(levels[-1])
+    for level in reversed(levels[:-1]):
+        inverse = take(inverse, slice(0, length(level) // 2))
+        left = multiply(inverse, take(level, slice(1, None, 2)))
+        right = multiply(inverse, take(level, slice(0, None, 2)))
+        m = length(left)
+        order = np.empty(2 * m, dtype=int)
+        order[0::2] = np.arange(m)
+        order[1::2] = np.arange(m, 2 * m)
+        inverse = take(concat(left, right), order)
+    
+    return take(inverse, slice(0, n))
+
+
+def _negate_homogeneous(P):
+    """Negate projective or Jacobian points by flipping Y."""
+    result = np.array(P, dtype=float, copy=True)
+    result[:, 1] = -result[:, 1]
+    return result
+
+
+def _rescale_homogeneous(P, weights):
+    """
+    Rescale homogeneous points by exact powers of two.
+    
+    (X, Y, Z) and (l^wx X, l^wy Y, l^wz Z) are the same point, so choosing
+    l = 2^-e keeps the coordinates near unit size over long division-free
+    chains without introducing any rounding error.
+    
+    Args:
+        P: Array of shape (N, 3)
+        weights: Coordinate weights (1, 1, 1) for projective, (2, 3, 1) for Jacobian
+        
+    Returns:
+        numpy.ndarray: Rescaled points
+    """
+    Z = P[:, 2]
+    _, e = np.frexp(Z)
+    e = np.where(np.isfinite(Z), e, 0)
+    wx, wy, wz = weights
+    return np.column_stack((np.ldexp(P[:, 0], -wx * e),
+                            np.ldexp(P[:, 1], -wy * e),
+                            np.ldexp(Z, -wz * e)))
+
+
+def _as_scalar_array(k):
+    """
+    Convert scalars to a 1-D integer array.
+    
+    Scalars that fit in int64 (with headroom for NAF recoding) use a native
+    dtype; larger ones fall back to an object array of Python ints.
+    
+    Args:
+        k: Integer or array-like of integers
+        
+    Returns:
+        numpy.ndarray: 1-D array of scalars
+    """
+    values = [int(v) for v in np.ravel(np.asarray(k, dtype=object))]
+    if all(abs(v) < (1 << 60) for v in values):
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=object)
+
+
+def _binary_digits(k):
+    """
+    Binary expansion of non-negative scalars.
+    
+    Args:
+        k: 1-D array of non-negative integers
+        
+    Returns:
+        numpy.ndarray: (N, L) array of bits, most significant first
+    """
+    k = k.copy()
+    digits = []
+    while (k > 0).any():
+        digits.append((k & 1).astype(np.int8))
+        k = k >> 1
+    if not digits:
+        return np.zeros((len(k), 0), dtype=np.int8)
+    return np.stack(digits[::-1], axis=1)
+
+
+def _naf_digits(k, width):
+    """
+    Width-w non-adjacent form of non-negative scalars.
+    
+    Each non-zero digit is odd with |d| < 2^(w-1), and any w consecutive
+    digits contain at most one non-zero entry.
+    
+    Args:
+        k: 1-D array of non-negative integers
+        width: Window width w >= 2
+        
+    Returns:
+        numpy.ndarray: (N, L) array of signed digits, most significant first
+    """
+    modulus = 1 << width
+    half = 1 << (width - 1)
+    k = k.copy()
+    digits = []
+    while (k > 0).any():
+        d = k & (modulus - 1)
+        d = np.where(d >= half, d - modulus, d)
+        d = np.where((k & 1) == 1, d, 0)
+        k = (k - d) >> 1
+        digits.append(d.astype(np.int64))
+    if not digits:
+        return np.zeros((len(k), 0), dtype=np.int64)
+    return np.stack(digits[::-1], axis=1)
 
 
 def demonstrate_tate_curve():
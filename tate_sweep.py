@@ -0,0 +1,176 @@
+"""
+Multiprocess sweep of Tate curve statistics over many primes.
+
+Computes p-adic valuations (and optionally point-count statistics) of the
+Tate curves E_q with q = p^k for many primes p in a process pool, writing
+the columns chunk by chunk to one .npz archive.
+
+Usage (from the repository root):
+    python tate_sweep.py sweep.npz --primes 10000 --exponents 1 2 3 --workers 8
+"""
+
+import argparse
+import multiprocessing
+import zipfile
+from fractions import Fraction
+
+import numpy as np
+from sympy import primerange
+
+from p_adic_teichmuller import (_fraction_valuation, _horner, _series_prefix,
+                                _tate_discriminant, tate_model_point_counts)
+
+
+SWEEP_COLUMNS = ('p', 'q_exponent', 'a_4_valuation', 'a_6_valuation',
+                 'discriminant_valuation', 'j_valuation')
+POINT_COUNT_COLUMNS = ('good_primes', 'trace_mean', 'sato_tate_moment')
+
+
+def _sweep_chunk(task):
+    """
+    Compute the sweep columns for one chunk of (p, k) pairs (runs in a worker).
+    
+    Each curve is the integral Tate model of E_q at q = p^k, truncated after
+    q^precision. It is congruent to E_q modulo p^(k (precision + 1)), so its
+    valuations are those of the Tate curve: v_p(discriminant) = k and
+    v_p(j) = -k.
+    
+    Args:
+        task: (pairs, precision, point_count_bound) with pairs a list of (p, k)
+        
+    Returns:
+        dict: Column name -> NumPy array over the chunk
+    """
+    pairs, precision, point_count_bound = task
+    a_4_coeffs, a_6_coeffs = _series_prefix(precision)
+    columns = {name: [] for name in SWEEP_COLUMNS}
+    if point_count_bound is not None:
+        columns.update({name: [] for name in POINT_COUNT_COLUMNS})
+    
+    for p, k in pairs:
+        q = p**k
+        a_4, a_6 = _horner(a_4_coeffs, q), _horner(a_6_coeffs, q)
+        delta = _tate_discriminant(a_4, a_6)
+        j = Fraction((1 - 48 * a_4)**3, delta)
+        row = {'p': p, 'q_exponent': k,
+               'a_4_valuation': _fraction_valuation(a_4, p),
+               'a_6_valuation': _fraction_valuation(a_6, p),
+               'discriminant_valuation': _fraction_valuation(delta, p),
+               'j_valuation': _fraction_valuation(j, p)}
+        if point_count_bound is not None:
+            counts = tate_model_point_counts(a_4, a_6, delta, point_count_bound)
+            primes, traces = counts['primes'], counts['traces']
+            row['good_primes'] = len(primes)
+            row['trace_mean'] = traces.mean() if len(primes) else np.nan
+            # Second moment of a_l / (2 sqrt l); 1/4 under Sato-Tate
+            row['sato_tate_moment'] = (np.mean(traces**2 / (4.0 * primes))
+                                       if len(primes) else np.nan)
+        for name, value in row.items():
+            columns[name].append(value)
+    
+    float_columns = ('trace_mean', 'sato_tate_moment')
+    return {name: np.array(values, dtype=float if name in float_columns else np.int64)
+            for name, values in columns.items()}
+
+
+def sweep_tate_curves(primes, path, q_exponents=(1, 2, 3), precision=10,
+                      point_count_bound=None, chunk_size=64, workers=None):
+    """
+    Sweep the Tate curves E_q with q = p^k over many primes in a process pool.
+    
+    The (p, k) pairs are cut into chunks of chunk_size and handed to the pool
+    with an ordered imap, so chunks are written in input order as soon as they
+    (and all earlier ones) finish, and the file is the same for any number of
+    workers. Each chunk is stored in a single .npz archive as one array per
+    column under "<column>/<chunk index>"; load_sweep() concatenates them.
+    
+    Columns: p, q_exponent (k) and the p-adic valuations a_4_valuation,
+    a_6_valuation, discriminant_valuation (= k) and j_valuation (= -k) of the
+    integral truncated Tate model. With point_count_bound, also good_primes,
+    trace_mean and sato_tate_moment (mean of (a_l / 2 sqrt l)^2) of that
+    model over the good primes l <= point_count_bound.
+    
+    Args:
+        primes: Iterable of primes p
+        path: Output .npz file
+        q_exponents: Exponents k >= 1; each prime is paired with every q = p^k
+        precision: Series truncation precision
+        point_count_bound: If given, add point-count statistics up to this bound
+        chunk_size: Number of curves per chunk
+        workers: Number of worker processes (default: os.cpu_count(); 1 runs in
+            this process)
+            
+    Returns:
+        int: Number of curves written
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    pairs = [(int(p), int(k)) for p in primes for k in q_exponents]
+    if any(k < 1 for _, k in pairs):
+        raise ValueError("q_exponents must be positive so that |q|_p < 1")
+    tasks = [(pairs[start:start + chunk_size], precision, point_count_bound)
+             for start in range(0, len(pairs), chunk_size)]
+    
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        def write(index, columns):
+            for name, values in columns.items():
+                with archive.open(f"{name}/{index:06d}.npy", 'w') as member:
+                    np.lib.format.write_array(member, values)
+        
+        if workers == 1:
+            for index, task in enumerate(tasks):
+                write(index, _sweep_chunk(task))
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                for index, columns in enumerate(pool.imap(_sweep_chunk, tasks)):
+                    write(index, columns)
+    
+    return len(pairs)
+
+
+def load_sweep(path):
+    """
+    Load the columns written by sweep_tate_curves().
+    
+    Args:
+        path: .npz file written by sweep_tate_curves()
+        
+    Returns:
+        dict: Column name -> NumPy array over all curves, in sweep order
+    """
+    chunks = {}
+    with np.load(path) as archive:
+        for key in sorted(archive.files):
+            name, _ = key.split('/')
+            chunks.setdefault(name, []).append(archive[key])
+    return {name: np.concatenate(parts) for name, parts in chunks.items()}
+
+
+def main(argv=None):
+    """Command-line entry point: sweep all primes below a bound into an .npz file."""
+    parser = argparse.ArgumentParser(
+        description="Sweep the Tate curves E_q with q = p^k over primes p.")
+    parser.add_argument('path', help="output .npz file")
+    parser.add_argument('--primes', type=int, default=1000,
+                        help="sweep the primes below this bound (default: 1000)")
+    parser.add_argument('--exponents', type=int, nargs='+', default=[1, 2, 3],
+                        help="exponents k of q = p^k (default: 1 2 3)")
+    parser.add_argument('--precision', type=int, default=10,
+                        help="series truncation precision (default: 10)")
+    parser.add_argument('--point-count-bound', type=int, default=None,
+                        help="add point-count statistics over primes up to this bound")
+    parser.add_argument('--chunk-size', type=int, default=64,
+                        help="curves per chunk (default: 64)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: all CPUs)")
+    args = parser.parse_args(argv)
+    
+    count = sweep_tate_curves(primerange(2, args.primes), args.path,
+                              q_exponents=args.exponents, precision=args.precision,
+                              point_count_bound=args.point_count_bound,
+                              chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Wrote {count} curves to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import random
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from anabelian_geometry import (BelyiMap, compose_many, conjugate_many, cycle_counts_many,
+                                cycle_type_from_counts, invert_many, permutation_array,
+                                permutation_ranks, permutation_tuples, symmetric_group_array)
+
+
+def _compose(sigma, tau):
+    return tuple(sigma[t - 1] for t in tau)
+
+
+def _conjugate(sigma, tau):
+    result = [0] * len(sigma)
+    for i in range(len(sigma)):
+        result[tau[i] - 1] = tau[sigma[i] - 1]
+    return tuple(result)
+
+
+def _brute_force_triples(degree):
+    """All (σ₀, σ₁, σ∞) with σ₀σ₁σ∞ = 1, by searching σ∞ as the original code did."""
+    S_n = list(permutations(range(1, degree + 1)))
+    identity = tuple(range(1, degree + 1))
+    return [(a, b, c) for a in S_n for b in S_n for c in S_n
+            if _compose(_compose(a, b), c) == identity]
+
+
+def _cycle_type(sigma):
+    seen, lengths = set(), []
+    for i in range(1, len(sigma) + 1):
+        length = 0
+        while i not in seen:
+            seen.add(i)
+            i = sigma[i - 1]
+            length += 1
+        if length:
+            lengths.append(length)
+    return tuple(sorted(lengths, reverse=True))
+
+
+def _transitive(sigma_0, sigma_1):
+    reached, queue = {1}, [1]
+    for i in queue:
+        for j in (sigma_0[i - 1], sigma_1[i - 1]):
+            if j not in reached:
+                reached.add(j)
+                queue.append(j)
+    return len(reached) == len(sigma_0)
+
+
+def _genus(triple):
+    cycles = sum(len(_cycle_type(sigma)) for sigma in triple)
+    return (len(triple[0]) + 2 - cycles) // 2
+
+
+def _orbit(pair):
+    S_n = permutations(range(1, len(pair[0]) + 1))
+    return frozenset((_conjugate(pair[0], tau), _conjugate(pair[1], tau)) for tau in S_n)
+
+
+@pytest.fixture
+def belyi():
+    return BelyiMap()
+
+
+@pytest.mark.parametrize("degree", [2, 3, 4])
+def test_monodromy_triples_match_brute_force(belyi, degree):
+    assert belyi.monodromy_group(degree) == _brute_force_triples(degree)
+
+
+@pytest.mark.parametrize("degree", [2, 3, 4])
+def test_representatives_hit_every_conjugacy_class_once(belyi, degree):
+    orbits = {_orbit(triple[:2]) for triple in _brute_force_triples(degree)}
+    representatives = belyi.monodromy_representatives(degree)
+    assert len(representatives) == len(orbits)
+    assert {_orbit(triple[:2]) for triple in representatives} == orbits
+    for sigma_0, sigma_1, sigma_inf in representatives:
+        assert _compose(_compose(sigma_0, sigma_1), sigma_inf) == tuple(range(1, degree + 1))
+
+
+def test_iterator_resumes_from_any_cursor(belyi):
+    full = list(belyi.iter_monodromy_triples(3))
+    assert [triple for _, triple in full] == belyi.monodromy_group(3)
+    for stop in (0, 1, 7, 20, len(full) - 1):
+        cursor = full[stop][0]
+        assert list(belyi.iter_monodromy_triples(3, cursor=cursor)) == full[stop + 1:]
+
+
+@pytest.mark.parametrize("degree", [3, 4])
+def test_iterator_filters_match_post_filtering(belyi, degree):
+    triples = _brute_force_triples(degree)
+    passport = ((2,) + (1,) * (degree - 2), (degree,), (degree - 1, 1))
+    cases = [
+        ({'transitive': True}, lambda t: _transitive(t[0], t[1])),
+        ({'passport': passport}, lambda t: tuple(map(_cycle_type, t)) == passport),
+        ({'genus': 0}, lambda t: _genus(t) == 0),
+        ({'genus': 1, 'transitive': True}, lambda t: _genus(t) == 1 and _transitive(t[0], t[1])),
+    ]
+    for options, keep in cases:
+        stats = {}
+        found = [t for _, t in belyi.iter_monodromy_triples(degree, stats=stats, **options)]
+        assert found == [t for t in triples if keep(t)]
+        assert stats['yielded'] == len(found)
+        assert stats['candidates'] == len(triples)
+        assert (stats['passport'] + stats['genus'] + stats['transitivity']
+                == stats['candidates'] - stats['yielded'])
+
+
+def test_canonical_form_is_a_conjugation_invariant(belyi):
+    S_4 = list(permutations(range(1, 5)))
+    for sigma_0, sigma_1, _ in belyi.monodromy_group(4)[::37]:
+        if not _transitive(sigma_0, sigma_1):
+            continue
+        form, automorphisms = belyi.canonical_form(sigma_0, sigma_1)
+        orbit = _orbit((sigma_0, sigma_1))
+        assert form in orbit
+        assert automorphisms == len(S_4) // len(orbit)
+        for tau in S_4[::5]:
+            conjugate = (_conjugate(sigma_0, tau), _conjugate(sigma_1, tau))
+            assert belyi.canonical_form(*conjugate) == (form, automorphisms)
+
+
+def test_canonical_form_rejects_disconnected_pairs(belyi):
+    with pytest.raises(ValueError):
+        belyi.canonical_form((2, 1, 3), (1, 2, 3))
+
+
+@pytest.mark.parametrize("degree, expected", [(1, 1), (2, 3), (3, 7), (4, 26)])
+def test_dessin_classes_match_brute_force_orbits(belyi, degree, expected):
+    orbits = {_orbit(t[:2]) for t in _brute_force_triples(degree) if _transitive(t[0], t[1])}
+    dessins = list(belyi.iter_dessins(degree))
+    assert len(dessins) == len(orbits) == expected
+    assert {_orbit(triple[:2]) for _, triple, _ in dessins} == orbits
+    assert belyi.verify_dessin_counts(degree)['consistent']
+
+
+def test_union_find_transitivity_matches_breadth_first_search(belyi):
+    S_4 = list(permutations(range(1, 5)))
+    for sigma_0 in S_4:
+        sheets_0 = belyi.sheet_components(sigma_0)
+        for sigma_1 in S_4:
+            expected = _transitive(sigma_0, sigma_1)
+            assert belyi.is_transitive(sigma_0, sigma_1) == expected
+            assert belyi.is_transitive(sigma_0, sigma_1, sheets_0) == expected
+
+
+def test_sheet_components_point_at_the_smallest_sheet(belyi):
+    assert belyi.sheet_components((3, 5, 1, 4, 2)) == [0, 1, 2, 1, 4, 2]
+
+
+def test_filter_transitive_counts_removals(belyi):
+    triples = belyi.monodromy_group(3)
+    stats = {}
+    kept = list(belyi.filter_transitive(triples, stats))
+    assert kept == [t for t in triples if _transitive(t[0], t[1])]
+    assert stats == {'candidates': len(triples), 'transitivity': len(triples) - len(kept)}
+
+
+@pytest.mark.parametrize("degree", [1, 3, 5])
+def test_symmetric_group_array_is_lexicographic(degree):
+    group = symmetric_group_array(degree)
+    assert permutation_tuples(group) == list(permutations(range(1, degree + 1)))
+    assert list(permutation_ranks(group)) == list(range(len(group)))
+
+
+def test_permutation_kernel_matches_pure_python():
+    rng = random.Random(4)
+    sigma = [tuple(rng.sample(range(1, 8), 7)) for _ in range(50)]
+    tau = [tuple(rng.sample(range(1, 8), 7)) for _ in range(50)]
+    a, b = permutation_array(sigma), permutation_array(tau)
+    assert a.dtype == np.int8
+    assert permutation_tuples(a) == sigma
+    
+    assert permutation_tuples(compose_many(a, b)) == [_compose(s, t) for s, t in zip(sigma, tau)]
+    assert permutation_tuples(conjugate_many(a, b)) == [_conjugate(s, t)
+                                                        for s, t in zip(sigma, tau)]
+    identity = tuple(range(1, 8))
+    assert all(_compose(s, inverse) == identity
+               for s, inverse in zip(sigma, permutation_tuples(invert_many(a))))
+    assert [cycle_type_from_counts(row) for row in cycle_counts_many(a)] == [_cycle_type(s)
+                                                                           for s in sigma]
+    group = list(permutations(range(1, 8)))
+    assert [group[rank] for rank in permutation_ranks(a)] == sigma
+    
+    # A single permutation broadcasts against a batch
+    assert permutation_tuples(compose_many(a[0], b)) == [_compose(sigma[0], t) for t in tau]
+
+
+def test_tuple_wrappers_agree_with_the_kernel(belyi):
+    sigma, tau = (2, 3, 1, 5, 4), (5, 1, 4, 3, 2)
+    assert belyi.compose_permutations(sigma, tau) == _compose(sigma, tau)
+    assert belyi.conjugate_permutation(sigma, tau) == _conjugate(sigma, tau)
+    assert belyi.inverse_permutation(sigma) == (3, 1, 2, 5, 4)
+    assert belyi.cycle_type(sigma) == (3, 2)
+    with pytest.raises(ValueError):
+        belyi.compose_permutations(sigma, (1, 2))
@@ -0,0 +1,32 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve, _horner_rational, weierstrass_series_coefficients
+
+
+@pytest.mark.parametrize("q", [Fraction(1, 3), Fraction(-2, 125), Fraction(12345, 67891), 0])
+@pytest.mark.parametrize("terms", [5, 40, 200])
+def test_horner_rational_matches_fraction_horner(q, terms):
+    coefficients = weierstrass_series_coefficients(terms)[1]
+    expected = Fraction(0)
+    for c in reversed(coefficients.tolist()):
+        expected = expected * q + c
+    value = _horner_rational(coefficients, q)
+    assert isinstance(value, Fraction)
+    assert value == expected
+
+
+@pytest.mark.parametrize("q", [Fraction(1, 3), Fraction(-4, 7), Fraction(1, 125)])
+def test_rational_q_gives_exact_coefficients_agreeing_with_float_q(q):
+    exact = TateCurve(q=q, precision=10)
+    approximate = TateCurve(q=float(q), precision=10)
+    assert exact.is_exact() and not approximate.is_exact()
+    
+    a_4, a_6 = exact.weierstrass_coefficients()
+    assert isinstance(a_4, Fraction) and isinstance(a_6, Fraction)
+    np.testing.assert_allclose([float(a_4), float(a_6)],
+                               approximate.weierstrass_coefficients(), rtol=1e-12)
+    assert isinstance(exact.discriminant(), Fraction)
+    assert float(exact.discriminant()) == pytest.approx(approximate.discriminant(), rel=1e-9)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve, TateCurveFamily
+
+Q_VALUES = [0.008, -0.2, 0.5, 0.01 + 0.03j, 1.5]
+
+
+@pytest.fixture
+def family():
+    return TateCurveFamily(p=5, q_values=Q_VALUES, precision=30)
+
+
+def test_family_matches_single_curves(family):
+    a_4, a_6 = family.weierstrass_coefficients()
+    delta, j = family.discriminant(), family.j_invariant()
+    for index, q in enumerate(Q_VALUES[:-1]):
+        curve = TateCurve(p=5, q=q, precision=30)
+        expected = (*curve.weierstrass_coefficients(), curve.discriminant(), curve.j_invariant())
+        np.testing.assert_allclose([a_4[index], a_6[index], delta[index], j[index]], expected,
+                                   rtol=1e-12)
+    A, B = family.short_coefficients()
+    np.testing.assert_allclose([A[0], B[0]], TateCurve(p=5, q=0.008, precision=30)
+                               .short_coefficients(), rtol=1e-12)
+
+
+def test_entries_outside_the_unit_disc_are_masked(family):
+    assert family.valid.tolist() == [True, True, True, True, False]
+    assert np.isnan(family.j_invariant()[-1])
+    assert np.isfinite(family.j_invariant()[:-1]).all()
+
+
+def test_reassigning_q_values_invalidates_the_cache(family):
+    before = family.j_invariant()
+    family.q_values = [0.1, 0.2]
+    np.testing.assert_allclose(family.j_invariant(),
+                               TateCurveFamily(p=5, q_values=[0.1, 0.2], precision=30)
+                               .j_invariant())
+    assert len(family.j_invariant()) != len(before)
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import PAdic, TateCurve
+
+METHODS = ['double_and_add', 'naf', 'ladder']
+COORDINATES = ['affine', 'projective', 'jacobian']
+
+
+@pytest.fixture
+def curve():
+    return TateCurve(p=5, q=0.01, precision=30)
+
+
+@pytest.fixture
+def points(curve):
+    # Generic points: parametrize(u) for u spread over one period
+    rng = np.random.default_rng(1)
+    u = np.exp(rng.uniform(0.3, 2.0, 60)) * rng.choice([-1, 1], 60)
+    return u, np.column_stack(curve.parametrize(u))
+
+
+@pytest.fixture
+def p_adic_curve():
+    curve = TateCurve(p=7, q=PAdic(7, 49, 30), precision=20)
+    points = []
+    for x in range(1, 40):
+        try:
+            points.append(curve.point_from_x(x))
+        except ValueError:
+            pass
+    return curve, points
+
+
+
+
+
+def test_add_many_matches_scalar_addition(curve, points):
+    _, P = points
+    Q = P[::-1]
+    batch = curve.add_many(P, Q)
+    for lane in range(len(P)):
+        np.testing.assert_allclose(batch[lane], curve.point_addition(tuple(P[lane]),
+                                                                      tuple(Q[lane])))
+
+
+def test_add_many_is_associative_and_doubles(curve, points):
+    _, P = points
+    Q, R = np.roll(P, 1, axis=0), np.roll(P, 2, axis=0)
+    left = curve.add_many(curve.add_many(P, Q), R)
+    right = curve.add_many(P, curve.add_many(Q, R))
+    np.testing.assert_allclose(left, right, rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(curve.double_many(P), curve.add_many(P, P), rtol=1e-10)
+
+
+def test_add_many_handles_the_identity_and_inverses(curve, points):
+    _, P = points
+    infinity = np.full_like(P, np.inf)
+    np.testing.assert_array_equal(curve.add_many(P, infinity), P)
+    np.testing.assert_array_equal(curve.add_many(infinity, P), P)
+    assert np.isinf(curve.add_many(P, curve.negate_many(P))).all()
+    assert np.isinf(curve.double_many(infinity)).all()
+
+
+def test_p_adic_group_law_is_associative(p_adic_curve):
+    curve, points = p_adic_curve
+    P, Q, R = points[:3]
+    left = curve.point_addition(curve.point_addition(P, Q), R)
+    right = curve.point_addition(P, curve.point_addition(Q, R))
+    assert left[0] == right[0] and left[1] == right[1]
+
+
+@pytest.mark.parametrize("coordinates", COORDINATES)
+@pytest.mark.parametrize("method", METHODS)
+def test_multiply_many_matches_the_parametrization(curve, points, method, coordinates):
+    u, P = points
+    k = np.arange(len(u)) % 9 - 4
+    expected = np.column_stack(curve.parametrize(u**k.astype(float)))
+    result = curve.multiply_many(P, k, method=method, coordinates=coordinates)
+    finite = np.isfinite(expected).all(axis=1)
+    np.testing.assert_allclose(result[finite], expected[finite], rtol=1e-6, atol=1e-8)
+    assert np.isinf(result[~finite]).all()
+
+
+@pytest.mark.parametrize("coordinates", COORDINATES)
+@pytest.mark.parametrize("method", METHODS)
+def test_p_adic_multiply_matches_repeated_addition(p_adic_curve, method, coordinates):
+    curve, points = p_adic_curve
+    P = points[0]
+    expected = P
+    for _ in range(10):
+        expected = curve.point_addition(expected, P)
+    result = curve.multiply(P, 11, method=method, coordinates=coordinates)
+    assert result[0] == expected[0] and result[1] == expected[1]
+
+def test_projective_and_jacobian_sums_match_affine(curve, points):
+    _, P = points
+    Q = np.roll(P, 3, axis=0)
+    affine = curve.add_many(P, Q)
+    projective = curve.projective_add_many(curve.to_projective(P), curve.to_projective(Q))
+    jacobian = curve.jacobian_add_many(curve.to_jacobian(P), curve.to_jacobian(Q))
+    np.testing.assert_allclose(curve.from_projective(projective), affine, rtol=1e-9)
+    np.testing.assert_allclose(curve.from_jacobian(jacobian), affine, rtol=1e-9)
+    doubled = curve.from_jacobian(curve.jacobian_double_many(curve.to_jacobian(P)))
+    np.testing.assert_allclose(doubled, curve.double_many(P), rtol=1e-9)
+
+
+def test_homogeneous_round_trips_keep_the_identity(curve, points):
+    _, P = points
+    P = np.vstack([P, [np.inf, np.inf]])
+    np.testing.assert_allclose(curve.from_projective(curve.to_projective(P)), P)
+    np.testing.assert_allclose(curve.from_jacobian(curve.to_jacobian(P)), P)
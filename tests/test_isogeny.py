@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import PAdic, TateCurve
+
+
+def _add(P, Q, a):
+    """Affine sum on y^2 = x^3 + a x + b (generic points, P != +-Q)."""
+    slope = (Q[1] - P[1]) / (Q[0] - P[0])
+    x = slope * slope - P[0] - Q[0]
+    return x, slope * (P[0] - x) - P[1]
+
+
+@pytest.fixture
+def curve():
+    return TateCurve(p=5, q=0.01, precision=30)
+
+
+@pytest.fixture
+def points(curve):
+    rng = np.random.default_rng(3)
+    u = np.exp(rng.uniform(0.3, 2.0, 40)) * rng.choice([-1, 1], 40)
+    return np.column_stack(curve.parametrize(u))
+
+
+@pytest.mark.parametrize("n", [2, 3, 5])
+def test_kernel_maps_to_infinity(curve, n):
+    generator = curve.torsion_points(n)[-1]
+    isogeny = curve.isogeny(generator)
+    assert isogeny.degree == n
+    kernel = np.array(curve._multiples(generator))
+    X, Y = isogeny(kernel[:, 0], kernel[:, 1])
+    assert np.isinf(X).all() and np.isinf(Y).all()
+
+
+@pytest.mark.parametrize("n", [2, 3, 5])
+def test_image_lies_on_the_codomain(curve, points, n):
+    isogeny = curve.isogeny(curve.torsion_points(n)[-1])
+    a, b = isogeny.codomain
+    X, Y = isogeny(points[:, 0], points[:, 1])
+    np.testing.assert_allclose(Y * Y, X**3 + a * X + b, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize("n", [2, 3])
+def test_isogeny_is_a_homomorphism(curve, points, n):
+    isogeny = curve.isogeny(curve.torsion_points(n)[-1])
+    a, _ = isogeny.codomain
+    P, Q = points[:20], points[20:]
+    S = np.array([curve.point_addition(tuple(p), tuple(q)) for p, q in zip(P, Q)])
+    image_P = isogeny(P[:, 0], P[:, 1])
+    image_Q = isogeny(Q[:, 0], Q[:, 1])
+    image_S = isogeny(S[:, 0], S[:, 1])
+    np.testing.assert_allclose(_add(image_P, image_Q, a), image_S, rtol=1e-6)
+
+
+def test_p_adic_two_isogeny():
+    curve = TateCurve(p=5, q=PAdic(5, 25, precision=60), precision=40)
+    kernel = [Q for Q in curve.torsion_points(2) if Q[1].is_zero()][0]
+    isogeny = curve.isogeny([kernel])
+    assert isogeny.degree == 2
+    X, _ = isogeny(np.array([kernel[0]], dtype=object), np.array([kernel[1]], dtype=object))
+    assert X[0] == float('inf')
+    
+    a, b = isogeny.codomain
+    for x in range(1, 40):
+        try:
+            P = curve.point_from_x(x)
+            break
+        except ValueError:
+            pass
+    (X,), (Y,) = isogeny(np.array([P[0]], dtype=object), np.array([P[1]], dtype=object))
+    assert (Y * Y - (X * X * X + a * X + b)).valuation() >= 15
@@ -0,0 +1,96 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from p_adic_teichmuller import (PAdic, PAdicVector, TateCurve, teichmuller_lift,
+                                teichmuller_representatives)
+
+
+def _random_fractions(count, seed=0):
+    rng = random.Random(seed)
+    values = []
+    while len(values) < count:
+        value = Fraction(rng.randint(-10**6, 10**6), rng.randint(1, 10**4))
+        if value:
+            values.append(value)
+    return values
+
+
+def _agrees(x, value, digits):
+    """x and the rational value agree modulo p^digits."""
+    return (x - PAdic(x.p, value, x.precision)).valuation() >= digits
+
+
+@pytest.mark.parametrize("p", [2, 3, 5, 7])
+def test_arithmetic_matches_fractions(p):
+    values = _random_fractions(40, seed=p)
+    for a, b in zip(values[::2], values[1::2]):
+        x, y = PAdic(p, a, 30), PAdic(p, b, 30)
+        floor = min(x.valuation(), y.valuation())
+        assert _agrees(x + y, a + b, floor + 30)
+        assert _agrees(x - y, a - b, floor + 30)
+        assert _agrees(x * y, a * b, x.valuation() + y.valuation() + 30)
+        assert _agrees(x / y, a / b, x.valuation() - y.valuation() + 30)
+        assert _agrees(x**3, a**3, 3 * x.valuation() + 30)
+
+
+def test_cancellation_loses_precision():
+    x = PAdic(5, 1 + 5**8, 20)
+    difference = x - PAdic(5, 1, 20)
+    assert difference.valuation() == 8
+    assert difference.absolute_precision() == 20
+
+
+def test_square_roots():
+    for p in (2, 3, 5, 7):
+        for value in (Fraction(4, 9), Fraction(p**2 * 49), Fraction(1, p**4)):
+            root = PAdic(p, value, 30).sqrt()
+            assert _agrees(root * root, value, root.valuation() * 2 + 20)
+    with pytest.raises(ValueError):
+        PAdic(5, 2, 20).sqrt()
+
+
+def test_vector_matches_scalar_arithmetic():
+    p = 7
+    a, b = _random_fractions(16, seed=1), _random_fractions(16, seed=2)
+    u, v = PAdicVector(p, a, 25), PAdicVector(p, b, 25)
+    for result, op in ((u + v, PAdic.__add__), (u * v, PAdic.__mul__), (u / v, PAdic.__truediv__)):
+        for entry, x, y in zip(result.to_list(), a, b):
+            assert entry == op(PAdic(p, x, 25), PAdic(p, y, 25))
+
+
+def test_tate_curve_rejects_zero_q():
+    for q in (0, 0.0, PAdic(5, 0)):
+        with pytest.raises(ValueError, match="nonzero"):
+            TateCurve(p=5, q=q)
+
+
+def test_tate_curve_p_must_match_a_p_adic_q():
+    curve = TateCurve(p=5, q=PAdic(5, 5))
+    with pytest.raises(ValueError):
+        curve.p = 7
+    assert curve.p == 5
+    with pytest.raises(ValueError):
+        TateCurve(p=7, q=PAdic(5, 5))
+
+
+@pytest.mark.parametrize("p, precision", [(2, 10), (5, 20), (7, 12), (101, 8), (10007, 6)])
+def test_teichmuller_representatives_are_fixed_by_frobenius(p, precision):
+    modulus = p**precision
+    residues = list(range(min(p, 50)))
+    omega = teichmuller_representatives(p, precision, residues)
+    table = teichmuller_representatives(p, precision)
+    for a, value in zip(residues, omega):
+        value = int(value)
+        assert value % p == a
+        assert pow(value, p, modulus) == value
+        assert value == pow(a, p**(precision - 1), modulus)
+        assert value == int(table[a])
+
+
+def test_teichmuller_lift_is_multiplicative():
+    p = 13
+    for a, b in [(2, 3), (5, 11), (12, 12)]:
+        product = teichmuller_lift(a, p, 15) * teichmuller_lift(b, p, 15)
+        assert product == teichmuller_lift(a * b, p, 15)
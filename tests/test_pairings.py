@@ -0,0 +1,84 @@
+from fractions import Fraction
+
+import pytest
+
+from p_adic_teichmuller import TateCurve
+
+ELL = 7
+
+
+def _add(P, Q, a, p):
+    """Affine addition on y^2 = x^3 + a x + b over F_p (None is the identity)."""
+    if P is None:
+        return Q
+    if Q is None:
+        return P
+    if P[0] == Q[0] and (P[1] + Q[1]) % p == 0:
+        return None
+    if P == Q:
+        slope = (3 * P[0] * P[0] + a) * pow(2 * P[1], -1, p) % p
+    else:
+        slope = (Q[1] - P[1]) * pow(Q[0] - P[0], -1, p) % p
+    x = (slope * slope - P[0] - Q[0]) % p
+    return x, (slope * (P[0] - x) - P[1]) % p
+
+
+def _multiple(P, k, a, p):
+    result = None
+    for _ in range(k):
+        result = _add(result, P, a, p)
+    return result
+
+
+@pytest.fixture(scope='module')
+def setup():
+    curve = TateCurve(q=Fraction(1, 3), precision=8)
+    counts = curve.point_counts(20000)
+    for prime, order in zip(counts['primes'].tolist(), counts['counts'].tolist()):
+        if prime >= 5 and (prime - 1) % ELL == 0 and order % ELL**2 == 0:
+            engine = curve.pairing_engine(prime)
+            x, y = engine.torsion_points(ELL, 8, seed=3)
+            points = [(int(u), int(v)) for u, v in zip(x, y)]
+            P = points[0]
+            span = {_multiple(P, k, engine.a, prime) for k in range(1, ELL)}
+            others = [Q for Q in points[1:] if Q not in span]
+            if others:
+                return curve, counts, engine, P, others[0]
+    pytest.skip("no prime with full rational 7-torsion below the bound")
+
+
+def test_engine_matches_the_point_counts(setup):
+    curve, counts, engine, _, _ = setup
+    index = counts['primes'].tolist().index(engine.prime)
+    assert engine.order() == counts['counts'][index]
+    assert engine.order() % ELL**2 == 0
+
+
+@pytest.mark.parametrize("name", ['tate_pairing', 'weil_pairing'])
+def test_pairings_are_bilinear_and_non_degenerate(setup, name):
+    _, _, engine, P, Q = setup
+    pairing = getattr(engine, name)
+    p, a = engine.prime, engine.a
+    base = pairing(P, Q, ELL)
+    assert base != 1 and pow(base, ELL, p) == 1
+    for k in (2, 3, 5):
+        assert pairing(_multiple(P, k, a, p), Q, ELL) == pow(base, k, p)
+        assert pairing(P, _multiple(Q, k, a, p), ELL) == pow(base, k, p)
+    R = _add(Q, _multiple(P, 2, a, p), a, p)
+    assert pairing(P, R, ELL) * pairing(P, Q, ELL) % p == pairing(P, _add(Q, R, a, p), ELL)
+
+
+def test_weil_pairing_is_alternating(setup):
+    _, _, engine, P, Q = setup
+    assert engine.weil_pairing(P, Q, ELL) * engine.weil_pairing(Q, P, ELL) % engine.prime == 1
+
+
+def test_batched_pairings_match_single_ones(setup):
+    _, _, engine, P, _ = setup
+    x, y = engine.torsion_points(ELL, 12, seed=5)
+    span = {_multiple(P, k, engine.a, engine.prime) for k in range(1, ELL)}
+    keep = [i for i in range(len(x)) if (int(x[i]), int(y[i])) not in span]
+    x, y = x[keep], y[keep]
+    for name in ('tate_pairing', 'weil_pairing'):
+        single = [getattr(engine, name)(P, (x[i], y[i]), ELL) for i in range(len(x))]
+        assert getattr(engine, f"{name}_many")(P, x, y, ELL).tolist() == single
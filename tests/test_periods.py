@@ -0,0 +1,28 @@
+import math
+
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve, TateCurveFamily, q_from_weierstrass
+
+
+@pytest.mark.parametrize("q", [0.001, 0.2, -0.05, -0.6, 0.01 + 0.02j])
+def test_q_from_weierstrass_recovers_q(q):
+    curve = TateCurve(q=q, precision=200)
+    assert abs(q_from_weierstrass(*curve.weierstrass_coefficients()) - q) <= 1e-12 * abs(q)
+
+
+# For larger positive q two of the 2-torsion roots agree to most double digits,
+# so omega_2 is only known to a few digits (see periods())
+@pytest.mark.parametrize("q", [0.001, 0.1, -0.3, -0.6])
+def test_period_lattice_has_the_covolume_of_2_pi_i_z_plus_tau_z(q):
+    # 2 pi i (Z + tau Z) with q = exp(2 pi i tau) has covolume 4 pi^2 Im tau = -2 pi log|q|
+    omega_1, omega_2 = TateCurve(q=q, precision=200).periods()
+    covolume = abs((omega_1.conjugate() * omega_2).imag)
+    assert covolume == pytest.approx(-2 * math.pi * math.log(abs(q)), rel=1e-10)
+
+
+def test_q_from_weierstrass_is_vectorized():
+    q = np.array([1e-5, 0.004, 0.25, -0.003, -0.4])
+    a_4, a_6 = TateCurveFamily(q_values=q, precision=200).weierstrass_coefficients()
+    np.testing.assert_allclose(q_from_weierstrass(a_4, a_6), q, rtol=1e-12)
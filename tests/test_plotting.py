@@ -0,0 +1,32 @@
+import numpy as np
+from matplotlib.figure import Figure
+
+import p_adic_teichmuller
+from p_adic_teichmuller import TateCurve, TateCurveFamily
+
+
+def test_plot_curve_separates_samples_from_contour_resolution():
+    curve = TateCurve(p=5, q=0.01)
+    figure = curve.plot_curve(num_points=50, resolution=120)
+    assert isinstance(figure, Figure)
+    ax = figure.axes[0]
+    (samples,) = ax.collections[-1:]
+    x, y = curve.sample_points((-2, 2), 50)
+    np.testing.assert_allclose(samples.get_offsets(), np.column_stack([x, y]))
+    assert figure is not curve.plot_curve(num_points=50, resolution=120)
+
+
+def test_render_curve_and_grid_write_images(tmp_path):
+    curve = TateCurve(p=5, q=0.01)
+    curve.render_curve(tmp_path / "curve.png", num_points=20)
+    family = TateCurveFamily(p=5, q_values=[0.01, 0.05, -0.1])
+    family.render_grid(tmp_path / "grid.png")
+    assert (tmp_path / "curve.png").stat().st_size > 0
+    assert (tmp_path / "grid.png").stat().st_size > 0
+
+
+def test_agg_figure_cache_is_bounded(tmp_path):
+    family = TateCurveFamily(p=5, q_values=[0.01, 0.02, 0.03, 0.04, 0.05, 0.06])
+    for columns in range(1, 7):
+        family.render_grid(tmp_path / f"grid_{columns}.png", columns=columns, resolution=20)
+    assert len(p_adic_teichmuller._AGG_FIGURES) <= p_adic_teichmuller.AGG_FIGURE_CACHE_SIZE
@@ -0,0 +1,41 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve
+
+
+def _reduce(value, prime):
+    return value.numerator * pow(value.denominator, -1, prime) % prime
+
+
+def _brute_force_count(a_4, a_6, prime):
+    """Points of y^2 + xy = x^3 + a_4 x + a_6 over F_prime, with infinity."""
+    a_4, a_6 = _reduce(a_4, prime), _reduce(a_6, prime)
+    x = np.arange(prime)[:, None]
+    y = np.arange(prime)[None, :]
+    return int(((y * y + x * y - x**3 - a_4 * x - a_6) % prime == 0).sum()) + 1
+
+
+@pytest.mark.parametrize("q", [Fraction(1, 3), Fraction(2, 125), Fraction(-4, 7)])
+@pytest.mark.parametrize("legendre_bound", [1000, 20])
+def test_point_counts_match_brute_force(q, legendre_bound):
+    curve = TateCurve(q=q, precision=6)
+    a_4, a_6, _ = curve.reduction_coefficients()
+    counts = curve.point_counts(200, legendre_bound=legendre_bound)
+    assert len(counts['primes']) > 20
+    for prime, count, trace in zip(counts['primes'].tolist(), counts['counts'].tolist(),
+                                   counts['traces'].tolist()):
+        assert count == _brute_force_count(a_4, a_6, prime)
+        assert trace == prime + 1 - count
+        assert trace**2 <= 4 * prime
+
+
+def test_bad_primes_are_skipped():
+    curve = TateCurve(q=Fraction(1, 3), precision=6)
+    _, _, delta = curve.reduction_coefficients()
+    primes = curve.point_counts(100)['primes'].tolist()
+    for prime in primes:
+        assert _reduce(delta, prime) != 0
+    assert 3 not in primes
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve
+
+
+@pytest.mark.parametrize("q", [0.01, -0.3, 0.6, 0.85])
+@pytest.mark.parametrize("tolerance", [1e-6, 1e-12])
+def test_adaptive_coefficients_are_within_the_certified_bound(q, tolerance):
+    curve = TateCurve(q=q, tolerance=tolerance)
+    reference = TateCurve(q=q, precision=2000).weierstrass_coefficients()
+    bounds = curve.truncation_error()
+    assert max(bounds) <= tolerance
+    for value, exact, bound in zip(curve.weierstrass_coefficients(), reference, bounds):
+        assert abs(value - exact) <= bound + 1e-13 * abs(exact)
+
+
+def test_adaptive_terms_grow_with_tighter_tolerance_and_larger_q():
+    terms = [[TateCurve(q=q, tolerance=tolerance).series_terms()
+              for tolerance in (1e-4, 1e-8, 1e-12)] for q in (0.1, 0.5, 0.9)]
+    assert all(np.diff(row).min() > 0 for row in terms)
+    assert all(np.diff(column).min() > 0 for column in zip(*terms))
+
+
+def test_changing_tolerance_invalidates_the_cache():
+    curve = TateCurve(q=0.5, tolerance=1e-4)
+    loose = curve.weierstrass_coefficients()
+    curve.tolerance = 1e-12
+    assert curve.weierstrass_coefficients() != loose
+    fresh = TateCurve(q=0.5, tolerance=1e-12)
+    assert curve.weierstrass_coefficients() == fresh.weierstrass_coefficients()
+
+
+def test_unreachable_tolerance_raises():
+    with pytest.raises(ValueError):
+        TateCurve(q=0.99, tolerance=1e-15, max_precision=50).weierstrass_coefficients()
@@ -0,0 +1,19 @@
+import numpy as np
+
+from p_adic_teichmuller import PAdic, TateCurve, q_from_j
+
+
+def test_q_from_j_round_trips_real_and_complex_q():
+    q = np.array([0.001, -0.002, 0.001 + 0.0005j, 1e-6])
+    j = np.array([TateCurve(q=complex(v) if v.imag else float(v.real), precision=30).j_invariant()
+                  for v in q])
+    np.testing.assert_allclose(q_from_j(j), q, rtol=1e-10)
+
+
+def test_from_j_keeps_the_precision_of_a_p_adic_j():
+    curve = TateCurve(p=5, q=PAdic(5, 60, precision=60), precision=70)
+    j = curve.j_invariant()
+    assert j.precision > PAdic.default_precision
+    
+    recovered = TateCurve.from_j(j, precision=70)
+    assert (recovered.q - curve.q).valuation() >= 60
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import TateCurve
+
+
+@pytest.fixture
+def curve():
+    return TateCurve(p=5, q=0.01, precision=20)
+
+
+@pytest.mark.parametrize("adaptive", [True, False])
+def test_samples_lie_on_the_curve_within_range(curve, adaptive):
+    A, B = curve.short_coefficients()
+    x, y = curve.sample_points((-2, 2), 100, adaptive=adaptive)
+    assert len(x) > 0 and len(x) <= 2 * 100
+    assert x.min() >= -2 and x.max() <= 2
+    np.testing.assert_allclose(y**2, x**3 + A * x + B, atol=1e-12)
+
+
+def test_adaptive_sampling_includes_the_real_roots(curve):
+    x, y = curve.sample_points((-2, 2), 100)
+    roots = x[y == 0]
+    np.testing.assert_allclose(np.unique(roots), curve.real_roots(), atol=1e-12)
+
+
+def test_compute_points_is_the_uniform_sampler(curve):
+    x, y = curve.sample_points((-1, 1), 50, adaptive=False)
+    assert curve.compute_points((-1, 1), 50) == list(zip(x, y))
+
+
+def test_sample_budget_edge_cases(curve):
+    x, y = curve.sample_points((-2, 2), 0)
+    assert len(x) == len(y) == 0
+    with pytest.raises(ValueError):
+        curve.sample_points((-2, 2), -1)
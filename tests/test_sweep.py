@@ -0,0 +1,21 @@
+import numpy as np
+from sympy import primerange
+
+from tate_sweep import load_sweep, sweep_tate_curves
+
+
+def test_sweep_valuations_and_worker_independence(tmp_path):
+    primes = list(primerange(2, 40))
+    serial, parallel = tmp_path / "serial.npz", tmp_path / "parallel.npz"
+    count = sweep_tate_curves(primes, serial, q_exponents=(1, 2), point_count_bound=50,
+                              chunk_size=5, workers=1)
+    assert count == 2 * len(primes)
+    sweep_tate_curves(primes, parallel, q_exponents=(1, 2), point_count_bound=50,
+                      chunk_size=5, workers=2)
+    
+    columns = load_sweep(serial)
+    assert list(columns['p']) == [p for p in primes for _ in (1, 2)]
+    np.testing.assert_array_equal(columns['discriminant_valuation'], columns['q_exponent'])
+    np.testing.assert_array_equal(columns['j_valuation'], -columns['q_exponent'])
+    for name, values in load_sweep(parallel).items():
+        np.testing.assert_array_equal(values, columns[name])
@@ -0,0 +1,84 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import (SERIES_TABLE_CACHE_SIZE, TateCurve, _SERIES_TABLES, sigma_table,
+                                weierstrass_series_coefficients)
+
+
+@pytest.fixture
+def real_curve():
+    return TateCurve(p=5, q=0.1, precision=20)
+
+
+def test_parametrize_lands_on_short_model(real_curve):
+    A, B = real_curve.short_coefficients()
+    X, Y = real_curve.parametrize(np.array([0.5, -0.7, 2.0, 1.3]))
+    np.testing.assert_allclose(Y**2, X**3 + A * X + B, atol=1e-10)
+
+
+def test_parametrize_is_homomorphism_for_add_many(real_curve):
+    u1 = np.array([0.5, -0.7, 2.0, 1.3, 0.35])
+    u2 = np.array([0.6, 0.9, -0.4, 1 / 1.3, 0.35])
+    P = np.column_stack(real_curve.parametrize(u1))
+    Q = np.column_stack(real_curve.parametrize(u2))
+    expected = np.column_stack(real_curve.parametrize(u1 * u2))
+    np.testing.assert_allclose(real_curve.add_many(P, Q), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_uniformize_inverts_parametrize(real_curve):
+    u = np.array([0.5, -0.7, 2.0, 1.3, -1.5])
+    X, Y = real_curve.parametrize(u)
+    np.testing.assert_allclose(real_curve.uniformize(X, Y), u, rtol=1e-9)
+
+
+def test_series_tables_are_shared_read_only_and_bounded():
+    table = sigma_table(3, 50)
+    assert table is sigma_table(3, 50)
+    with pytest.raises(ValueError):
+        table[1] = 0
+    a_4, a_6 = weierstrass_series_coefficients(50)
+    assert not a_4.flags.writeable and not a_6.flags.writeable
+    
+    for precision in range(SERIES_TABLE_CACHE_SIZE + 10):
+        sigma_table(2, precision)
+    assert len(_SERIES_TABLES) <= SERIES_TABLE_CACHE_SIZE
+
+
+def test_series_coefficients_match_divisor_sums():
+    sigma_3 = [sum(d**3 for d in range(1, n + 1) if n % d == 0) for n in range(1, 31)]
+    assert list(sigma_table(3, 30)[1:]) == sigma_3
+    a_4, a_6 = weierstrass_series_coefficients(30)
+    assert list(a_4[1:]) == [-5 * s for s in sigma_3]
+    assert a_6[1] == -1 and a_6[2] == -23
+
+
+@pytest.mark.parametrize("q", [0.1, -0.3, Fraction(1, 125)])
+def test_short_model_has_the_invariants_of_the_tate_model(q):
+    curve = TateCurve(p=5, q=q, precision=20)
+    A, B = curve.short_coefficients()
+    # 4A^3 + 27B^2 cancels down to about q, so allow for the rounding of floats
+    assert curve.discriminant() == pytest.approx(-16 * (4 * A**3 + 27 * B**2), rel=1e-9)
+    assert curve.j_invariant() == pytest.approx(1728 * 4 * A**3 / (4 * A**3 + 27 * B**2),
+                                                rel=1e-9)
+
+
+def test_model_conversions_map_points_between_the_models(real_curve):
+    a_4, a_6 = real_curve.weierstrass_coefficients()
+    X, Y = real_curve.point_from_x(2.5)
+    x, y = real_curve.to_tate_model(X, Y)
+    assert y * y + x * y == pytest.approx(x**3 + a_4 * x + a_6, rel=1e-12)
+    assert real_curve.to_short_model(x, y) == pytest.approx((X, Y), rel=1e-12)
+
+
+def test_weierstrass_data_is_memoized_and_invalidated(real_curve):
+    first = real_curve.weierstrass_coefficients()
+    assert real_curve.weierstrass_coefficients() is first
+    assert real_curve.cache_info()['hits'] >= 1
+    
+    for name, value in (('q', 0.2), ('precision', 25), ('p', 7)):
+        setattr(real_curve, name, value)
+        fresh = TateCurve(p=real_curve.p, q=real_curve.q, precision=real_curve.precision)
+        assert real_curve.weierstrass_coefficients() == fresh.weierstrass_coefficients()
+        assert real_curve.j_invariant() == fresh.j_invariant()
@@ -0,0 +1,43 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from p_adic_teichmuller import PAdic, TateCurve, division_polynomial
+
+
+def test_division_polynomials_match_closed_forms():
+    a, b = Fraction(2, 3), Fraction(-5, 7)
+    assert list(division_polynomial(a, b, 3)) == [3, 0, 6 * a, 12 * b, -a * a]
+    assert list(division_polynomial(a, b, 4)) == [2, 0, 10 * a, 40 * b, -10 * a * a,
+                                                  -8 * a * b, -2 * a**3 - 16 * b * b]
+
+
+def test_division_polynomial_memo_is_read_only():
+    f = division_polynomial(1.5, -0.25, 5)
+    assert f is division_polynomial(1.5, -0.25, 5)
+    with pytest.raises(ValueError):
+        f[0] = 0.0
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5, 6])
+def test_real_torsion_points_have_order_dividing_n(n):
+    # E_q(R) = R^* / q^Z is Z/2 x R/Z for 0 < q < 1
+    curve = TateCurve(p=5, q=0.01, precision=30)
+    points = curve.torsion_points(n)
+    assert len(points) == (2 * n - 1 if n % 2 == 0 else n - 1)
+    for x, y in points:
+        np.testing.assert_allclose(curve.multiply((x, y), n - 1), (x, -y), rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize("p, n, expected", [(5, 2, 3), (5, 3, 0), (5, 4, 7), (7, 3, 2),
+                                            (7, 4, 3), (3, 2, 3), (2, 2, 3)])
+def test_p_adic_torsion_matches_the_tate_uniformization(p, n, expected):
+    # E_q(Q_p) = Q_p^* / q^Z, so with q = p^2 the n-torsion is mu_n(Q_p) x {1, p}
+    # when n is even and mu_n(Q_p) when n is odd, minus the identity
+    curve = TateCurve(p=p, q=PAdic(p, p**2, precision=60), precision=40)
+    points = curve.torsion_points(n)
+    assert len(points) == expected
+    A, B = curve.short_coefficients()
+    for X, Y in points:
+        assert (Y * Y - (X * X * X + A * X + B)).valuation() >= 20